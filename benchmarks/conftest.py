@@ -0,0 +1,213 @@
+"""
+Gas benchmarks for the full request lifecycle.
+
+Run with `py.test benchmarks`.  Measurements are written as JSON to
+`benchmarks/gas_results.json` (or `$GAS_BENCHMARK_OUTPUT`) and every
+measurement is compared against `benchmarks/gas_baseline.json`.  A test fails
+if it uses more than `$GAS_BENCHMARK_THRESHOLD` (default 1%) more gas than
+its baseline value, or if it has no baseline value at all.
+
+Set `GAS_BENCHMARK_UPDATE=1` to write the measurements to the baseline file
+instead of comparing against it.  This is needed to create the baseline and
+whenever a measurement is added.
+"""
+import collections
+import os
+
+import pytest
+import sha3
+
+from computation_market.benchmark import GasBenchmark
+
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(scope="session")
+def gas_benchmark(request):
+    baseline_path = os.environ.get(
+        'GAS_BENCHMARK_BASELINE', os.path.join(BENCHMARK_DIR, 'gas_baseline.json'),
+    )
+    output_path = os.environ.get(
+        'GAS_BENCHMARK_OUTPUT', os.path.join(BENCHMARK_DIR, 'gas_results.json'),
+    )
+    update_baseline = bool(os.environ.get('GAS_BENCHMARK_UPDATE'))
+
+    benchmark = GasBenchmark(
+        baseline={} if update_baseline else GasBenchmark.load_baseline(baseline_path),
+        threshold=float(os.environ.get('GAS_BENCHMARK_THRESHOLD', 0.01)),
+        require_baseline=not update_baseline,
+    )
+
+    def _write_results():
+        benchmark.dump(baseline_path if update_baseline else output_path)
+
+    request.addfinalizer(_write_results)
+    return benchmark
+
+
+@pytest.fixture
+def run_lifecycle(deploy_client, get_log_data, StatusEnum, denoms):
+    """
+    Take a request through the full disputed lifecycle, returning the
+    `gasUsed` of every transaction keyed by function name.  Each
+    `executeExecutable` call is recorded separately.
+    """
+    def gas_used(txn_hash):
+        return int(deploy_client.wait_for_transaction(txn_hash)['gasUsed'], 16)
+
+    def _run_lifecycle(broker, args, wrong_answer, correct_answer):
+        gas = {}
+
+        txn_hash = broker.requestExecution(args, value=10 * denoms.ether)
+        gas['requestExecution'] = gas_used(txn_hash)
+        _id = get_log_data(broker.Created, txn_hash)['id']
+
+        deposit_amount = broker.getRequest(_id)[9]
+
+        gas['answerRequest'] = gas_used(
+            broker.answerRequest(_id, wrong_answer, value=deposit_amount)
+        )
+        gas['challengeAnswer'] = gas_used(
+            broker.challengeAnswer(_id, correct_answer, value=deposit_amount)
+        )
+        gas['initializeDispute'] = gas_used(broker.initializeDispute(_id))
+
+        gas['executeExecutable'] = []
+        while broker.getRequest(_id)[5] == StatusEnum.Resolving:
+            gas['executeExecutable'].append(gas_used(broker.executeExecutable(_id, 0)))
+
+        gas['finalize'] = gas_used(broker.finalize(_id))
+        gas['reclaimDeposit'] = gas_used(broker.reclaimDeposit(_id))
+
+        assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+        assert broker.getRequestResult(_id) == correct_answer
+
+        return gas
+    return _run_lifecycle
+
+
+@pytest.fixture
+def record_lifecycle(gas_benchmark):
+    def _record_lifecycle(gas, **params):
+        for name, value in sorted(gas.items()):
+            if name == 'executeExecutable':
+                for call, call_gas in enumerate(value):
+                    gas_benchmark.record_and_check(name, call_gas, call=call, **params)
+                gas_benchmark.record_and_check(name + '.total', sum(value), **params)
+            else:
+                gas_benchmark.record_and_check(name, value, **params)
+    return _record_lifecycle
+
+
+@pytest.fixture
+def measure_broker_gas(deploy_client, deploy_coinbase, get_log_data, StatusEnum, denoms):
+    """
+    Call every `BrokerInterface` function on a fresh broker for a
+    `BuildByteArrayFactory` with `args` of a given size, returning the
+    `gasUsed` of each keyed by function name.  Constant getters are sent as
+    transactions so that they can be measured too, and repeated
+    `executeExecutable(s)` calls are summed.
+    """
+    def _measure_broker_gas(broker, args):
+        gas = collections.OrderedDict()
+
+        def measure(name, txn_hash):
+            receipt = deploy_client.wait_for_transaction(txn_hash)
+            gas[name] = gas.get(name, 0) + int(receipt['gasUsed'], 16)
+            return txn_hash
+
+        def request(fn, request_args, name=None):
+            txn_hash = fn(request_args, value=10 * denoms.ether)
+            if name is None:
+                deploy_client.wait_for_transaction(txn_hash)
+            else:
+                measure(name, txn_hash)
+            return get_log_data(broker.Created, txn_hash)['id']
+
+        # BuildByteArray's output only depends on the length of the args so
+        # the disputed requests use other args of the same size, keeping
+        # their executables and verified results apart.
+        expected = ''.join(chr((i + 1) % 256) for i in range(len(args)))
+        other_args = "b" * len(args)
+        logged_args = "c" * len(args)
+
+        measure('getRequiredDeposit', broker.getRequiredDeposit.sendTransaction(args))
+        deposit_amount = broker.getRequiredDeposit(args)
+
+        # Stored args, answered and soft resolved.
+        _id = request(broker.requestExecution, args, 'requestExecution')
+        measure('answerRequest', broker.answerRequest(_id, "answer", value=deposit_amount))
+
+        for name, fn_args in (
+                ('getRequest', (_id,)),
+                ('getRequestArgs', (_id,)),
+                ('isArgsLogged', (_id,)),
+                ('getInitialAnswer', (_id,)),
+                ('getInitialAnswerResult', (_id,)),
+                ('getChallengeAnswer', (_id,)),
+                ('getChallengeAnswerResult', (_id,)),
+                ('getRequests', (_id, 1)),
+                ('getInitialAnswers', (_id, 1)),
+                ('getChallengeAnswers', (_id, 1)),
+                ('getStatusCount', (StatusEnum.WaitingForResolution,)),
+                ('getStatusPage', (StatusEnum.WaitingForResolution, 0, 10))):
+            measure(name, getattr(broker, name).sendTransaction(*fn_args))
+
+        measure('softResolveAnswer', broker.softResolveAnswer(_id))
+        measure('finalize', broker.finalize(_id))
+        measure('getRequestResult', broker.getRequestResult.sendTransaction(_id))
+        measure('reclaimDeposit', broker.reclaimDeposit(_id))
+        assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+
+        # Cancelled.
+        _id = request(broker.requestExecution, args)
+        measure('cancelRequest', broker.cancelRequest(_id))
+        assert broker.getRequest(_id)[5] == StatusEnum.Cancelled
+
+        # Logged args, committed answer revealed on finalize.
+        _id = request(broker.requestExecutionWithLoggedArgs, args, 'requestExecutionWithLoggedArgs')
+        measure('answerRequestWithHash', broker.answerRequestWithHash(
+            _id, sha3.sha3_256("answer").digest(), value=deposit_amount,
+        ))
+        deploy_client.wait_for_transaction(broker.softResolveAnswer(_id))
+        measure('getRevealDeadline', broker.getRevealDeadline.sendTransaction(_id))
+        measure('finalize(result)', broker.finalize(_id, "answer"))
+        assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+
+        # Disputed, executed one request at a time.
+        _id = request(broker.requestExecution, other_args)
+        deploy_client.wait_for_transaction(broker.answerRequest(_id, "wrong", value=deposit_amount))
+        measure('challengeAnswer', broker.challengeAnswer(_id, expected, value=deposit_amount))
+        measure('initializeDispute', broker.initializeDispute(_id))
+        while broker.getRequest(_id)[5] == StatusEnum.Resolving:
+            measure('executeExecutable', broker.executeExecutable(_id, 0))
+        deploy_client.wait_for_transaction(broker.finalize(_id))
+        args_hash = broker.getRequest(_id)[0]
+        measure('getVerifiedResultHash', broker.getVerifiedResultHash.sendTransaction(args_hash))
+        measure('getSharedRequests', broker.getSharedRequests.sendTransaction(args_hash))
+        measure('reclaimDeposits', broker.reclaimDeposits([_id]))
+        assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+
+        # Disputed with logged args and a committed challenge, executed in
+        # batches.
+        _id = request(broker.requestExecutionWithLoggedArgs, logged_args)
+        deploy_client.wait_for_transaction(broker.answerRequest(_id, "wrong", value=deposit_amount))
+        measure('challengeAnswerWithHash', broker.challengeAnswerWithHash(
+            _id, sha3.sha3_256(expected).digest(), value=deposit_amount,
+        ))
+        measure('initializeDispute(args)', broker.initializeDispute(_id, logged_args))
+        while broker.getRequest(_id)[5] == StatusEnum.Resolving:
+            measure('executeExecutables', broker.executeExecutables([_id], [0]))
+        deploy_client.wait_for_transaction(broker.finalize(_id))
+        assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+
+        # Bonds and balances.
+        measure('bond', broker.bond(value=deposit_amount))
+        measure('getBond', broker.getBond.sendTransaction(deploy_coinbase))
+        measure('unbond', broker.unbond(deposit_amount))
+        measure('getBalance', broker.getBalance.sendTransaction(deploy_coinbase))
+        measure('withdraw', broker.withdraw())
+
+        return gas
+    return _measure_broker_gas
@@ -0,0 +1,104 @@
+"""
+Derives the fixed unmetered gas of `initializeDispute` and
+`executeExecutable`.  The `INITIALIZE_DISPUTE_GAS` and
+`EXECUTE_EXECUTABLE_GAS` constants in `contracts/Broker.sol` are placeholders
+until they are replaced with the values this writes.
+
+For each call the gas the broker measured itself is recovered from the
+`GasReimbursement` log (the tester chain uses a gas price of 1 so the
+reimbursed value is in gas) minus the overhead it added.  Whatever remains of
+the transaction's `gasUsed` is unmetered; removing the intrinsic and calldata
+gas leaves the fixed per function overhead.
+
+Reimbursements are capped at what is left of the request's gas fund, its
+required deposit, in which case the metered gas cannot be recovered from the
+log.  Those calls are skipped, and the args are long enough that the fund of
+a `BuildByteArrayFactory` request (60000 gas per byte) covers deploying its
+executable.
+
+The largest value seen for each function is written to
+`benchmarks/dispute_overheads.json`.
+"""
+import json
+import os
+
+from computation_market.calibration import intrinsic_gas
+from computation_market.solvers import registry
+from computation_market.utils import (
+    function_selector,
+    encode_uint,
+)
+
+
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+OVERHEADS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'dispute_overheads.json',
+)
+
+
+def test_derive_dispute_overheads(deploy_client, deploy_broker_contract,
+                                  deployed_contracts, get_computation_request,
+                                  get_log_data, StatusEnum):
+    factory = deployed_contracts.BuildByteArrayFactory
+
+    def fixed_overhead(txn_hash, calldata, overhead_charged, gas_fund):
+        gas_used = int(deploy_client.wait_for_transaction(txn_hash)['gasUsed'], 16)
+        reimbursed = get_log_data(broker.GasReimbursement, txn_hash)['value']
+
+        # The payout was capped by the gas fund.
+        if reimbursed >= gas_fund:
+            return None
+
+        metered = reimbursed - overhead_charged
+        return gas_used - metered - intrinsic_gas(calldata)
+
+    def remaining_gas_fund(_id):
+        request = broker.getRequest(_id)
+        return max(request[9] - request[8], 0)
+
+    initialize_dispute = []
+    execute_executable = []
+
+    for args_length in (32, 100, 500):
+        broker = deploy_broker_contract(factory._meta.address)
+        args = "a" * args_length
+
+        _id = get_computation_request(
+            broker, args,
+            initial_answer="wrong",
+            challenge_answer=registry.get('BuildByteArrayFactory').solve(args),
+        )
+
+        initialize_dispute.append(fixed_overhead(
+            broker.initializeDispute(_id),
+            function_selector('initializeDispute(uint256)') + encode_uint(_id),
+            broker.getInitializeDisputeOverhead(_id),
+            remaining_gas_fund(_id),
+        ))
+
+        while broker.getRequest(_id)[5] == StatusEnum.Resolving:
+            gas_fund = remaining_gas_fund(_id)
+            execute_executable.append(fixed_overhead(
+                broker.executeExecutable(_id, 0),
+                function_selector('executeExecutable(uint256,uint256)') + encode_uint(_id) + encode_uint(0),
+                broker.getExecuteExecutableOverhead(_id, 0),
+                gas_fund,
+            ))
+
+    initialize_dispute = [value for value in initialize_dispute if value is not None]
+    execute_executable = [value for value in execute_executable if value is not None]
+
+    assert initialize_dispute, "Every initializeDispute reimbursement was capped"
+    assert execute_executable, "Every executeExecutable reimbursement was capped"
+
+    overheads = {
+        'INITIALIZE_DISPUTE_GAS': max(initialize_dispute),
+        'EXECUTE_EXECUTABLE_GAS': max(execute_executable),
+    }
+
+    with open(OVERHEADS_PATH, 'w') as overheads_file:
+        json.dump(overheads, overheads_file, indent=2, sort_keys=True)
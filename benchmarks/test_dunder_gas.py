@@ -0,0 +1,59 @@
+"""
+Gas comparison of the `DunderBytes` / `DunderUIntToBytes` codec functions
+against the original implementations in `TestDunderReference`.
+
+Both still convert one byte at a time.  The current ones drop the
+`2 ** (8 * i)` computed for every byte by the originals, cap decoding at 32
+bytes and find the encoded length of a uint without a counting loop.
+
+Each function is sent as a transaction so that its `gasUsed` can be
+measured.  Both contracts receive identical calldata so the difference
+between them is the cost of the implementation alone.  Every input is
+recorded for both contracts, and the current implementation must not use
+more gas than the original for any of them.
+"""
+import pytest
+
+
+deploy_contracts = [
+    "TestDunder",
+    "TestDunderReference",
+]
+
+
+@pytest.fixture
+def compare_gas(deploy_client, deployed_contracts, gas_benchmark):
+    def _compare_gas(name, args, **params):
+        gas = {}
+        for contract_name in ('TestDunder', 'TestDunderReference'):
+            fn = getattr(getattr(deployed_contracts, contract_name), name)
+            txn_hash = fn.sendTransaction(*args)
+            gas[contract_name] = int(deploy_client.wait_for_transaction(txn_hash)['gasUsed'], 16)
+            gas_benchmark.record_and_check(
+                name, gas[contract_name], contract=contract_name, **params
+            )
+
+        # Shown with `py.test -s`.
+        print('{0} {1}: {2} gas, originally {3}'.format(
+            name, params, gas['TestDunder'], gas['TestDunderReference'],
+        ))
+        assert gas['TestDunder'] <= gas['TestDunderReference'], gas
+    return _compare_gas
+
+
+@pytest.mark.parametrize("length", (1, 8, 31, 32))
+def test_to_uint_gas(compare_gas, length):
+    compare_gas('toUInt', ("\xab" * length,), length=length)
+
+
+@pytest.mark.parametrize("start_idx,end_idx", ((0, 31), (32, 63)))
+def test_extract_uint_gas(compare_gas, start_idx, end_idx):
+    compare_gas(
+        'extractUint', ("\xab" * 64, start_idx, end_idx),
+        start=start_idx, end=end_idx,
+    )
+
+
+@pytest.mark.parametrize("num_bytes", (1, 8, 16, 31))
+def test_to_bytes_gas(compare_gas, num_bytes):
+    compare_gas('toBytes', (2 ** (8 * num_bytes) - 1,), bytes=num_bytes)
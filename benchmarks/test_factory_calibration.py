@@ -0,0 +1,99 @@
+"""
+Measures per-step gas for the example executables and fits the `totalGas`
+models in `contracts/Examples.sol`.
+
+The fitted constants are written to `benchmarks/factory_calibration.json` as
+solidity declarations which can be pasted over the current ones.
+"""
+import json
+import os
+
+from computation_market.calibration import (
+    measure_step_gas,
+    calibrate_build_byte_array,
+    calibrate_fibonacci,
+    build_byte_array_total_gas,
+    fibonacci_total_gas,
+    as_solidity,
+)
+from computation_market.solvers import int_to_bytes
+
+
+deploy_contracts = [
+    "BuildByteArrayFactory",
+    "FibonacciFactory",
+]
+
+
+CALIBRATION_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'factory_calibration.json',
+)
+
+BUILD_BYTE_ARRAY_LENGTHS = (1, 50, 200, 500)
+FIBONACCI_NS = (0, 1, 2, 50, 150, 300)
+
+
+def write_calibration(calibration):
+    try:
+        with open(CALIBRATION_PATH) as calibration_file:
+            calibrations = json.load(calibration_file)
+    except IOError:
+        calibrations = {}
+
+    calibrations[calibration.factory] = {
+        'constants': dict(calibration.constants),
+        'formula': calibration.formula,
+        'solidity': as_solidity(calibration),
+    }
+
+    with open(CALIBRATION_PATH, 'w') as calibration_file:
+        json.dump(calibrations, calibration_file, indent=2, sort_keys=True)
+
+
+def test_calibrate_build_byte_array_factory(deploy_client, contracts,
+                                            deployed_contracts,
+                                            get_built_contract_address):
+    factory = deployed_contracts.BuildByteArrayFactory
+
+    measurements = {}
+    for length in BUILD_BYTE_ARRAY_LENGTHS:
+        executable = get_built_contract_address(
+            factory.build("a" * length), contracts.BuildByteArray,
+        )
+        measurements[length] = measure_step_gas(deploy_client, executable)
+
+    calibration = calibrate_build_byte_array([
+        (idx + 1, gas)
+        for step_gas in measurements.values()
+        for idx, gas in enumerate(step_gas)
+    ])
+    write_calibration(calibration)
+
+    for length, step_gas in measurements.items():
+        assert build_byte_array_total_gas(calibration.constants, length) >= sum(step_gas)
+        # The deployed constants must never underestimate the real cost.
+        assert factory.totalGas("a" * length) >= sum(step_gas)
+
+
+def test_calibrate_fibonacci_factory(deploy_client, contracts,
+                                     deployed_contracts,
+                                     get_built_contract_address):
+    factory = deployed_contracts.FibonacciFactory
+
+    measurements = {}
+    for n in FIBONACCI_NS:
+        executable = get_built_contract_address(
+            factory.build(int_to_bytes(n)), contracts.Fibonacci,
+        )
+        measurements[n] = measure_step_gas(deploy_client, executable)
+
+    calibration = calibrate_fibonacci([
+        (n, idx + 1, gas)
+        for n, step_gas in measurements.items()
+        for idx, gas in enumerate(step_gas)
+    ])
+    write_calibration(calibration)
+
+    for n, step_gas in measurements.items():
+        assert fibonacci_total_gas(calibration.constants, n) >= sum(step_gas)
+        assert factory.totalGas(int_to_bytes(n)) >= sum(step_gas)
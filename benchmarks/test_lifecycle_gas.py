@@ -0,0 +1,41 @@
+import pytest
+
+from computation_market.solvers import (
+    registry,
+    int_to_bytes,
+)
+
+
+deploy_contracts = [
+    "BuildByteArrayFactory",
+    "FibonacciFactory",
+]
+
+
+@pytest.mark.parametrize('args_length', (1, 10, 100, 250, 500))
+def test_build_byte_array_lifecycle_gas(deploy_broker_contract, deployed_contracts,
+                                        run_lifecycle, record_lifecycle,
+                                        args_length):
+    factory = deployed_contracts.BuildByteArrayFactory
+    broker = deploy_broker_contract(factory._meta.address)
+
+    args = "a" * args_length
+    expected = registry.get('BuildByteArrayFactory').solve(args)
+
+    gas = run_lifecycle(broker, args, "wrong", expected)
+
+    record_lifecycle(gas, factory='BuildByteArray', args_length=args_length)
+
+
+@pytest.mark.parametrize('n', (1, 10, 100, 200, 300))
+def test_fibonacci_lifecycle_gas(deploy_broker_contract, deployed_contracts,
+                                 run_lifecycle, record_lifecycle, n):
+    factory = deployed_contracts.FibonacciFactory
+    broker = deploy_broker_contract(factory._meta.address)
+
+    args = int_to_bytes(n)
+    expected = registry.get('FibonacciFactory').solve(args)
+
+    gas = run_lifecycle(broker, args, "wrong", expected)
+
+    record_lifecycle(gas, factory='Fibonacci', n=n)
@@ -0,0 +1,50 @@
+"""
+Gas used by every `BrokerInterface` function for requests with 1, 100 and
+500 byte args, recorded as `<function>[args_length=N]`.
+"""
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+ARGS_SIZES = (1, 100, 500)
+
+
+# Functions which necessarily do more work for larger args: they store, log,
+# return or hash the args, run a computation whose length depends on them,
+# or clear the stored args once a request is settled.
+ARGS_DEPENDENT = set((
+    'getRequiredDeposit',
+    'requestExecution',
+    'requestExecutionWithLoggedArgs',
+    'getRequestArgs',
+    'initializeDispute',
+    'initializeDispute(args)',
+    'executeExecutable',
+    'executeExecutables',
+    'reclaimDeposit',
+    'reclaimDeposits',
+    'challengeAnswer',
+))
+
+
+def test_request_access_gas(deploy_broker_contract, deployed_contracts,
+                            measure_broker_gas, gas_benchmark):
+    factory = deployed_contracts.BuildByteArrayFactory
+
+    gas_by_size = []
+    for args_length in ARGS_SIZES:
+        broker = deploy_broker_contract(factory._meta.address)
+        gas = measure_broker_gas(broker, "a" * args_length)
+        gas_by_size.append(gas)
+
+        for name, value in gas.items():
+            gas_benchmark.record_and_check(name, value, args_length=args_length)
+
+    for name in gas_by_size[0]:
+        if name in ARGS_DEPENDENT:
+            continue
+        values = [gas[name] for gas in gas_by_size]
+        # None of these functions touch `args` so the size of the args must
+        # not affect how much gas they use.
+        assert max(values) - min(values) < 1000, (name, values)
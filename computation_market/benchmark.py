@@ -0,0 +1,99 @@
+"""
+Recording of gas measurements and comparison against a stored baseline.
+"""
+import collections
+import json
+
+
+class GasRegression(AssertionError):
+    pass
+
+
+class MissingBaseline(AssertionError):
+    pass
+
+
+def benchmark_key(name, **params):
+    """
+    Build the key a measurement is stored under, e.g.
+    `answerRequest[args_length=100]`.
+    """
+    if not params:
+        return name
+    return '{0}[{1}]'.format(name, ','.join(
+        '{0}={1}'.format(key, params[key]) for key in sorted(params)
+    ))
+
+
+class GasBenchmark(object):
+    """
+    Collects `gasUsed` measurements keyed by function name and parameters.
+
+    A measurement regresses if it exceeds the baseline value for the same key
+    by more than `threshold` (a fraction of the baseline).  A measurement
+    whose key is missing from the baseline fails too, since it could
+    otherwise regress unnoticed, unless `require_baseline` is false (e.g.
+    while a new baseline is being recorded).
+    """
+    def __init__(self, baseline=None, threshold=0.01, require_baseline=True):
+        self.baseline = baseline or {}
+        self.threshold = threshold
+        self.require_baseline = require_baseline
+        self.results = collections.OrderedDict()
+
+    @classmethod
+    def load_baseline(cls, path):
+        try:
+            with open(path) as baseline_file:
+                return json.load(baseline_file)
+        except IOError:
+            return {}
+
+    def record(self, name, gas_used, **params):
+        key = benchmark_key(name, **params)
+        self.results[key] = gas_used
+        return key
+
+    def regression(self, key):
+        """
+        Return the fractional increase of `key` over the baseline, or `None`
+        if there is no baseline value for it.
+        """
+        if key not in self.baseline or key not in self.results:
+            return None
+        baseline = self.baseline[key]
+        if baseline == 0:
+            return None
+        return (self.results[key] - baseline) / float(baseline)
+
+    def regressions(self):
+        changes = ((key, self.regression(key)) for key in self.results)
+        return collections.OrderedDict(
+            (key, change) for key, change in changes
+            if change is not None and change > self.threshold
+        )
+
+    def check(self, key):
+        if key not in self.baseline:
+            if self.require_baseline:
+                raise MissingBaseline("{0} has no baseline value".format(key))
+            return
+
+        change = self.regression(key)
+        if change is not None and change > self.threshold:
+            raise GasRegression(
+                "{0} used {1} gas, {2:.2%} more than the baseline of {3}".format(
+                    key, self.results[key], change, self.baseline[key],
+                )
+            )
+
+    def record_and_check(self, name, gas_used, **params):
+        self.check(self.record(name, gas_used, **params))
+
+    def as_json(self):
+        return json.dumps(self.results, indent=2, separators=(',', ': '))
+
+    def dump(self, path):
+        with open(path, 'w') as output_file:
+            output_file.write(self.as_json())
+            output_file.write('\n')
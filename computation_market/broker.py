@@ -0,0 +1,104 @@
+"""
+Python side definitions of the `Broker` contract's status enum and events.
+"""
+from computation_market.utils import (
+    sha3,
+    decode_hex,
+    event_topic,
+    decode_uint,
+    decode_address,
+    decode_bytes32,
+    decode_bool,
+    decode_dynamic_bytes,
+)
+
+
+class Status(object):
+    Pending = 0
+    WaitingForResolution = 1
+    NeedsResolution = 2
+    Resolving = 3
+    SoftResolution = 4
+    FirmResolution = 5
+    Finalized = 6
+    Cancelled = 7
+
+
+DECODERS = {
+    'uint256': decode_uint,
+    'bytes32': decode_bytes32,
+    'address': decode_address,
+    'bool': decode_bool,
+    'bytes': decode_dynamic_bytes,
+}
+
+
+# None of the broker events use indexed arguments so every value is read from
+# the log data in declaration order.
+EVENTS = (
+    ('Created', (('id', 'uint256'), ('argsHash', 'bytes32'))),
+    ('ArgsLogged', (('id', 'uint256'), ('args', 'bytes'))),
+    ('Cancelled', (('id', 'uint256'),)),
+    ('AnswerSubmitted', (('id', 'uint256'), ('resultHash', 'bytes32'), ('isChallenge', 'bool'))),
+    ('Execution', (('id', 'uint256'), ('nTimes', 'uint256'), ('isFinished', 'bool'))),
+    ('GasReimbursement', (('id', 'uint256'), ('to', 'address'), ('value', 'uint256'))),
+    ('Payment', (('id', 'uint256'), ('to', 'address'), ('value', 'uint256'))),
+    ('DepositReturned', (('id', 'uint256'), ('to', 'address'), ('value', 'uint256'))),
+    ('Withdrawal', (('to', 'address'), ('value', 'uint256'))),
+)
+
+
+def _event_signature(name, inputs):
+    return '{0}({1})'.format(name, ','.join(_type for _, _type in inputs))
+
+
+EVENT_TOPICS = dict(
+    (event_topic(_event_signature(name, inputs)), (name, inputs))
+    for name, inputs in EVENTS
+)
+EVENT_NAMES = dict(
+    (name, topic) for topic, (name, _) in EVENT_TOPICS.items()
+)
+
+
+def decode_log(log):
+    """
+    Decode a raw log entry emitted by the broker, returning the event name
+    and a dictionary of its values, or `(None, None)` for unknown logs.
+    """
+    if not log['topics'] or log['topics'][0] not in EVENT_TOPICS:
+        return None, None
+    name, inputs = EVENT_TOPICS[log['topics'][0]]
+    data = decode_hex(log['data'])
+    return name, dict(
+        (field, DECODERS[_type](data, idx))
+        for idx, (field, _type) in enumerate(inputs)
+    )
+
+
+def find_request_args(client, broker_address, request_id, args_hash=None,
+                      from_block=0, to_block='latest'):
+    """
+    Recover the args of a request created with
+    `requestExecutionWithLoggedArgs` from its `ArgsLogged` event.  If
+    `args_hash` is given the args are checked against it.
+
+    `client` must provide `get_logs` (see
+    `computation_market.rpc.BatchRPCClient`).
+    """
+    logs = client.get_logs(
+        address=broker_address,
+        topics=[[EVENT_NAMES['ArgsLogged']]],
+        from_block=from_block,
+        to_block=to_block,
+    )
+    for log in logs:
+        name, data = decode_log(log)
+        if name != 'ArgsLogged' or data['id'] != request_id:
+            continue
+        if args_hash is not None and sha3(data['args']) != args_hash:
+            raise ValueError(
+                "Logged args do not match the hash of request {0}".format(request_id)
+            )
+        return data['args']
+    raise KeyError("No logged args for request {0}".format(request_id))
@@ -0,0 +1,172 @@
+"""
+Calibration of the `totalGas` cost models used by the example factories.
+
+Per-step gas is measured by advancing freshly built executables one step per
+transaction with `executeN(1)` (so the `executeN` loop overhead paid during
+a dispute is included) and subtracting the intrinsic transaction gas.  The
+measurements are then fit to the cost model each factory uses and turned
+into the constants declared in `contracts/Examples.sol`.
+
+Fitted models are shifted up so that they never estimate less than any
+measured value, then padded by `margin`, since an underestimate leaves a
+dispute unable to pay for its own execution.
+"""
+import collections
+import math
+
+from computation_market.utils import (
+    function_selector,
+    encode_uint,
+)
+
+
+TX_GAS = 21000
+TX_DATA_ZERO_GAS = 4
+TX_DATA_NON_ZERO_GAS = 68
+
+EXECUTE_ONE_DATA = function_selector('executeN(uint256)') + encode_uint(1)
+
+
+def intrinsic_gas(data):
+    """
+    The gas charged for a transaction before any code runs.
+    """
+    data = bytearray(data)
+    return TX_GAS + sum(
+        TX_DATA_ZERO_GAS if b == 0 else TX_DATA_NON_ZERO_GAS for b in data
+    )
+
+
+def fit_linear(points):
+    """
+    Least squares fit of `y = intercept + slope * x` over `(x, y)` points.
+    """
+    n = float(len(points))
+    if n == 0:
+        raise ValueError("Cannot fit a model without measurements")
+
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+
+    if variance == 0:
+        return mean_y, 0.0
+
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+    return mean_y - slope * mean_x, slope
+
+
+def upper_bound_linear(points):
+    """
+    Fit a line through `points` and raise its intercept by the largest
+    residual so that no point lies above it.
+    """
+    intercept, slope = fit_linear(points)
+    max_residual = max(y - (intercept + slope * x) for x, y in points)
+    return intercept + max(max_residual, 0), slope
+
+
+def _ceil(value, margin):
+    return int(math.ceil(value * (1 + margin)))
+
+
+Calibration = collections.namedtuple('Calibration', ['factory', 'constants', 'formula'])
+
+
+def as_solidity(calibration):
+    """
+    Render the constant declarations for a calibration.
+    """
+    return '\n'.join(
+        '    int constant {0} = {1};'.format(name, value)
+        for name, value in calibration.constants
+    )
+
+
+def calibrate_build_byte_array(step_gas, margin=0.05):
+    """
+    `step_gas` is a list of `(current_step, gas)` measurements.
+
+    Each step appends a single byte to the state in storage (see
+    `StatefulExecutable`), so steps are expected to cost roughly the same and
+    `STEP_GAS_PER_BYTE` to fit close to zero.  The per-step cost is still
+    modeled as `STEP_GAS + STEP_GAS_PER_BYTE * step` so that any growth with
+    the size of the state is caught, and the total for `L` bytes of args
+    is::
+
+        STEP_GAS * L + STEP_GAS_PER_BYTE * L * (L + 1) / 2
+    """
+    intercept, slope = upper_bound_linear(step_gas)
+    return Calibration(
+        factory='BuildByteArrayFactory',
+        constants=(
+            ('STEP_GAS', _ceil(max(intercept, 0), margin)),
+            ('STEP_GAS_PER_BYTE', _ceil(max(slope, 0), margin)),
+        ),
+        formula='STEP_GAS * L + STEP_GAS_PER_BYTE * L * (L + 1) / 2',
+    )
+
+
+def calibrate_fibonacci(step_gas, margin=0.05):
+    """
+    `step_gas` is a list of `(n, current_step, gas)` measurements.
+
+    The executable runs `n + 1` steps for an input of `n`: an initializing
+    first step, `n - 1` steps which each add two numbers, and a final step
+    which only returns the result.  Each kind of step has a roughly constant
+    cost so each constant is the most expensive measured step of its kind.
+    """
+    first, middle, last = [], [], []
+    for n, current_step, gas in step_gas:
+        if current_step == n + 1:
+            last.append(gas)
+        elif current_step == 1:
+            first.append(gas)
+        else:
+            middle.append(gas)
+
+    if not (first and middle and last):
+        raise ValueError("Measurements must cover first, middle and last steps")
+
+    return Calibration(
+        factory='FibonacciFactory',
+        constants=(
+            ('STEP_1_GAS', _ceil(max(first), margin)),
+            ('STEP_N_GAS', _ceil(max(middle), margin)),
+            ('STEP_LAST_GAS', _ceil(max(last), margin)),
+        ),
+        formula='STEP_1_GAS + (n - 1) * STEP_N_GAS + STEP_LAST_GAS',
+    )
+
+
+def build_byte_array_total_gas(constants, length):
+    constants = dict(constants)
+    return (
+        constants['STEP_GAS'] * length +
+        constants['STEP_GAS_PER_BYTE'] * length * (length + 1) // 2
+    )
+
+
+def fibonacci_total_gas(constants, n):
+    constants = dict(constants)
+    if n == 0:
+        return constants['STEP_LAST_GAS']
+    return (
+        constants['STEP_1_GAS'] +
+        (n - 1) * constants['STEP_N_GAS'] +
+        constants['STEP_LAST_GAS']
+    )
+
+
+def measure_step_gas(client, executable):
+    """
+    Advance `executable` (a populus contract instance) until it is finished,
+    one step per transaction, returning the gas used by each step with the
+    intrinsic transaction gas removed.
+    """
+    overhead = intrinsic_gas(EXECUTE_ONE_DATA)
+    step_gas = []
+    while not executable.isFinished():
+        receipt = client.wait_for_transaction(executable.executeN(1))
+        step_gas.append(int(receipt['gasUsed'], 16) - overhead)
+    return step_gas
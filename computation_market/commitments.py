@@ -0,0 +1,143 @@
+"""
+Solver side bookkeeping for answers submitted with `answerRequestWithHash`
+or `challengeAnswerWithHash`.
+
+Only the hash of a committed answer is stored on chain, so the solver must
+keep the result itself until it has been revealed with `finalize(id,
+result)` or taken from the executable after a dispute.  `CommitmentStore`
+keeps those results in a local SQLite database.
+"""
+import binascii
+import sqlite3
+
+from computation_market.utils import (
+    sha3,
+    function_selector,
+    encode_uint,
+    encode_bytes,
+)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commitments (
+    broker TEXT NOT NULL,
+    request_id INTEGER NOT NULL,
+    is_challenge INTEGER NOT NULL,
+    result_hash TEXT NOT NULL,
+    result BLOB NOT NULL,
+    is_revealed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (broker, request_id)
+);
+CREATE INDEX IF NOT EXISTS commitments_is_revealed ON commitments (is_revealed);
+"""
+
+
+ANSWER_WITH_HASH_SELECTOR = function_selector('answerRequestWithHash(uint256,bytes32)')
+CHALLENGE_WITH_HASH_SELECTOR = function_selector('challengeAnswerWithHash(uint256,bytes32)')
+FINALIZE_WITH_RESULT_SELECTOR = function_selector('finalize(uint256,bytes)')
+
+
+def encode_commit_call(request_id, result_hash, is_challenge=False):
+    """
+    Calldata for `answerRequestWithHash` or `challengeAnswerWithHash`.
+    """
+    selector = CHALLENGE_WITH_HASH_SELECTOR if is_challenge else ANSWER_WITH_HASH_SELECTOR
+    return selector + encode_uint(request_id) + result_hash
+
+
+def encode_reveal_call(request_id, result):
+    """
+    Calldata for `finalize(id, result)`.
+    """
+    return (
+        FINALIZE_WITH_RESULT_SELECTOR +
+        encode_uint(request_id) +
+        encode_uint(64) +
+        encode_bytes(result)
+    )
+
+
+def _hex(value):
+    return '0x' + binascii.hexlify(value).decode('ascii')
+
+
+class CommitmentStore(object):
+    """
+    Results of committed answers, keyed by broker address and request id.
+    """
+    def __init__(self, database=':memory:'):
+        self.db = sqlite3.connect(database)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def _row(self, row):
+        if row is None:
+            return None
+        commitment = dict(row)
+        commitment['result'] = bytes(commitment['result'])
+        commitment['is_challenge'] = bool(commitment['is_challenge'])
+        commitment['is_revealed'] = bool(commitment['is_revealed'])
+        return commitment
+
+    def commit(self, broker, request_id, result, is_challenge=False):
+        """
+        Record `result` as committed for a request, returning the hash to
+        submit on chain.
+        """
+        result_hash = sha3(result)
+        with self.db:
+            self.db.execute(
+                "INSERT INTO commitments "
+                "(broker, request_id, is_challenge, result_hash, result) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (broker.lower(), request_id, int(is_challenge),
+                 _hex(result_hash), sqlite3.Binary(result)),
+            )
+        return result_hash
+
+    def get(self, broker, request_id):
+        row = self.db.execute(
+            "SELECT * FROM commitments WHERE broker = ? AND request_id = ?",
+            (broker.lower(), request_id),
+        ).fetchone()
+        if row is None:
+            raise KeyError("No commitment for request {0}".format(request_id))
+        return self._row(row)
+
+    def get_result(self, broker, request_id):
+        return self.get(broker, request_id)['result']
+
+    def unrevealed(self, broker=None):
+        """
+        Every commitment whose result has not been revealed yet, oldest
+        request first.
+        """
+        query = "SELECT * FROM commitments WHERE is_revealed = 0"
+        params = ()
+        if broker is not None:
+            query += " AND broker = ?"
+            params += (broker.lower(),)
+        query += " ORDER BY broker, request_id"
+        return [self._row(row) for row in self.db.execute(query, params)]
+
+    def mark_revealed(self, broker, request_id):
+        with self.db:
+            cursor = self.db.execute(
+                "UPDATE commitments SET is_revealed = 1 WHERE broker = ? AND request_id = ?",
+                (broker.lower(), request_id),
+            )
+        if cursor.rowcount == 0:
+            raise KeyError("No commitment for request {0}".format(request_id))
+
+    def discard(self, broker, request_id):
+        with self.db:
+            self.db.execute(
+                "DELETE FROM commitments WHERE broker = ? AND request_id = ?",
+                (broker.lower(), request_id),
+            )
+
+    def reveal_call(self, broker, request_id):
+        """
+        Calldata which reveals the committed result for a request.
+        """
+        return encode_reveal_call(request_id, self.get_result(broker, request_id))
@@ -0,0 +1,392 @@
+"""
+Long running solver which answers new requests on one or more `Broker`
+contracts.
+
+New requests are found from the `Created` events of each broker and queued.
+Their args are fetched with `getRequestArgs` (or from the `ArgsLogged` event
+for requests which do not store them) and the result is computed by the
+native solver for the broker's factory on a process pool.  Answers are
+submitted with `answerRequest` along with the required deposit, index 9 of
+`getRequest`.
+
+Polling for events pauses while `max_queue` requests are waiting, at most
+`max_in_flight` computations run at once, and `factory_limits` caps the
+number of computations running for a single factory type.
+"""
+import collections
+import multiprocessing
+import time
+
+from computation_market.broker import (
+    Status,
+    EVENT_NAMES,
+    decode_log,
+    find_request_args,
+)
+from computation_market.solvers import registry as default_registry
+from computation_market.utils import (
+    sha3,
+    encode_hex,
+    decode_hex,
+    function_selector,
+    encode_uint,
+    encode_bytes,
+    decode_uint,
+    decode_bytes32,
+    decode_dynamic_bytes,
+)
+
+
+GET_REQUEST_SELECTOR = function_selector('getRequest(uint256)')
+GET_REQUEST_ARGS_SELECTOR = function_selector('getRequestArgs(uint256)')
+ANSWER_REQUEST_SELECTOR = function_selector('answerRequest(uint256,bytes)')
+
+# Indexes of the values returned by `getRequest`.
+REQUEST_ARGS_HASH = 0
+REQUEST_STATUS = 5
+REQUEST_REQUIRED_DEPOSIT = 9
+
+
+def encode_answer_call(request_id, result):
+    """
+    Calldata for `answerRequest(id, result)`.
+    """
+    return (
+        ANSWER_REQUEST_SELECTOR +
+        encode_uint(request_id) +
+        encode_uint(64) +
+        encode_bytes(result)
+    )
+
+
+def run_solver(solver, args):
+    """
+    Return the result computed by `solver` for `args` and how long it took.
+    Runs in a pool worker so it must be a module level function.
+    """
+    start = time.time()
+    result = solver.solve(args)
+    return result, time.time() - start
+
+
+QueuedRequest = collections.namedtuple(
+    'QueuedRequest',
+    ['broker', 'request_id', 'args_hash', 'created_block', 'queued_at'],
+)
+
+
+class Metrics(object):
+    """
+    Counters, gauges and timings recorded by the daemon.  Only the most
+    recent `max_samples` values of each timing are kept.
+    """
+    def __init__(self, max_samples=1000):
+        self.counters = collections.Counter()
+        self.gauges = {}
+        self.timings = collections.defaultdict(
+            lambda: collections.deque(maxlen=max_samples)
+        )
+
+    def increment(self, name, value=1):
+        self.counters[name] += value
+
+    def set(self, name, value):
+        self.gauges[name] = value
+
+    def observe(self, name, value):
+        self.timings[name].append(value)
+
+    def summary(self):
+        summary = dict(self.counters)
+        summary.update(self.gauges)
+        for name, values in self.timings.items():
+            if not values:
+                continue
+            summary[name] = {
+                'count': len(values),
+                'mean': sum(values) / float(len(values)),
+                'max': max(values),
+            }
+        return summary
+
+
+class BrokerReader(object):
+    """
+    Reads requests from the brokers in `brokers`, a mapping of broker
+    address to the factory type (as registered in `registry`) its requests
+    are computed with, and owns the pool they are computed on.
+    """
+    def __init__(self, client, brokers, registry=default_registry,
+                 processes=None, pool=None, _from=None):
+        self.client = client
+        self.brokers = dict(
+            (address.lower(), factory_type) for address, factory_type in brokers.items()
+        )
+        for factory_type in self.brokers.values():
+            if factory_type not in registry:
+                raise KeyError("No solver registered for {0}".format(factory_type))
+        self.registry = registry
+
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        self.processes = processes
+        self.pool = pool if pool is not None else multiprocessing.Pool(processes)
+        self._from = _from
+
+    def _call(self, broker, selector, request_id):
+        output = self.client.call(
+            _from=self._from,
+            to=broker,
+            data=encode_hex(selector + encode_uint(request_id)),
+        )
+        return decode_hex(output)
+
+    def get_request(self, broker, request_id):
+        data = self._call(broker, GET_REQUEST_SELECTOR, request_id)
+        return [decode_bytes32(data, 0), decode_bytes32(data, 1)] + [
+            decode_uint(data, idx) for idx in range(2, 10)
+        ]
+
+    def get_request_args(self, broker, request_id, args_hash, created_block):
+        args = decode_dynamic_bytes(
+            self._call(broker, GET_REQUEST_ARGS_SELECTOR, request_id)
+        )
+        if sha3(args) == args_hash:
+            return args
+        # The request was created with `requestExecutionWithLoggedArgs`.
+        return find_request_args(
+            self.client, broker, request_id,
+            args_hash=args_hash,
+            from_block=created_block,
+            to_block=created_block,
+        )
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+
+
+class SolverDaemon(BrokerReader):
+    """
+    Answers requests on the brokers in `brokers` (see `BrokerReader`).
+
+    `client` must provide `call`, `send_transaction`,
+    `get_transaction_receipt`, `get_block_number` and `get_logs` (see
+    `computation_market.rpc.BatchRPCClient`).
+
+    If `bonded` is set answers are sent without value so that their deposits
+    are reserved from the sender's bond on the broker.
+    """
+    def __init__(self, client, brokers, registry=default_registry,
+                 processes=None, pool=None, max_queue=1000,
+                 max_in_flight=None, factory_limits=None, _from=None,
+                 gas=None, bonded=False, start_block=0, confirmations=0,
+                 batch_size=1000):
+        super(SolverDaemon, self).__init__(
+            client, brokers, registry=registry, processes=processes, pool=pool,
+            _from=_from,
+        )
+        self.max_queue = max_queue
+        self.max_in_flight = max_in_flight or self.processes
+        self.factory_limits = factory_limits or {}
+
+        self.gas = gas
+        self.bonded = bonded
+        self.confirmations = confirmations
+        self.batch_size = batch_size
+
+        self.cursors = dict((address, start_block - 1) for address in self.brokers)
+        self.queue = collections.deque()
+        # (broker, request_id) -> (QueuedRequest, AsyncResult)
+        self.computing = {}
+        self.computing_by_factory = collections.Counter()
+        # txn_hash -> (QueuedRequest, time sent)
+        self.submitted = {}
+
+        self.metrics = Metrics()
+
+    #
+    #  Stages
+    #
+    def poll(self):
+        """
+        Queue the requests created since the last poll.  Returns the number
+        of requests queued.
+        """
+        if len(self.queue) >= self.max_queue:
+            self.metrics.increment('polls_paused')
+            return 0
+
+        head = self.client.get_block_number() - self.confirmations
+        num_queued = 0
+
+        for broker in sorted(self.brokers):
+            from_block = self.cursors[broker] + 1
+            if from_block > head:
+                continue
+            to_block = min(from_block + self.batch_size - 1, head)
+
+            logs = self.client.get_logs(
+                address=broker,
+                topics=[[EVENT_NAMES['Created']]],
+                from_block=from_block,
+                to_block=to_block,
+            )
+            logs = sorted(logs, key=lambda l: (int(l['blockNumber'], 16), int(l['logIndex'], 16)))
+
+            for log in logs:
+                name, data = decode_log(log)
+                if name != 'Created':
+                    continue
+                self.queue.append(QueuedRequest(
+                    broker=broker,
+                    request_id=data['id'],
+                    args_hash=data['argsHash'],
+                    created_block=int(log['blockNumber'], 16),
+                    queued_at=time.time(),
+                ))
+                num_queued += 1
+
+            self.cursors[broker] = to_block
+
+        self.metrics.increment('queued', num_queued)
+        return num_queued
+
+    def _factory_is_full(self, factory_type):
+        limit = self.factory_limits.get(factory_type)
+        return limit is not None and self.computing_by_factory[factory_type] >= limit
+
+    def dispatch(self):
+        """
+        Start computing queued requests while there is capacity.  Requests
+        whose factory is at its limit stay queued in order.  Returns the
+        number of computations started.
+        """
+        deferred = []
+        num_started = 0
+
+        while self.queue and len(self.computing) < self.max_in_flight:
+            queued = self.queue.popleft()
+            factory_type = self.brokers[queued.broker]
+
+            if self._factory_is_full(factory_type):
+                deferred.append(queued)
+                continue
+
+            request = self.get_request(queued.broker, queued.request_id)
+            if request[REQUEST_STATUS] != Status.Pending:
+                self.metrics.increment('skipped')
+                continue
+
+            try:
+                args = self.get_request_args(
+                    queued.broker, queued.request_id, queued.args_hash, queued.created_block,
+                )
+            except (KeyError, ValueError):
+                self.metrics.increment('args_errors')
+                continue
+
+            async_result = self.pool.apply_async(
+                run_solver, (self.registry.get(factory_type), args),
+            )
+            self.computing[(queued.broker, queued.request_id)] = (queued, async_result)
+            self.computing_by_factory[factory_type] += 1
+            self.metrics.observe('queue_latency', time.time() - queued.queued_at)
+            num_started += 1
+
+        self.queue.extendleft(reversed(deferred))
+        return num_started
+
+    def collect(self):
+        """
+        Submit answers for every finished computation.  Returns the number
+        of answers sent.
+        """
+        num_sent = 0
+
+        for key, (queued, async_result) in list(self.computing.items()):
+            if not async_result.ready():
+                continue
+
+            del self.computing[key]
+            self.computing_by_factory[self.brokers[queued.broker]] -= 1
+
+            try:
+                result, duration = async_result.get()
+            except Exception:
+                self.metrics.increment('compute_errors')
+                continue
+
+            self.metrics.observe('compute_latency', duration)
+            if self.submit(queued, result):
+                num_sent += 1
+
+        return num_sent
+
+    def submit(self, queued, result):
+        request = self.get_request(queued.broker, queued.request_id)
+        if request[REQUEST_STATUS] != Status.Pending:
+            # Answered by someone else while computing.
+            self.metrics.increment('skipped')
+            return False
+
+        txn_hash = self.client.send_transaction(
+            _from=self._from,
+            to=queued.broker,
+            gas=self.gas,
+            value=0 if self.bonded else request[REQUEST_REQUIRED_DEPOSIT],
+            data=encode_hex(encode_answer_call(queued.request_id, result)),
+        )
+        self.submitted[txn_hash] = (queued, time.time())
+        return True
+
+    def confirm(self):
+        """
+        Check the receipts of submitted answers.  Returns the number of
+        answers which were accepted.
+        """
+        num_answered = 0
+
+        for txn_hash, (queued, sent_at) in list(self.submitted.items()):
+            receipt = self.client.get_transaction_receipt(txn_hash)
+            if receipt is None:
+                continue
+            del self.submitted[txn_hash]
+
+            self.metrics.observe('submit_latency', time.time() - sent_at)
+
+            # A failed transaction has no logs, e.g. when another answer
+            # was mined first.
+            if not any(decode_log(log)[0] == 'AnswerSubmitted' for log in receipt['logs']):
+                self.metrics.increment('rejected')
+                continue
+
+            self.metrics.increment('answered')
+            self.metrics.observe(
+                'answer_latency_blocks',
+                int(receipt['blockNumber'], 16) - queued.created_block,
+            )
+            num_answered += 1
+
+        return num_answered
+
+    #
+    #  Main loop
+    #
+    def run_once(self):
+        self.confirm()
+        self.collect()
+        self.poll()
+        self.dispatch()
+
+        self.metrics.set('queue_depth', len(self.queue))
+        self.metrics.set('in_flight', len(self.computing))
+        self.metrics.set('pending_submissions', len(self.submitted))
+
+    def run_forever(self, poll_interval=1.0):
+        try:
+            while True:
+                self.run_once()
+                time.sleep(poll_interval)
+        finally:
+            self.close()
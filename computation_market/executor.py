@@ -0,0 +1,268 @@
+import collections
+import time
+
+from computation_market.utils import (
+    sha3,
+    encode_hex,
+    decode_hex,
+    function_selector,
+    event_topic,
+    encode_uint,
+    encode_bytes,
+    decode_address,
+    decode_bytes32,
+    decode_dynamic_bytes,
+    decode_bool,
+)
+
+
+STEP_SELECTOR = function_selector('step(uint256,bytes)')
+BUILD_SELECTOR = function_selector('build(bytes)')
+IS_STATELESS_SELECTOR = function_selector('isStateless()')
+INPUT_SELECTOR = function_selector('input()')
+CONSTRUCTED_TOPIC = event_topic('Constructed(address,bytes32)')
+
+
+ExecutionResult = collections.namedtuple(
+    'ExecutionResult',
+    ['args', 'executable', 'output', 'output_hash', 'steps', 'duration'],
+)
+
+
+def encode_step_call(current_step, state):
+    # `step(uint256,bytes)`: the head is the step number followed by the
+    # offset to the dynamic `state` value.
+    return encode_hex(
+        STEP_SELECTOR + encode_uint(current_step) + encode_uint(64) + encode_bytes(state)
+    )
+
+
+def decode_step_return(data):
+    # `returns (bytes result, bool)`
+    data = decode_hex(data)
+    return decode_dynamic_bytes(data, 0), decode_bool(data, 1)
+
+
+class StatelessExecutor(object):
+    """
+    Computes the output of a *stateless* executable off-chain using the
+    on-chain `step` implementation.
+
+    Each step is evaluated with `eth_call` so that no transactions are sent
+    during execution, which mirrors the chained evaluation described in the
+    execution model documentation::
+
+        fib.step(3, fib.step(2, fib.step(1, "3")))
+
+    The executable instance is still needed since `step` may read the `input`
+    the contract was constructed with.  It is located from the factory's
+    `Constructed` logs, or built with a single transaction if no instance for
+    the given args exists yet.
+
+    Successive steps of a single computation depend on each other so they
+    cannot share a round trip.  `run_many` advances many computations in
+    lockstep, sending the current step of every unfinished computation as one
+    JSON-RPC batch when the client supports `call_many`.
+    """
+    def __init__(self, client, factory_address, _from=None, gas=None,
+                 max_steps=None):
+        self.client = client
+        self.factory_address = factory_address
+        self._from = _from
+        self.gas = gas
+        self.max_steps = max_steps
+        self._executables = {}
+        self._checked_stateless = False
+
+    def _call(self, **kwargs):
+        return self.client.call(_from=self._from, gas=self.gas, **kwargs)
+
+    def _call_many(self, calls):
+        if hasattr(self.client, 'call_many'):
+            return self.client.call_many([
+                dict(_from=self._from, gas=self.gas, **call) for call in calls
+            ])
+        return [self._call(**call) for call in calls]
+
+    def is_stateless(self):
+        output = self._call(to=self.factory_address, data=encode_hex(IS_STATELESS_SELECTOR))
+        return decode_bool(decode_hex(output))
+
+    def _require_stateless(self):
+        if self._checked_stateless:
+            return
+        if not self.is_stateless():
+            raise ValueError(
+                "Factory {0} is not stateless.  Stateful executables cannot be "
+                "evaluated with `eth_call`".format(self.factory_address)
+            )
+        self._checked_stateless = True
+
+    #
+    #  Executable lookup
+    #
+    @staticmethod
+    def _parse_constructed_log(log):
+        data = decode_hex(log['data'])
+        return decode_address(data, 0), decode_bytes32(data, 1)
+
+    def _is_constructed_log(self, log):
+        return (
+            log['address'].lower() == self.factory_address.lower() and
+            log['topics'] and
+            log['topics'][0] == CONSTRUCTED_TOPIC
+        )
+
+    def has_args(self, executable, args_hash):
+        """
+        Whether `executable` currently holds the args hashing to `args_hash`.
+        Recycling factories reinitialize finished executables with new args
+        and other factories destroy them, in which case the call returns no
+        data.
+        """
+        output = decode_hex(self._call(to=executable, data=encode_hex(INPUT_SELECTOR)))
+        if not output:
+            return False
+        return sha3(decode_dynamic_bytes(output)) == args_hash
+
+    def find_executable(self, args):
+        """
+        Return the address of an existing executable for `args`, or `None`.
+        """
+        args_hash = sha3(args)
+        if args_hash in self._executables:
+            executable = self._executables[args_hash]
+            if self.has_args(executable, args_hash):
+                return executable
+            del self._executables[args_hash]
+        if not hasattr(self.client, 'get_logs'):
+            return None
+
+        logs = self.client.get_logs(
+            address=self.factory_address,
+            topics=[CONSTRUCTED_TOPIC],
+        )
+        # Only the latest `Constructed` log for each address is current.
+        # Addresses are kept in the order of their latest log so that the
+        # most recent executable for an `argsHash` wins.
+        current = collections.OrderedDict()
+        for log in logs:
+            addr, log_args_hash = self._parse_constructed_log(log)
+            current.pop(addr, None)
+            current[addr] = log_args_hash
+        # Drop cached executables which have since been reused for other
+        # args.
+        for log_args_hash, addr in list(self._executables.items()):
+            if current.get(addr, log_args_hash) != log_args_hash:
+                del self._executables[log_args_hash]
+        for addr, log_args_hash in current.items():
+            self._executables[log_args_hash] = addr
+
+        executable = self._executables.get(args_hash)
+        if executable is None:
+            return None
+        if not self.has_args(executable, args_hash):
+            del self._executables[args_hash]
+            return None
+        return executable
+
+    def build_executable(self, args):
+        data = encode_hex(BUILD_SELECTOR + encode_uint(32) + encode_bytes(args))
+        txn_hash = self.client.send_transaction(
+            _from=self._from, to=self.factory_address, data=data,
+        )
+        receipt = self.client.wait_for_transaction(txn_hash)
+
+        for log in receipt['logs']:
+            if self._is_constructed_log(log):
+                addr, args_hash = self._parse_constructed_log(log)
+                self._executables[args_hash] = addr
+                return addr
+        raise ValueError("Factory did not log a `Constructed` event")
+
+    def get_executable(self, args):
+        return self.find_executable(args) or self.build_executable(args)
+
+    #
+    #  Execution
+    #
+    def _check_max_steps(self, current_step):
+        if self.max_steps is not None and current_step > self.max_steps:
+            raise ValueError(
+                "Computation did not finish within {0} steps".format(self.max_steps)
+            )
+
+    def call_steps(self, executable, steps):
+        """
+        Evaluate each `(current_step, state)` pair in `steps` against
+        `executable` in a single batch, returning the `(result, is_final)`
+        tuples in the same order.
+        """
+        outputs = self._call_many([
+            {'to': executable, 'data': encode_step_call(current_step, state)}
+            for current_step, state in steps
+        ])
+        return [decode_step_return(output) for output in outputs]
+
+    def run(self, args):
+        """
+        Compute the output for `args`, returning an `ExecutionResult`.
+        """
+        return self.run_many([args])[0]
+
+    def run_many(self, args_list):
+        """
+        Compute the output for each value in `args_list`.  Results are
+        returned in the same order as `args_list`.
+        """
+        self._require_stateless()
+
+        executables = [self.get_executable(args) for args in args_list]
+
+        # index -> [current_step, state]
+        pending = dict(
+            (idx, [1, args]) for idx, args in enumerate(args_list)
+        )
+        results = [None] * len(args_list)
+        start = time.time()
+
+        while pending:
+            indices = sorted(pending)
+            outputs = self._call_many([
+                {
+                    'to': executables[idx],
+                    'data': encode_step_call(*pending[idx]),
+                }
+                for idx in indices
+            ])
+
+            for idx, output in zip(indices, outputs):
+                current_step = pending[idx][0]
+                state, is_final = decode_step_return(output)
+
+                if is_final:
+                    del pending[idx]
+                    results[idx] = ExecutionResult(
+                        args=args_list[idx],
+                        executable=executables[idx],
+                        output=state,
+                        output_hash=sha3(state),
+                        steps=current_step,
+                        duration=time.time() - start,
+                    )
+                else:
+                    self._check_max_steps(current_step + 1)
+                    pending[idx] = [current_step + 1, state]
+
+        return results
+
+    @staticmethod
+    def steps_per_second(results):
+        """
+        Aggregate step throughput over a collection of `ExecutionResult`s
+        that were computed together.
+        """
+        duration = max([result.duration for result in results] or [0])
+        if duration <= 0:
+            return 0.0
+        return sum(result.steps for result in results) / float(duration)
@@ -0,0 +1,383 @@
+"""
+Incremental indexer which mirrors the state of every request on a `Broker`
+into a local SQLite database by following the broker's events.
+"""
+import binascii
+import sqlite3
+
+from computation_market.broker import (
+    Status,
+    EVENT_NAMES,
+    decode_log,
+)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    block_number INTEGER PRIMARY KEY,
+    block_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    event TEXT NOT NULL,
+    request_id INTEGER NOT NULL,
+    hash TEXT,
+    data TEXT,
+    is_challenge INTEGER,
+    is_finished INTEGER,
+    n_times INTEGER,
+    address TEXT,
+    value TEXT,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS events_request_id ON events (request_id);
+CREATE TABLE IF NOT EXISTS requests (
+    id INTEGER PRIMARY KEY,
+    args_hash TEXT NOT NULL,
+    args TEXT,
+    status INTEGER NOT NULL,
+    created_block INTEGER NOT NULL,
+    updated_block INTEGER NOT NULL,
+    initial_answer_hash TEXT,
+    initial_answer_block INTEGER,
+    challenge_answer_hash TEXT,
+    challenge_answer_block INTEGER,
+    execution_steps INTEGER NOT NULL DEFAULT 0,
+    gas_reimbursements TEXT NOT NULL DEFAULT '0',
+    payment_to TEXT,
+    payment TEXT,
+    deposits_returned TEXT NOT NULL DEFAULT '0'
+);
+CREATE INDEX IF NOT EXISTS requests_status ON requests (status);
+"""
+
+
+def _hex(value):
+    return '0x' + binascii.hexlify(value).decode('ascii')
+
+
+class BrokerIndexer(object):
+    """
+    Follows the events of a single `Broker` contract.
+
+    Each call to `sync` processes the blocks after the stored cursor in
+    ranges of at most `batch_size` blocks, stopping `confirmations` blocks
+    behind the chain head.  The hash of the last block of every range is
+    stored as a checkpoint.  Before syncing, the latest checkpoint is compared
+    against the chain; if it no longer matches, the indexer rolls back to the
+    newest checkpoint that does and replays the affected requests from the
+    remaining events.
+
+    `client` must provide `get_block_number`, `get_block_by_number` and
+    `get_logs` (see `computation_market.rpc.BatchRPCClient`).
+
+    Only requests created at or after `start_block` are mirrored.  Events
+    for older requests are stored but otherwise ignored.
+
+    The mirrored status is derived from events alone, and `softResolveAnswer`
+    does not log one.  A soft resolved request therefore stays
+    `WaitingForResolution` in the mirror until its `Payment` event marks it
+    `Finalized`.  Use `Broker.getRequest` when `SoftResolution` needs to be
+    told apart.
+    """
+    def __init__(self, client, broker_address, database=':memory:',
+                 start_block=0, batch_size=1000, confirmations=0,
+                 max_checkpoints=256):
+        self.client = client
+        self.broker_address = broker_address.lower()
+        self.start_block = start_block
+        self.batch_size = batch_size
+        self.confirmations = confirmations
+        self.max_checkpoints = max_checkpoints
+
+        self.db = sqlite3.connect(database)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        self._check_broker_address()
+
+    def _check_broker_address(self):
+        row = self.db.execute(
+            "SELECT value FROM meta WHERE key = 'broker'"
+        ).fetchone()
+        if row is None:
+            with self.db:
+                self.db.execute(
+                    "INSERT INTO meta (key, value) VALUES ('broker', ?)",
+                    (self.broker_address,),
+                )
+        elif row['value'] != self.broker_address:
+            raise ValueError(
+                "Database is indexing a different broker: {0}".format(row['value'])
+            )
+
+    #
+    #  Cursor and checkpoints
+    #
+    @property
+    def cursor(self):
+        """
+        The last block that has been fully indexed, or `None`.
+        """
+        row = self.db.execute(
+            "SELECT MAX(block_number) AS block_number FROM checkpoints"
+        ).fetchone()
+        return row['block_number']
+
+    def _block_hash(self, block_number):
+        block = self.client.get_block_by_number(block_number)
+        if block is None:
+            # The chain was reorganized to a shorter one.
+            return None
+        return block['hash']
+
+    def _find_fork_point(self):
+        """
+        Return the newest checkpoint which is still part of the canonical
+        chain, or `None` if none are.
+        """
+        checkpoints = self.db.execute(
+            "SELECT block_number, block_hash FROM checkpoints ORDER BY block_number DESC"
+        ).fetchall()
+        for checkpoint in checkpoints:
+            if self._block_hash(checkpoint['block_number']) == checkpoint['block_hash']:
+                return checkpoint['block_number']
+        return None
+
+    def rollback(self, block_number):
+        """
+        Discard everything indexed after `block_number` and rebuild the
+        request mirror for every request that was touched by the discarded
+        events.
+        """
+        if block_number is None:
+            block_number = self.start_block - 1
+
+        with self.db:
+            affected = [row['request_id'] for row in self.db.execute(
+                "SELECT DISTINCT request_id FROM events WHERE block_number > ?",
+                (block_number,),
+            )]
+            self.db.execute("DELETE FROM events WHERE block_number > ?", (block_number,))
+            self.db.execute("DELETE FROM checkpoints WHERE block_number > ?", (block_number,))
+
+            for request_id in affected:
+                self.db.execute("DELETE FROM requests WHERE id = ?", (request_id,))
+                events = self.db.execute(
+                    "SELECT * FROM events WHERE request_id = ? "
+                    "ORDER BY block_number, log_index",
+                    (request_id,),
+                ).fetchall()
+                for event in events:
+                    self._apply(event)
+
+    def _check_for_reorg(self):
+        cursor = self.cursor
+        if cursor is None:
+            return
+        stored = self.db.execute(
+            "SELECT block_hash FROM checkpoints WHERE block_number = ?", (cursor,),
+        ).fetchone()['block_hash']
+        if self._block_hash(cursor) != stored:
+            self.rollback(self._find_fork_point())
+
+    #
+    #  Syncing
+    #
+    def sync(self):
+        """
+        Index all new confirmed blocks.  Returns the number of events
+        processed.
+        """
+        self._check_for_reorg()
+
+        head = self.client.get_block_number() - self.confirmations
+        cursor = self.cursor
+        from_block = self.start_block if cursor is None else cursor + 1
+
+        num_events = 0
+        while from_block <= head:
+            to_block = min(from_block + self.batch_size - 1, head)
+            num_events += self.sync_range(from_block, to_block)
+            from_block = to_block + 1
+        return num_events
+
+    def sync_range(self, from_block, to_block):
+        logs = self.client.get_logs(
+            address=self.broker_address,
+            topics=[list(EVENT_NAMES.values())],
+            from_block=from_block,
+            to_block=to_block,
+        )
+        logs = sorted(logs, key=lambda l: (int(l['blockNumber'], 16), int(l['logIndex'], 16)))
+
+        with self.db:
+            for log in logs:
+                self._record(log)
+            self.db.execute(
+                "INSERT OR REPLACE INTO checkpoints (block_number, block_hash) VALUES (?, ?)",
+                (to_block, self._block_hash(to_block)),
+            )
+            self.db.execute(
+                "DELETE FROM checkpoints WHERE block_number NOT IN ("
+                "SELECT block_number FROM checkpoints ORDER BY block_number DESC LIMIT ?)",
+                (self.max_checkpoints,),
+            )
+        return len(logs)
+
+    def _record(self, log):
+        name, data = decode_log(log)
+        # Only events about a request are recorded.
+        if name is None or 'id' not in data:
+            return
+
+        if name == 'Created':
+            _hash = _hex(data['argsHash'])
+        elif name == 'AnswerSubmitted':
+            _hash = _hex(data['resultHash'])
+        else:
+            _hash = None
+
+        row = {
+            'block_number': int(log['blockNumber'], 16),
+            'log_index': int(log['logIndex'], 16),
+            'transaction_hash': log['transactionHash'],
+            'event': name,
+            'request_id': data['id'],
+            'hash': _hash,
+            'data': _hex(data['args']) if 'args' in data else None,
+            'is_challenge': data.get('isChallenge'),
+            'is_finished': data.get('isFinished'),
+            'n_times': data.get('nTimes'),
+            'address': data.get('to'),
+            # uint256 values do not fit in a sqlite integer.
+            'value': str(data['value']) if 'value' in data else None,
+        }
+        self.db.execute(
+            "INSERT OR REPLACE INTO events ({0}) VALUES ({1})".format(
+                ', '.join(row), ', '.join('?' for _ in row),
+            ),
+            tuple(row.values()),
+        )
+        self._apply(row)
+
+    #
+    #  Request mirror
+    #
+    def _update(self, request_id, block_number, **values):
+        values['updated_block'] = block_number
+        self.db.execute(
+            "UPDATE requests SET {0} WHERE id = ?".format(
+                ', '.join('{0} = ?'.format(key) for key in values),
+            ),
+            tuple(values.values()) + (request_id,),
+        )
+
+    def _add(self, request_id, column, value):
+        row = self.db.execute(
+            "SELECT {0} FROM requests WHERE id = ?".format(column), (request_id,),
+        ).fetchone()
+        return str(int(row[column]) + int(value))
+
+    def _apply(self, event):
+        name = event['event']
+        request_id = event['request_id']
+        block_number = event['block_number']
+
+        if name != 'Created' and self.db.execute(
+            "SELECT 1 FROM requests WHERE id = ?", (request_id,),
+        ).fetchone() is None:
+            # Created before `start_block` so there is nothing to update.
+            return
+
+        if name == 'Created':
+            self.db.execute(
+                "INSERT OR REPLACE INTO requests "
+                "(id, args_hash, status, created_block, updated_block) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (request_id, event['hash'], Status.Pending, block_number, block_number),
+            )
+        elif name == 'ArgsLogged':
+            self._update(request_id, block_number, args=event['data'])
+        elif name == 'AnswerSubmitted' and event['is_challenge']:
+            self._update(
+                request_id, block_number,
+                status=Status.NeedsResolution,
+                challenge_answer_hash=event['hash'],
+                challenge_answer_block=block_number,
+            )
+        elif name == 'AnswerSubmitted':
+            self._update(
+                request_id, block_number,
+                status=Status.WaitingForResolution,
+                initial_answer_hash=event['hash'],
+                initial_answer_block=block_number,
+            )
+        elif name == 'GasReimbursement':
+            # `initializeDispute` does not log its own event, but it is the
+            # only reimbursement made while a request needs resolution.
+            request = self.get_request(request_id)
+            values = {'gas_reimbursements': self._add(request_id, 'gas_reimbursements', event['value'])}
+            if request['status'] == Status.NeedsResolution:
+                values['status'] = Status.Resolving
+            self._update(request_id, block_number, **values)
+        elif name == 'Execution':
+            row = self.get_request(request_id)
+            self._update(
+                request_id, block_number,
+                status=Status.FirmResolution if event['is_finished'] else Status.Resolving,
+                execution_steps=row['execution_steps'] + event['n_times'],
+            )
+        elif name == 'Payment':
+            self._update(
+                request_id, block_number,
+                status=Status.Finalized,
+                payment_to=event['address'],
+                payment=event['value'],
+            )
+        elif name == 'DepositReturned':
+            self._update(
+                request_id, block_number,
+                deposits_returned=self._add(request_id, 'deposits_returned', event['value']),
+            )
+        elif name == 'Cancelled':
+            self._update(request_id, block_number, status=Status.Cancelled)
+
+    #
+    #  Queries
+    #
+    def get_request(self, request_id):
+        row = self.db.execute(
+            "SELECT * FROM requests WHERE id = ?", (request_id,),
+        ).fetchone()
+        if row is None:
+            raise KeyError("Unknown request: {0}".format(request_id))
+        return dict(row)
+
+    def get_requests(self, status=None, limit=None, offset=0):
+        query = "SELECT * FROM requests"
+        params = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params += (status,)
+        query += " ORDER BY id LIMIT ? OFFSET ?"
+        params += (-1 if limit is None else limit, offset)
+        return [dict(row) for row in self.db.execute(query, params)]
+
+    def count_by_status(self):
+        return dict(
+            (row['status'], row['total']) for row in self.db.execute(
+                "SELECT status, COUNT(*) AS total FROM requests GROUP BY status"
+            )
+        )
+
+    def get_events(self, request_id):
+        return [dict(row) for row in self.db.execute(
+            "SELECT * FROM events WHERE request_id = ? ORDER BY block_number, log_index",
+            (request_id,),
+        )]
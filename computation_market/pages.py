@@ -0,0 +1,106 @@
+"""
+Decoders for the paged `Broker` getters (`getRequests`, `getInitialAnswers`
+and `getChallengeAnswers`).
+
+Each page is a flat `uint[]` with a fixed number of words per entry, laid out
+in the same order as the return values of the single id getters.
+"""
+import binascii
+import collections
+
+
+REQUEST_FIELDS = (
+    'argsHash',
+    'resultHash',
+    'requester',
+    'executable',
+    'creationBlock',
+    'status',
+    'payment',
+    'softResolutionBlocks',
+    'gasReimbursements',
+    'requiredDeposit',
+)
+
+ANSWER_FIELDS = (
+    'resultHash',
+    'submitter',
+    'creationBlock',
+    'isVerified',
+    'depositAmount',
+)
+
+
+Request = collections.namedtuple('Request', ('id',) + REQUEST_FIELDS)
+Answer = collections.namedtuple('Answer', ('id',) + ANSWER_FIELDS)
+
+
+def to_bytes32(value):
+    return binascii.unhexlify('{0:064x}'.format(value))
+
+
+def to_address(value):
+    return '0x{0:040x}'.format(value)
+
+
+def to_bool(value):
+    return bool(value)
+
+
+REQUEST_CASTS = {
+    'argsHash': to_bytes32,
+    'resultHash': to_bytes32,
+    'requester': to_address,
+    'executable': to_address,
+}
+
+ANSWER_CASTS = {
+    'resultHash': to_bytes32,
+    'submitter': to_address,
+    'isVerified': to_bool,
+}
+
+
+def _decode_page(words, start_id, record_type, fields, casts):
+    width = len(fields)
+    if len(words) % width:
+        raise ValueError(
+            "Page length {0} is not a multiple of {1}".format(len(words), width)
+        )
+    return [
+        record_type(start_id + idx, *(
+            casts.get(field, int)(value)
+            for field, value in zip(fields, words[offset:offset + width])
+        ))
+        for idx, offset in enumerate(range(0, len(words), width))
+    ]
+
+
+def decode_request_page(words, start_id):
+    """
+    Decode the return value of `getRequests(start_id, count)` into a list of
+    `Request` records.
+    """
+    return _decode_page(words, start_id, Request, REQUEST_FIELDS, REQUEST_CASTS)
+
+
+def decode_answer_page(words, start_id):
+    """
+    Decode the return value of `getInitialAnswers(start_id, count)` or
+    `getChallengeAnswers(start_id, count)` into a list of `Answer` records.
+    """
+    return _decode_page(words, start_id, Answer, ANSWER_FIELDS, ANSWER_CASTS)
+
+
+def iter_requests(broker, start_id=1, page_size=200):
+    """
+    Iterate over every request on `broker` (a populus contract instance),
+    fetching `page_size` requests per call.
+    """
+    while True:
+        page = decode_request_page(broker.getRequests(start_id, page_size), start_id)
+        for request in page:
+            yield request
+        if len(page) < page_size:
+            return
+        start_id += page_size
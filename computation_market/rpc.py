@@ -0,0 +1,140 @@
+import itertools
+import json
+import time
+
+import requests
+
+
+class RPCError(Exception):
+    pass
+
+
+class BatchRPCClient(object):
+    """
+    Minimal JSON-RPC client for a local ethereum node which can send many
+    requests in a single HTTP round trip.
+
+    Exposes the same `call`, `send_transaction` and `wait_for_transaction`
+    methods as the populus blockchain clients so it can be used anywhere the
+    tooling in this package expects a client.
+    """
+    def __init__(self, host='127.0.0.1', port=8545, timeout=30):
+        self.endpoint = 'http://{0}:{1}'.format(host, port)
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._ids = itertools.count(1)
+
+    def _payload(self, method, params):
+        return {
+            'jsonrpc': '2.0',
+            'method': method,
+            'params': params,
+            'id': next(self._ids),
+        }
+
+    def _post(self, payload):
+        response = self.session.post(
+            self.endpoint,
+            data=json.dumps(payload),
+            headers={'Content-Type': 'application/json'},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _result(response):
+        if response.get('error'):
+            raise RPCError(response['error'])
+        return response['result']
+
+    def make_request(self, method, params):
+        return self._result(self._post(self._payload(method, params)))
+
+    def make_batch_request(self, requests_list):
+        """
+        Send every `(method, params)` pair in `requests_list` as a single
+        JSON-RPC batch.  Results are returned in the order of the requests.
+        """
+        if not requests_list:
+            return []
+        payloads = [self._payload(method, params) for method, params in requests_list]
+        responses = dict(
+            (response['id'], response) for response in self._post(payloads)
+        )
+        return [self._result(responses[payload['id']]) for payload in payloads]
+
+    #
+    #  Transaction helpers
+    #
+    @staticmethod
+    def _transaction(_from=None, to=None, gas=None, gas_price=None, value=0,
+                     data=None):
+        transaction = {}
+        if _from is not None:
+            transaction['from'] = _from
+        if to is not None:
+            transaction['to'] = to
+        if gas is not None:
+            transaction['gas'] = hex(gas)
+        if gas_price is not None:
+            transaction['gasPrice'] = hex(gas_price)
+        if value:
+            transaction['value'] = hex(value)
+        if data is not None:
+            transaction['data'] = data
+        return transaction
+
+    def call(self, block='latest', **kwargs):
+        return self.make_request('eth_call', [self._transaction(**kwargs), block])
+
+    def call_many(self, calls, block='latest'):
+        """
+        Execute a list of `eth_call` requests, each given as a dictionary of
+        the keyword arguments accepted by `call`, in one round trip.
+        """
+        return self.make_batch_request([
+            ('eth_call', [self._transaction(**call_kwargs), block])
+            for call_kwargs in calls
+        ])
+
+    def send_transaction(self, **kwargs):
+        return self.make_request('eth_sendTransaction', [self._transaction(**kwargs)])
+
+    def get_transaction_receipt(self, txn_hash):
+        return self.make_request('eth_getTransactionReceipt', [txn_hash])
+
+    def wait_for_transaction(self, txn_hash, max_wait=60):
+        start = time.time()
+        while True:
+            receipt = self.get_transaction_receipt(txn_hash)
+            if receipt is not None:
+                return receipt
+            if time.time() - start > max_wait:
+                raise ValueError("Timed out waiting for transaction {0}".format(txn_hash))
+            time.sleep(0.1)
+
+    #
+    #  Chain helpers
+    #
+    def get_coinbase(self):
+        return self.make_request('eth_coinbase', [])
+
+    def get_block_number(self):
+        return int(self.make_request('eth_blockNumber', []), 16)
+
+    def get_block_by_number(self, block_number, full_transactions=False):
+        return self.make_request(
+            'eth_getBlockByNumber', [hex(block_number), full_transactions],
+        )
+
+    def get_logs(self, address=None, topics=None, from_block=0, to_block='latest'):
+        log_filter = {
+            'fromBlock': hex(from_block) if isinstance(from_block, int) else from_block,
+            'toBlock': hex(to_block) if isinstance(to_block, int) else to_block,
+        }
+        if address is not None:
+            log_filter['address'] = address
+        if topics is not None:
+            log_filter['topics'] = topics
+        return self.make_request('eth_getLogs', [log_filter])
@@ -0,0 +1,253 @@
+"""
+Native python implementations of the example executables.
+
+Each solver reproduces the exact `step` semantics of its on-chain
+counterpart, including the byte level encoding of intermediate state, so that
+the output it computes is byte-identical to what the executable would produce
+during dispute resolution.  Solvers may additionally provide a faster `solve`
+implementation for computing the final output directly.
+"""
+import collections
+import random
+
+
+UINT_MAX = 2 ** 256
+
+
+def int_to_bytes(value):
+    """
+    Python equivalent of `DunderUIntToBytes.toBytes`: the minimal little-endian
+    byte representation of an unsigned integer (`0` encodes to an empty value).
+    """
+    if value < 0 or value >= UINT_MAX:
+        raise ValueError("Value does not fit in a uint256: {0}".format(value))
+    result = bytearray()
+    while value:
+        result.append(value & 0xff)
+        value >>= 8
+    return bytes(result)
+
+
+def bytes_to_int(value):
+    """
+    Python equivalent of `DunderBytes.toUInt`.  Bytes beyond the 32nd are
+    multiplied by a power of two which overflows to zero on-chain, so they
+    do not contribute to the result.
+    """
+    return sum(
+        b << (8 * idx)
+        for idx, b in enumerate(bytearray(value[:32]))
+    )
+
+
+def extract_uint(value, start_idx, end_idx):
+    """
+    Python equivalent of `DunderBytes.extractUint`.  Note that `end_idx` is
+    exclusive.
+    """
+    if start_idx >= end_idx or end_idx >= len(value):
+        raise ValueError("Invalid slice of bytes value")
+    return bytes_to_int(value[start_idx:end_idx])
+
+
+class Solver(object):
+    """
+    Base class for native solvers.  Subclasses must implement `step` with the
+    same signature and semantics as `ExecutableInterface.step`, plus the
+    `args` the executable was constructed with (exposed on-chain as `input`).
+    """
+    # Guard against runaway computations.
+    max_steps = 1000000
+
+    def step(self, current_step, state, args):
+        raise NotImplementedError("Solvers must implement `step`")
+
+    def iter_steps(self, args):
+        """
+        Yield a `(current_step, state, result, is_final)` tuple for every step
+        of the computation in the same order `ExecutableBase.execute` would
+        run them.
+        """
+        state = args
+        current_step = 0
+        while True:
+            current_step += 1
+            if current_step > self.max_steps:
+                raise ValueError("Exceeded the maximum number of steps")
+            result, is_final = self.step(current_step, state, args)
+            yield current_step, state, result, is_final
+            if is_final:
+                return
+            state = result
+
+    def solve(self, args):
+        """
+        Return the final output of the computation for `args`.
+        """
+        for _, _, result, _ in self.iter_steps(args):
+            pass
+        return result
+
+
+class SolverRegistry(object):
+    """
+    Maps factory contract types to the solver which implements their
+    computation.
+    """
+    def __init__(self):
+        self._solvers = {}
+
+    def register(self, factory_type, solver_class=None):
+        """
+        Register a solver for `factory_type`.  Can be used directly or as a
+        class decorator.
+        """
+        def _register(solver_class):
+            if factory_type in self._solvers:
+                raise ValueError(
+                    "A solver is already registered for {0}".format(factory_type)
+                )
+            self._solvers[factory_type] = solver_class
+            return solver_class
+
+        if solver_class is None:
+            return _register
+        return _register(solver_class)
+
+    def unregister(self, factory_type):
+        self._solvers.pop(factory_type, None)
+
+    def get(self, factory_type):
+        try:
+            return self._solvers[factory_type]()
+        except KeyError:
+            raise KeyError("No solver registered for {0}".format(factory_type))
+
+    def __contains__(self, factory_type):
+        return factory_type in self._solvers
+
+    def factory_types(self):
+        return sorted(self._solvers)
+
+
+registry = SolverRegistry()
+
+
+@registry.register('BuildByteArrayFactory')
+class BuildByteArraySolver(Solver):
+    def step(self, current_step, state, args):
+        if current_step == 1:
+            result = bytearray()
+        else:
+            result = bytearray(state)
+        result.append(current_step % 256)
+        return bytes(result), len(result) >= len(args)
+
+    def solve(self, args):
+        return bytes(bytearray(
+            i % 256 for i in range(1, max(len(args), 1) + 1)
+        ))
+
+
+def fast_doubling_fibonacci(n):
+    """
+    Return `(F(n), F(n + 1))` using the fast doubling identities.
+
+        F(2k) = F(k) * (2 * F(k + 1) - F(k))
+        F(2k + 1) = F(k) ** 2 + F(k + 1) ** 2
+    """
+    if n == 0:
+        return 0, 1
+    a, b = fast_doubling_fibonacci(n >> 1)
+    c = a * (2 * b - a)
+    d = a * a + b * b
+    if n & 1:
+        return d, c + d
+    return c, d
+
+
+# Numbers carried between steps are read back from 31 of the 32 bytes they
+# are stored in, so once they reach this size the executable no longer
+# computes the true fibonacci sequence.
+FIBONACCI_EXACT_LIMIT = 2 ** 248
+
+
+@registry.register('FibonacciFactory')
+class FibonacciSolver(Solver):
+    """
+    The executable computes `F(n + 1)` for an input of `n`, carrying the last
+    two computed numbers between steps in a 64 byte value.
+    """
+    def step(self, current_step, state, args):
+        n = bytes_to_int(args)
+
+        if current_step == 1 or current_step == 2:
+            fib_n = 1
+        else:
+            fib_n = (extract_uint(state, 0, 31) + extract_uint(state, 32, 63)) % UINT_MAX
+
+        if current_step > n:
+            return int_to_bytes(fib_n), True
+        elif current_step == 1:
+            return b'\x00' * 32 + int_to_bytes(fib_n).ljust(32, b'\x00'), False
+        else:
+            return bytes(state[32:64]) + int_to_bytes(fib_n).ljust(32, b'\x00'), False
+
+    def solve(self, args):
+        # O(log n) as long as no number carried between steps is truncated,
+        # otherwise the executable's steps are replayed.
+        fib_n_minus_1, fib_n = fast_doubling_fibonacci(bytes_to_int(args))
+        if fib_n_minus_1 >= FIBONACCI_EXACT_LIMIT:
+            return super(FibonacciSolver, self).solve(args)
+        return int_to_bytes(fib_n)
+
+
+Mismatch = collections.namedtuple(
+    'Mismatch', ['step', 'state', 'expected', 'actual'],
+)
+
+
+class DifferentialChecker(object):
+    """
+    Compares a native solver against the on-chain `step` implementation.
+
+    The solver's steps are computed locally and a random sample of them is
+    replayed against the executable through `executor` (a
+    `computation_market.executor.StatelessExecutor` for the factory), along
+    with the final step and the `solve` fast path.  Returns the list of
+    `Mismatch`es found, which is empty when the solver agrees with the chain.
+    """
+    def __init__(self, solver, executor, sample_size=16, seed=None):
+        self.solver = solver
+        self.executor = executor
+        self.sample_size = sample_size
+        self.random = random.Random(seed)
+
+    def check(self, args):
+        steps = list(self.solver.iter_steps(args))
+
+        sampled = [steps[0], steps[-1]]
+        if len(steps) > 2:
+            sampled.extend(self.random.sample(
+                steps[1:-1], min(self.sample_size, len(steps) - 2),
+            ))
+        sampled = sorted(set(sampled))
+
+        executable = self.executor.get_executable(args)
+        actual = self.executor.call_steps(executable, [
+            (current_step, state) for current_step, state, _, _ in sampled
+        ])
+
+        mismatches = [
+            Mismatch(current_step, state, (result, is_final), on_chain)
+            for (current_step, state, result, is_final), on_chain in zip(sampled, actual)
+            if (result, is_final) != tuple(on_chain)
+        ]
+
+        final_step, final_state, output, _ = steps[-1]
+        fast_output = self.solver.solve(args)
+        if fast_output != output:
+            mismatches.append(
+                Mismatch(final_step, final_state, (fast_output, True), (output, True))
+            )
+        return mismatches
@@ -0,0 +1,70 @@
+import binascii
+
+from sha3 import sha3_256
+
+
+def sha3(value):
+    return sha3_256(value).digest()
+
+
+def encode_hex(value):
+    return '0x' + binascii.hexlify(value).decode('ascii')
+
+
+def decode_hex(value):
+    if value[:2] in ('0x', '0X'):
+        value = value[2:]
+    if len(value) % 2:
+        value = '0' + value
+    return binascii.unhexlify(value)
+
+
+def function_selector(signature):
+    """
+    Return the 4-byte abi selector for a function signature such as
+    `step(uint256,bytes)`.
+    """
+    return sha3(signature.encode('ascii'))[:4]
+
+
+def event_topic(signature):
+    return encode_hex(sha3(signature.encode('ascii')))
+
+
+def encode_uint(value):
+    return binascii.unhexlify('{0:064x}'.format(value))
+
+
+def decode_uint(data, idx=0):
+    return int(binascii.hexlify(data[idx * 32:(idx + 1) * 32]), 16) if data else 0
+
+
+def decode_address(data, idx=0):
+    return encode_hex(data[idx * 32 + 12:(idx + 1) * 32])
+
+
+def decode_bytes32(data, idx=0):
+    return data[idx * 32:(idx + 1) * 32]
+
+
+def decode_bool(data, idx=0):
+    return bool(decode_uint(data, idx))
+
+
+def encode_bytes(value):
+    """
+    ABI encode a dynamic `bytes` value (length prefix followed by the right
+    padded data) without the head offset.
+    """
+    padding = b'\x00' * (-len(value) % 32)
+    return encode_uint(len(value)) + value + padding
+
+
+def decode_dynamic_bytes(data, idx=0):
+    """
+    Decode the dynamic `bytes` value whose head offset is stored in the
+    `idx`th word of `data`.
+    """
+    offset = decode_uint(data, idx)
+    length = int(binascii.hexlify(data[offset:offset + 32]), 16)
+    return data[offset + 32:offset + 32 + length]
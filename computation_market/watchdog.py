@@ -0,0 +1,295 @@
+"""
+Watches the answers submitted to one or more `Broker` contracts and
+challenges those which are wrong.
+
+Every initial answer found from the `AnswerSubmitted` events is recomputed
+by the native solver for the broker's factory on a process pool.  When the
+hash of the computed result differs from the answer, the result is
+submitted with `challengeAnswer` along with the required deposit.
+
+An answer can be soft resolved by anyone from block `creationBlock +
+softResolutionBlocks` of its request, so a challenge must be mined before
+then.  Answers are verified in order of that deadline, then of larger
+payment, then of smaller required deposit, and answers whose deadline is
+within `safety_blocks` of the chain head are dropped.
+"""
+import collections
+import heapq
+import itertools
+import time
+
+from computation_market.broker import (
+    Status,
+    EVENT_NAMES,
+    decode_log,
+)
+from computation_market.daemon import (
+    BrokerReader,
+    Metrics,
+    run_solver,
+    REQUEST_ARGS_HASH,
+    REQUEST_STATUS,
+    REQUEST_REQUIRED_DEPOSIT,
+)
+from computation_market.solvers import registry as default_registry
+from computation_market.utils import (
+    sha3,
+    encode_hex,
+    function_selector,
+    encode_uint,
+    encode_bytes,
+)
+
+
+CHALLENGE_ANSWER_SELECTOR = function_selector('challengeAnswer(uint256,bytes)')
+
+# Indexes of the values returned by `getRequest`.
+REQUEST_CREATION_BLOCK = 4
+REQUEST_PAYMENT = 6
+REQUEST_SOFT_RESOLUTION_BLOCKS = 7
+
+
+def encode_challenge_call(request_id, result):
+    """
+    Calldata for `challengeAnswer(id, result)`.
+    """
+    return (
+        CHALLENGE_ANSWER_SELECTOR +
+        encode_uint(request_id) +
+        encode_uint(64) +
+        encode_bytes(result)
+    )
+
+
+WatchedAnswer = collections.namedtuple(
+    'WatchedAnswer',
+    [
+        'broker', 'request_id', 'result_hash', 'answered_block',
+        'args_hash', 'created_block', 'deadline', 'payment',
+        'required_deposit',
+    ],
+)
+
+
+def priority(answer):
+    return (answer.deadline, -answer.payment, answer.required_deposit)
+
+
+class VerificationWatchdog(BrokerReader):
+    """
+    Verifies the answers on the brokers in `brokers` (see `BrokerReader`).
+
+    `client` must provide `call`, `send_transaction`,
+    `get_transaction_receipt`, `get_block_number` and `get_logs` (see
+    `computation_market.rpc.BatchRPCClient`).
+
+    If `bonded` is set challenges are sent without value so that their
+    deposits are reserved from the sender's bond on the broker.
+    """
+    def __init__(self, client, brokers, registry=default_registry,
+                 processes=None, pool=None, max_in_flight=None, _from=None,
+                 gas=None, bonded=False, start_block=0, batch_size=1000,
+                 safety_blocks=1):
+        super(VerificationWatchdog, self).__init__(
+            client, brokers, registry=registry, processes=processes, pool=pool,
+            _from=_from,
+        )
+        self.max_in_flight = max_in_flight or self.processes
+        self.gas = gas
+        self.bonded = bonded
+        self.batch_size = batch_size
+        self.safety_blocks = safety_blocks
+
+        self.cursors = dict((address, start_block - 1) for address in self.brokers)
+        # Heap of (priority, sequence, WatchedAnswer).
+        self.queue = []
+        self._sequence = itertools.count()
+        # (broker, request_id) -> (WatchedAnswer, AsyncResult)
+        self.computing = {}
+        # txn_hash -> (WatchedAnswer, time sent)
+        self.submitted = {}
+
+        self.metrics = Metrics()
+
+    def _is_expired(self, answer, head):
+        return head + self.safety_blocks >= answer.deadline
+
+    #
+    #  Stages
+    #
+    def poll(self):
+        """
+        Queue the initial answers submitted since the last poll.  Returns the
+        number of answers queued.
+        """
+        head = self.client.get_block_number()
+        num_queued = 0
+
+        for broker in sorted(self.brokers):
+            from_block = self.cursors[broker] + 1
+            if from_block > head:
+                continue
+            to_block = min(from_block + self.batch_size - 1, head)
+
+            logs = self.client.get_logs(
+                address=broker,
+                topics=[[EVENT_NAMES['AnswerSubmitted']]],
+                from_block=from_block,
+                to_block=to_block,
+            )
+
+            for log in logs:
+                name, data = decode_log(log)
+                if name != 'AnswerSubmitted' or data['isChallenge']:
+                    continue
+
+                request = self.get_request(broker, data['id'])
+                answer = WatchedAnswer(
+                    broker=broker,
+                    request_id=data['id'],
+                    result_hash=data['resultHash'],
+                    answered_block=int(log['blockNumber'], 16),
+                    args_hash=request[REQUEST_ARGS_HASH],
+                    created_block=request[REQUEST_CREATION_BLOCK],
+                    deadline=request[REQUEST_CREATION_BLOCK] + request[REQUEST_SOFT_RESOLUTION_BLOCKS],
+                    payment=request[REQUEST_PAYMENT],
+                    required_deposit=request[REQUEST_REQUIRED_DEPOSIT],
+                )
+                heapq.heappush(self.queue, (priority(answer), next(self._sequence), answer))
+                num_queued += 1
+
+            self.cursors[broker] = to_block
+
+        self.metrics.increment('queued', num_queued)
+        return num_queued
+
+    def dispatch(self):
+        """
+        Start verifying the most urgent answers while there is capacity.
+        Returns the number of verifications started.
+        """
+        head = self.client.get_block_number()
+        num_started = 0
+
+        while self.queue and len(self.computing) < self.max_in_flight:
+            _, _, answer = heapq.heappop(self.queue)
+
+            if self._is_expired(answer, head):
+                self.metrics.increment('expired')
+                continue
+
+            try:
+                args = self.get_request_args(
+                    answer.broker, answer.request_id, answer.args_hash, answer.created_block,
+                )
+            except (KeyError, ValueError):
+                self.metrics.increment('args_errors')
+                continue
+
+            async_result = self.pool.apply_async(
+                run_solver, (self.registry.get(self.brokers[answer.broker]), args),
+            )
+            self.computing[(answer.broker, answer.request_id)] = (answer, async_result)
+            num_started += 1
+
+        return num_started
+
+    def collect(self):
+        """
+        Check every finished verification, challenging the answers which are
+        wrong.  Returns the number of challenges sent.
+        """
+        num_sent = 0
+
+        for key, (answer, async_result) in list(self.computing.items()):
+            if not async_result.ready():
+                continue
+            del self.computing[key]
+
+            try:
+                result, duration = async_result.get()
+            except Exception:
+                self.metrics.increment('compute_errors')
+                continue
+
+            self.metrics.observe('compute_latency', duration)
+
+            if sha3(result) == answer.result_hash:
+                self.metrics.increment('verified')
+                continue
+
+            self.metrics.increment('mismatches')
+            if self.challenge(answer, result):
+                num_sent += 1
+
+        return num_sent
+
+    def challenge(self, answer, result):
+        if self._is_expired(answer, self.client.get_block_number()):
+            self.metrics.increment('expired')
+            return False
+
+        request = self.get_request(answer.broker, answer.request_id)
+        if request[REQUEST_STATUS] != Status.WaitingForResolution:
+            # Already challenged or resolved.
+            self.metrics.increment('skipped')
+            return False
+
+        txn_hash = self.client.send_transaction(
+            _from=self._from,
+            to=answer.broker,
+            gas=self.gas,
+            value=0 if self.bonded else request[REQUEST_REQUIRED_DEPOSIT],
+            data=encode_hex(encode_challenge_call(answer.request_id, result)),
+        )
+        self.submitted[txn_hash] = (answer, time.time())
+        return True
+
+    def confirm(self):
+        """
+        Check the receipts of submitted challenges.  Returns the number of
+        challenges which were accepted.
+        """
+        num_challenged = 0
+
+        for txn_hash, (answer, sent_at) in list(self.submitted.items()):
+            receipt = self.client.get_transaction_receipt(txn_hash)
+            if receipt is None:
+                continue
+            del self.submitted[txn_hash]
+
+            self.metrics.observe('submit_latency', time.time() - sent_at)
+
+            # A failed transaction has no logs.
+            if not any(decode_log(log)[0] == 'AnswerSubmitted' for log in receipt['logs']):
+                self.metrics.increment('rejected')
+                continue
+
+            block_number = int(receipt['blockNumber'], 16)
+            self.metrics.increment('challenged')
+            self.metrics.observe('challenge_latency_blocks', block_number - answer.answered_block)
+            self.metrics.observe('blocks_to_spare', answer.deadline - block_number)
+            num_challenged += 1
+
+        return num_challenged
+
+    #
+    #  Main loop
+    #
+    def run_once(self):
+        self.confirm()
+        self.collect()
+        self.poll()
+        self.dispatch()
+
+        self.metrics.set('queue_depth', len(self.queue))
+        self.metrics.set('in_flight', len(self.computing))
+        self.metrics.set('pending_submissions', len(self.submitted))
+
+    def run_forever(self, poll_interval=1.0):
+        try:
+            while True:
+                self.run_once()
+                time.sleep(poll_interval)
+        finally:
+            self.close()
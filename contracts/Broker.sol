@@ -3,13 +3,28 @@ import {ExecutableInterface} from "contracts/Execution.sol";
 
 
 contract BrokerInterface {
+    /*
+     *  The members of `Answer` and `Request` are ordered so that the smaller
+     *  values share storage slots.  Block numbers and counts are stored as
+     *  `uint64` and amounts of wei as `uint128`, though the getters all
+     *  return them as `uint`.
+     */
     struct Answer {
+        // Slot 1
         address submitter;
-        bytes result;
-        bytes32 resultHash;
-        uint creationBlock;
-        uint depositAmount;
+        uint64 creationBlock;
         bool isVerified;
+        // Set for answers submitted as only a `resultHash` until their
+        // `result` is revealed.
+        bool isCommitted;
+        // Set for answers whose deposit is reserved from the submitter's
+        // bond.
+        bool isBonded;
+        // Slot 2
+        bytes32 resultHash;
+        // Slot 3
+        uint128 depositAmount;
+        bytes result;
     }
 
     /*
@@ -42,20 +57,27 @@ contract BrokerInterface {
     }
 
     struct Request {
-        uint id;
+        // Slot 1
+        uint64 id;
         address requester;
-        bytes args;
+        Status status;
+        // Slot 2
+        address executable;
+        uint64 creationBlock;
+        // When set, `args` is not stored and is only available from the
+        // `ArgsLogged` event.
+        bool argsLogged;
+        // Slot 3
+        uint128 payment;
+        uint128 gasReimbursements;
+        // Slot 4
+        uint128 requiredDeposit;
+        uint64 softResolutionBlocks;
+        uint64 baseGasPrice;
         bytes32 argsHash;
-        bytes result;
         bytes32 resultHash;
-        address executable;
-        uint creationBlock;
-        uint softResolutionBlocks;
-        uint baseGasPrice;
-        uint payment;
-        uint gasReimbursements;
-        uint requiredDeposit;
-        Status status;
+        bytes args;
+        bytes result;
         Answer initialAnswer;
         Answer challengeAnswer;
     }
@@ -77,6 +99,7 @@ contract BrokerInterface {
                                                    uint gasReimbursements,
                                                    uint requiredDeposit);
     function getRequestArgs(uint id) constant returns (bytes result);
+    function isArgsLogged(uint id) constant returns (bool);
     function getRequestResult(uint id) constant returns (bytes result);
     function getInitialAnswer(uint id) constant returns (bytes32 resultHash,
                                                          address submitter,
@@ -91,6 +114,28 @@ contract BrokerInterface {
                                                            bool isVerified,
                                                            uint depositAmount);
     function getChallengeAnswerResult(uint id) constant returns (bytes);
+    function getRevealDeadline(uint id) constant returns (uint);
+
+    /*
+     *  Paged getters.  Each entry is serialized as a fixed number of words
+     *  in the same order as the corresponding single id getter.
+     */
+    function getRequests(uint startId, uint count) constant returns (uint[] page);
+    function getInitialAnswers(uint startId, uint count) constant returns (uint[] page);
+    function getChallengeAnswers(uint startId, uint count) constant returns (uint[] page);
+
+    /*
+     *  Status index.  Requests in each non-terminal status can be enumerated
+     *  in the order they entered that status.
+     */
+    function getStatusCount(Status status) constant returns (uint);
+    function getStatusPage(Status status, uint afterId, uint count) constant returns (uint[] ids);
+
+    /*
+     *  Results and executables keyed by `argsHash`.
+     */
+    function getVerifiedResultHash(bytes32 argsHash) constant returns (bytes32);
+    function getSharedRequests(bytes32 argsHash) constant returns (uint[]);
 
     function getRequiredDeposit(bytes args) constant returns (uint);
 
@@ -98,12 +143,14 @@ contract BrokerInterface {
      *  Events
      */
     event Created(uint id, bytes32 argsHash);
+    event ArgsLogged(uint id, bytes args);
     event Cancelled(uint id);
     event AnswerSubmitted(uint id, bytes32 resultHash, bool isChallenge);
     event Execution(uint id, uint nTimes, bool isFinished);
     event GasReimbursement(uint id, address to, uint value);
     event Payment(uint id, address to, uint value);
     event DepositReturned(uint id, address to, uint value);
+    event Withdrawal(address to, uint value);
 
     /*
      *  Public API
@@ -111,29 +158,53 @@ contract BrokerInterface {
     // Request a computation to be done.
     function requestExecution(bytes args, uint softResolutionBlocks) public returns (uint);
 
+    // Request a computation whose args are logged rather than stored.
+    function requestExecutionWithLoggedArgs(bytes args, uint softResolutionBlocks) public returns (uint);
+
     // Cancel a request for computation.
     function cancelRequest(uint id) public;
 
     // Submit an answer to a requested computation.
     function answerRequest(uint id, bytes result) public;
 
+    // Submit only the hash of an answer, revealing the result later.
+    function answerRequestWithHash(uint id, bytes32 resultHash) public;
+
     // Resolve an unchallenged answer.
     function softResolveAnswer(uint id) public;
 
     // Challenge the answer to a question.
     function challengeAnswer(uint id, bytes result) public;
+    function challengeAnswerWithHash(uint id, bytes32 resultHash) public;
 
     // Dispute resolution
     function initializeDispute(uint id) public returns (address);
+    function initializeDispute(uint id, bytes args) public returns (address);
 
     // Advance the on chain execution of the contract
     function executeExecutable(uint id, uint nTimes) public returns (uint i, bool isFinished);
 
+    // Advance the on chain execution of several contracts
+    function executeExecutables(uint[] ids, uint[] nTimes) public returns (uint[] iTimes);
+
     // Finalize the result
     function finalize(uint id) public returns (bytes32);
 
+    // Reveal the result of a committed answer and finalize.
+    function finalize(uint id, bytes result) public returns (bytes32);
+
     // Answer submitters reclaim their deposits.
     function reclaimDeposit(uint id) public;
+    function reclaimDeposits(uint[] ids) public;
+
+    // Lock ether to back answers submitted without a deposit.
+    function bond() public returns (uint);
+    function unbond(uint value) public;
+    function getBond(address account) constant returns (uint total, uint reserved);
+
+    // Withdraw everything credited to the sender.
+    function withdraw() public returns (uint);
+    function getBalance(address account) constant returns (uint);
 }
 
 
@@ -144,14 +215,14 @@ contract Accounting {
 
     uint constant DEFAULT_SEND_GAS = 100000;
 
-    function sendRobust(address toAddress, uint value) public returns (bool) {
+    function sendRobust(address toAddress, uint value) internal returns (bool) {
         if (msg.gas < DEFAULT_SEND_GAS) {
             return sendRobust(toAddress, value, msg.gas);
         }
         return sendRobust(toAddress, value, DEFAULT_SEND_GAS);
     }
 
-    function sendRobust(address toAddress, uint value, uint maxGas) public returns (bool) {
+    function sendRobust(address toAddress, uint value, uint maxGas) internal returns (bool) {
         if (value > 0 && !toAddress.send(value)) {
             // Potentially sending money to a contract that
             // has a fallback function.  So instead, try
@@ -196,8 +267,13 @@ contract Broker is BrokerInterface, Accounting {
     /*
      *  Internal getters
      */
-    function _getRequest(uint id) internal returns (Request) {
-        var request = requests[id];
+    function _getRequest(uint id) internal returns (Request storage request) {
+        /*
+         *  Returns a storage pointer to the request.  Only the `id` field is
+         *  read here so that none of the `bytes` members of the request are
+         *  copied into memory just to validate the id.
+         */
+        request = requests[id];
 
         // invalid id
         if (request.id == 0) throw;
@@ -216,7 +292,63 @@ contract Broker is BrokerInterface, Accounting {
         if (status != s1 && status != s2) throw;
     }
 
-    function serializeRequest(Request request) internal returns (bytes32 argsHash,
+    /*
+     *  Status index
+     *
+     *  Every request in a non-terminal status is a member of a circular
+     *  doubly linked list for that status.  Node `0` is the sentinel whose
+     *  `next` is the oldest member and `prev` the newest, which makes both
+     *  insertion and removal O(1).  Finalized and cancelled requests are not
+     *  tracked since there is no further work to discover for them.
+     */
+    struct StatusNode {
+        uint prev;
+        uint next;
+    }
+
+    struct StatusList {
+        uint length;
+        mapping (uint => StatusNode) nodes;
+    }
+
+    mapping (uint => StatusList) statusLists;
+
+    function isIndexedStatus(Status status) internal returns (bool) {
+        return status != Status.Finalized && status != Status.Cancelled;
+    }
+
+    function indexAdd(Status status, uint id) internal {
+        if (!isIndexedStatus(status)) return;
+
+        var list = statusLists[uint(status)];
+        uint tail = list.nodes[0].prev;
+
+        list.nodes[id].prev = tail;
+        list.nodes[tail].next = id;
+        list.nodes[0].prev = id;
+        list.length += 1;
+    }
+
+    function indexRemove(Status status, uint id) internal {
+        if (!isIndexedStatus(status)) return;
+
+        var list = statusLists[uint(status)];
+        uint prev = list.nodes[id].prev;
+        uint next = list.nodes[id].next;
+
+        list.nodes[prev].next = next;
+        list.nodes[next].prev = prev;
+        delete list.nodes[id];
+        list.length -= 1;
+    }
+
+    function setStatus(Request storage request, Status status) internal {
+        indexRemove(request.status, request.id);
+        request.status = status;
+        indexAdd(status, request.id);
+    }
+
+    function serializeRequest(Request storage request) internal returns (bytes32 argsHash,
                                                                  bytes32 resultHash,
                                                                  address requester,
                                                                  address executable,
@@ -242,7 +374,7 @@ contract Broker is BrokerInterface, Accounting {
                 requiredDeposit);
     }
 
-    function serializeAnswer(Answer answer) internal returns (bytes32 resultHash,
+    function serializeAnswer(Answer storage answer) internal returns (bytes32 resultHash,
                                                               address submitter,
                                                               uint creationBlock,
                                                               bool isVerified,
@@ -283,8 +415,10 @@ contract Broker is BrokerInterface, Accounting {
     function remainingGasFund(uint id) constant returns (uint) {
         var request = _getRequest(id);
         
-        // No gas available unless answer was challenged.
-        if (request.executable == 0x0) return 0;
+        // No gas available unless answer was challenged.  A dispute
+        // settled against a verified result has no executable but its
+        // `initializeDispute` is still paid for.
+        if (request.challengeAnswer.submitter == 0x0) return 0;
 
         // Already spent all gas
         if (request.gasReimbursements > request.requiredDeposit) return 0;
@@ -307,9 +441,38 @@ contract Broker is BrokerInterface, Accounting {
         // Log it.
         GasReimbursement(request.id, msg.sender, gasReimbursement);
 
-        if (sendRobust(msg.sender, gasReimbursement)) {
-            request.gasReimbursements += gasReimbursement;
-        }
+        request.gasReimbursements += uint128(gasReimbursement);
+        credit(msg.sender, gasReimbursement);
+    }
+
+    /*
+     *  Balances
+     *
+     *  Payments, returned deposits and gas reimbursements are credited to
+     *  an address rather than sent straight away, and paid out together by
+     *  `withdraw`.
+     */
+    mapping (address => uint) balances;
+
+    function credit(address account, uint value) internal {
+        balances[account] += value;
+    }
+
+    function getBalance(address account) constant returns (uint) {
+        return balances[account];
+    }
+
+    function withdraw() public returns (uint value) {
+        value = balances[msg.sender];
+        if (value == 0) return;
+
+        // Cleared before sending so that the balance cannot be withdrawn
+        // twice.  If the send fails the throw restores it.
+        balances[msg.sender] = 0;
+        if (!sendRobust(msg.sender, value)) throw;
+
+        Withdrawal(msg.sender, value);
+        return value;
     }
 
     /*
@@ -333,12 +496,29 @@ contract Broker is BrokerInterface, Accounting {
     function getRequestArgs(uint id) constant returns (bytes) {
         var request = _getRequest(id);
 
+        // Empty for requests with logged args.
         return request.args;
     }
 
+    function isArgsLogged(uint id) constant returns (bool) {
+        return _getRequest(id).argsLogged;
+    }
+
     function getRequestResult(uint id) constant returns (bytes) {
         var request = _getRequest(id);
 
+        // The result is only stored on the request itself when it did not
+        // match either of the submitted answers.  Otherwise it is read from
+        // the matching answer.
+        if (request.resultHash == 0x0) {
+            return request.result;
+        }
+        else if (request.initialAnswer.resultHash == request.resultHash) {
+            return request.initialAnswer.result;
+        }
+        else if (request.challengeAnswer.resultHash == request.resultHash) {
+            return request.challengeAnswer.result;
+        }
         return request.result;
     }
 
@@ -370,6 +550,102 @@ contract Broker is BrokerInterface, Accounting {
         return _getRequest(id).challengeAnswer.result;
     }
 
+    /*
+     *  Paged getters
+     */
+    uint constant REQUEST_PAGE_WIDTH = 10;
+    uint constant ANSWER_PAGE_WIDTH = 5;
+
+    function getPageSize(uint startId, uint count) constant returns (uint) {
+        // Pages never extend past the most recently created request.
+        if (startId == 0 || startId > _id) return 0;
+        return min(count, _id - startId + 1);
+    }
+
+    function getRequests(uint startId, uint count) constant returns (uint[] page) {
+        count = getPageSize(startId, count);
+        page = new uint[](count * REQUEST_PAGE_WIDTH);
+
+        for (uint i = 0; i < count; i++) {
+            var request = requests[startId + i];
+            uint offset = i * REQUEST_PAGE_WIDTH;
+
+            page[offset] = uint(request.argsHash);
+            page[offset + 1] = uint(request.resultHash);
+            page[offset + 2] = uint(request.requester);
+            page[offset + 3] = uint(request.executable);
+            page[offset + 4] = request.creationBlock;
+            page[offset + 5] = uint(request.status);
+            page[offset + 6] = request.payment;
+            page[offset + 7] = request.softResolutionBlocks;
+            page[offset + 8] = request.gasReimbursements;
+            page[offset + 9] = request.requiredDeposit;
+        }
+        return page;
+    }
+
+    function serializeAnswerInto(uint[] memory page, uint offset, Answer storage answer) internal {
+        page[offset] = uint(answer.resultHash);
+        page[offset + 1] = uint(answer.submitter);
+        page[offset + 2] = answer.creationBlock;
+        page[offset + 3] = answer.isVerified ? 1 : 0;
+        page[offset + 4] = answer.depositAmount;
+    }
+
+    function getInitialAnswers(uint startId, uint count) constant returns (uint[] page) {
+        count = getPageSize(startId, count);
+        page = new uint[](count * ANSWER_PAGE_WIDTH);
+
+        for (uint i = 0; i < count; i++) {
+            serializeAnswerInto(page, i * ANSWER_PAGE_WIDTH, requests[startId + i].initialAnswer);
+        }
+        return page;
+    }
+
+    function getChallengeAnswers(uint startId, uint count) constant returns (uint[] page) {
+        count = getPageSize(startId, count);
+        page = new uint[](count * ANSWER_PAGE_WIDTH);
+
+        for (uint i = 0; i < count; i++) {
+            serializeAnswerInto(page, i * ANSWER_PAGE_WIDTH, requests[startId + i].challengeAnswer);
+        }
+        return page;
+    }
+
+    function getStatusCount(Status status) constant returns (uint) {
+        return statusLists[uint(status)].length;
+    }
+
+    function getStatusPage(Status status, uint afterId, uint count) constant returns (uint[] ids) {
+        /*
+         *  Returns up to `count` ids of requests in `status`, starting with
+         *  the one after `afterId`.  An `afterId` of `0` starts from the
+         *  request which has been in this status the longest.
+         */
+        var list = statusLists[uint(status)];
+
+        // `afterId` is no longer in this status.
+        if (afterId != 0 && requests[afterId].status != status) throw;
+
+        // Walk the list once to find the page size.
+        uint size;
+        uint id = list.nodes[afterId].next;
+        while (id != 0 && size < count) {
+            size += 1;
+            id = list.nodes[id].next;
+        }
+
+        ids = new uint[](size);
+
+        id = list.nodes[afterId].next;
+        for (uint i = 0; i < size; i++) {
+            ids[i] = id;
+            id = list.nodes[id].next;
+        }
+
+        return ids;
+    }
+
     function getDefaultSoftResolutionBlocks() constant returns (uint) {
         return DEFAULT_SOFT_RESOLUTION_BLOCKS;
     }
@@ -382,90 +658,247 @@ contract Broker is BrokerInterface, Accounting {
     }
 
     function requestExecution(bytes args, uint softResolutionBlocks) public returns (uint) {
+        var request = createRequest(args, softResolutionBlocks);
+        request.args = args;
+
+        return request.id;
+    }
+
+    function requestExecutionWithLoggedArgs(bytes args) public returns (uint) {
+        return requestExecutionWithLoggedArgs(args, getDefaultSoftResolutionBlocks());
+    }
+
+    function requestExecutionWithLoggedArgs(bytes args, uint softResolutionBlocks) public returns (uint) {
+        /*
+         *  Only `argsHash` is stored.  The args are logged instead and must
+         *  be supplied again to `initializeDispute` if the request is
+         *  disputed, which is far cheaper than storage for large args when
+         *  most requests are never disputed.
+         */
+        var request = createRequest(args, softResolutionBlocks);
+        request.argsLogged = true;
+
+        ArgsLogged(request.id, args);
+
+        return request.id;
+    }
+
+    function createRequest(bytes memory args, uint softResolutionBlocks) internal returns (Request storage request) {
+        var requiredDeposit = getRequiredDeposit(args);
+
+        // Values which do not fit their packed storage type.  Block numbers,
+        // the gas price and the sent value cannot realistically overflow.
+        if (softResolutionBlocks >= 2 ** 64) throw;
+        if (requiredDeposit >= 2 ** 128) throw;
+
         _id += 1;
 
-        var request = requests[_id];
-        request.id = _id;
+        request = requests[_id];
+        request.id = uint64(_id);
         request.requester = msg.sender;
-        request.args = args;
         request.argsHash = sha3(args);
-        request.creationBlock = block.number;
-        request.softResolutionBlocks = softResolutionBlocks;
-        request.baseGasPrice = tx.gasprice;
-        request.payment = msg.value;
-        request.requiredDeposit = getRequiredDeposit(args);
+        request.creationBlock = uint64(block.number);
+        request.softResolutionBlocks = uint64(softResolutionBlocks);
+        request.baseGasPrice = uint64(tx.gasprice);
+        request.payment = uint128(msg.value);
+        request.requiredDeposit = uint128(requiredDeposit);
+
+        indexAdd(Status.Pending, _id);
 
         Created(_id, request.argsHash);
 
-        return _id;
+        return request;
     }
 
     function cancelRequest(uint id) public {
-        var request = requests[_getRequest(id).id];
+        var request = _getRequest(id);
 
         if (msg.sender != request.requester) throw;
 
         // Check status
         requireStatus(request.status, Status.Pending);
 
-        if (sendRobust(request.requester, request.payment)) {
-            // Return payment
-            request.payment = 0;
-            // Update the state
-            request.status = Status.Cancelled;
-        }
+        // Return payment
+        credit(request.requester, request.payment);
+        request.payment = 0;
+
+        // Update the state
+        setStatus(request, Status.Cancelled);
 
         Cancelled(id);
     }
 
     function answerRequest(uint id, bytes result) public {
-        var request = requests[_getRequest(id).id];
+        var request = _getRequest(id);
+
+        submitAnswer(request, sha3(result));
+        request.initialAnswer.result = result;
+    }
+
+    function answerRequestWithHash(uint id, bytes32 resultHash) public {
+        /*
+         *  Only the hash of the result is stored.  The result must be
+         *  revealed with `finalize(id, result)` if the answer is soft
+         *  resolved.  If it is disputed the result is taken from the
+         *  executable instead.
+         */
+        var request = _getRequest(id);
+
+        // No result hashes to zero so it could never be revealed.
+        if (resultHash == 0x0) throw;
+
+        submitAnswer(request, resultHash);
+        request.initialAnswer.isCommitted = true;
+    }
+
+    /*
+     *  Reveal deadlines
+     *
+     *  A committed answer can be revealed once the request is soft resolved,
+     *  or once its dispute is settled against a verified result.  From then
+     *  the submitter has `softResolutionBlocks` to reveal it, after which
+     *  `finalize(id)` returns the payment to the requester and credits them
+     *  the deposit of the unrevealed answer.
+     *
+     *  The requester chooses `softResolutionBlocks` and may soft resolve at
+     *  any time, so the window is never shorter than
+     *  `DEFAULT_SOFT_RESOLUTION_BLOCKS`.  Otherwise they could soft resolve
+     *  and finalize in the same block and take the deposit of an answer
+     *  which never had a chance to be revealed.
+     */
+    mapping (uint => uint) revealDeadlines;
+
+    function getRevealDeadline(uint id) constant returns (uint) {
+        _getRequest(id);
+        return revealDeadlines[id];
+    }
+
+    function setRevealDeadline(Request storage request) internal {
+        uint revealBlocks = request.softResolutionBlocks;
+        if (revealBlocks < DEFAULT_SOFT_RESOLUTION_BLOCKS) revealBlocks = DEFAULT_SOFT_RESOLUTION_BLOCKS;
+
+        if (request.initialAnswer.isCommitted || request.challengeAnswer.isCommitted) {
+            revealDeadlines[request.id] = block.number + revealBlocks;
+        }
+    }
+
+    function forfeitDeposit(Request storage request, Answer storage answer) internal {
+        // Still time to reveal.
+        if (block.number < revealDeadlines[request.id]) throw;
 
+        if (answer.isBonded) {
+            reservedBonds[answer.submitter] -= answer.depositAmount;
+            bonds[answer.submitter] -= answer.depositAmount;
+        }
+        credit(request.requester, answer.depositAmount);
+        answer.depositAmount = 0;
+    }
+
+    /*
+     *  Bonds
+     *
+     *  A solver may lock ether in the broker once with `bond` and submit
+     *  answers without sending a deposit.  The required deposit of each open
+     *  answer is reserved from the bond and released when the request is
+     *  finalized, less the same gas charges `reclaimDeposit` would take.
+     */
+    mapping (address => uint) bonds;
+    mapping (address => uint) reservedBonds;
+
+    function bond() public returns (uint) {
+        bonds[msg.sender] += msg.value;
+        return bonds[msg.sender];
+    }
+
+    function unbond(uint value) public {
+        // Only the part of the bond which is not reserved can be taken out.
+        if (value > bonds[msg.sender] - reservedBonds[msg.sender]) throw;
+
+        bonds[msg.sender] -= value;
+        credit(msg.sender, value);
+    }
+
+    function getBond(address account) constant returns (uint total, uint reserved) {
+        return (bonds[account], reservedBonds[account]);
+    }
+
+    function takeDeposit(Request storage request, Answer storage answer) internal {
+        /*
+         *  An answer sent with value must include the full deposit.  One
+         *  sent without any value has the deposit reserved from the sender's
+         *  bond.
+         */
+        if (msg.value >= request.requiredDeposit) {
+            answer.depositAmount = uint128(msg.value);
+            return;
+        }
+
+        // Insufficient deposit
+        if (msg.value > 0) throw;
+        if (bonds[msg.sender] - reservedBonds[msg.sender] < request.requiredDeposit) throw;
+
+        reservedBonds[msg.sender] += request.requiredDeposit;
+        answer.depositAmount = request.requiredDeposit;
+        answer.isBonded = true;
+    }
+
+    function submitAnswer(Request storage request, bytes32 resultHash) internal {
         // Check status
         requireStatus(request.status, Status.Pending);
 
         // Already answered
         if (request.initialAnswer.submitter != 0x0) throw;
 
-        // Insufficient deposit
-        if (msg.value < request.requiredDeposit) throw;
-
         request.initialAnswer.submitter = msg.sender;
-        request.initialAnswer.result = result;
-        request.initialAnswer.resultHash = sha3(result);
-        request.initialAnswer.creationBlock = block.number;
-        request.initialAnswer.depositAmount = msg.value;
+        request.initialAnswer.resultHash = resultHash;
+        request.initialAnswer.creationBlock = uint64(block.number);
+        takeDeposit(request, request.initialAnswer);
 
         // Update the state
-        request.status = Status.WaitingForResolution;
+        setStatus(request, Status.WaitingForResolution);
 
         // Log that a new answer was submitted.
-        AnswerSubmitted(id, request.initialAnswer.resultHash, false);
+        AnswerSubmitted(request.id, resultHash, false);
     }
 
     function softResolveAnswer(uint id) public {
-        var request = requests[_getRequest(id).id];
+        var request = _getRequest(id);
 
         // Check status
         requireStatus(request.status, Status.WaitingForResolution);
 
-        // too early to resolve (unless your the requester)
-        if (msg.sender != request.requester && block.number < request.creationBlock + request.softResolutionBlocks) throw;
+        // too early to resolve (unless your the requester, or the answer
+        // matches a verified result for the same args)
+        var verifiedResultHash = verifiedResultHashes[request.argsHash];
+        if (msg.sender != request.requester &&
+            block.number < uint(request.creationBlock) + request.softResolutionBlocks &&
+            (verifiedResultHash == 0x0 || request.initialAnswer.resultHash != verifiedResultHash)) throw;
 
         // Update the state
-        request.status = Status.SoftResolution;
+        setStatus(request, Status.SoftResolution);
+        setRevealDeadline(request);
     }
 
     function challengeAnswer(uint id, bytes result) public {
-        var request = requests[_getRequest(id).id];
+        var request = _getRequest(id);
 
-        // Check status
-        requireStatus(request.status, Status.WaitingForResolution);
+        submitChallenge(request, sha3(result));
+        request.challengeAnswer.result = result;
+    }
 
-        // Insufficient deposit
-        if (msg.value < request.requiredDeposit) throw;
+    function challengeAnswerWithHash(uint id, bytes32 resultHash) public {
+        var request = _getRequest(id);
 
-        var resultHash = sha3(result);
+        // No result hashes to zero so it could never be revealed.
+        if (resultHash == 0x0) throw;
+
+        submitChallenge(request, resultHash);
+        request.challengeAnswer.isCommitted = true;
+    }
+
+    function submitChallenge(Request storage request, bytes32 resultHash) internal {
+        // Check status
+        requireStatus(request.status, Status.WaitingForResolution);
 
         // No initial answer
         if (request.initialAnswer.submitter == 0x0) throw;
@@ -477,25 +910,166 @@ contract Broker is BrokerInterface, Accounting {
         // factory contract)
 
         request.challengeAnswer.submitter = msg.sender;
-        request.challengeAnswer.result = result;
         request.challengeAnswer.resultHash = resultHash;
-        request.challengeAnswer.creationBlock = block.number;
-        request.challengeAnswer.depositAmount = msg.value;
+        request.challengeAnswer.creationBlock = uint64(block.number);
+        takeDeposit(request, request.challengeAnswer);
 
         // Update the state
-        request.status = Status.NeedsResolution;
+        setStatus(request, Status.NeedsResolution);
 
         // Log that a new answer was submitted.
-        AnswerSubmitted(id, resultHash, true);
+        AnswerSubmitted(request.id, resultHash, true);
     }
 
-    // TODO: derive this value
-    uint constant INITIALIZE_DISPUTE_GAS = 60000;
+    /*
+     *  Unmetered gas
+     *
+     *  `initializeDispute` and `executeExecutable` measure their own gas use
+     *  with `msg.gas`, which cannot see the intrinsic transaction gas, the
+     *  gas charged for calldata, the work done before the first `msg.gas`
+     *  read, or the work done by `reimburseGas` after its last one.  This is
+     *  reimbursed as:
+     *
+     *      TX_GAS + calldata gas + <FUNCTION>_GAS
+     *
+     *  Calldata gas is computed from the call arguments.  The fixed per
+     *  function values are meant to be measured with
+     *  `benchmarks/test_dispute_overheads.py`.
+     */
+    uint constant TX_GAS = 21000;
+    uint constant TX_DATA_ZERO_GAS = 4;
+    uint constant TX_DATA_NON_ZERO_GAS = 68;
+    // The 4-byte function selector.
+    uint constant SELECTOR_DATA_GAS = 4 * TX_DATA_NON_ZERO_GAS;
+
+    // TODO: measure these.  They are placeholders which make the overhead
+    // of a small id equal to the old fixed paddings of 60000 and 30000 gas.
+    // `initializeDispute(id)` also does not yet account for the size of the
+    // stored args.
+    uint constant INITIALIZE_DISPUTE_GAS = 38536;
+    // Copying a word of `bytes` calldata into memory, including the memory
+    // expansion.
+    uint constant CALLDATA_COPY_WORD_GAS = 6;
+    uint constant EXECUTE_EXECUTABLE_GAS = 8408;
+    // Bookkeeping done after the last `msg.gas` read for each additional
+    // request sharing the executable.  TODO: measure this, it is an
+    // unmeasured estimate.
+    uint constant SHARED_REIMBURSEMENT_GAS = 8000;
+    // TODO: measure the three `executeExecutables` values below.  They are
+    // unmeasured estimates, checked only by
+    // `tests/gas/test_executing_many_executables_gas_is_covered.py`.
+    //
+    // Dispatch and argument decoding of `executeExecutables` plus the
+    // single reimbursement sent at the end of the batch.
+    uint constant EXECUTE_EXECUTABLES_GAS = 12000;
+    // Bookkeeping done after the last `msg.gas` read for each request in
+    // the batch.
+    uint constant EXECUTE_EXECUTABLES_ENTRY_GAS = 6000;
+    // Gas held back for the bookkeeping of each request in the batch which
+    // has not been executed yet.
+    uint constant EXECUTE_EXECUTABLES_RESERVE_GAS = 50000;
+
+    function wordDataGas(uint value) constant returns (uint) {
+        /*
+         *  The calldata gas for an abi encoded uint argument.  Zero bytes
+         *  inside the value are charged as non-zero, which overestimates by
+         *  at most a few hundred gas.
+         */
+        uint nonZeroBytes;
+        while (value > 0) {
+            nonZeroBytes += 1;
+            value /= 256;
+        }
+        return nonZeroBytes * TX_DATA_NON_ZERO_GAS + (32 - nonZeroBytes) * TX_DATA_ZERO_GAS;
+    }
+
+    function getInitializeDisputeOverhead(uint id) constant returns (uint) {
+        return TX_GAS + SELECTOR_DATA_GAS + wordDataGas(id) + INITIALIZE_DISPUTE_GAS;
+    }
+
+    function getInitializeDisputeOverhead(uint id, uint argsLength) constant returns (uint) {
+        /*
+         *  Overhead of `initializeDispute(id, args)`.  The args are encoded
+         *  as an offset word, a length word and the padded data.  Every data
+         *  byte is charged as non-zero.
+         */
+        uint words = (argsLength + 31) / 32;
+        return (
+            getInitializeDisputeOverhead(id) +
+            wordDataGas(64) + wordDataGas(argsLength) +
+            argsLength * TX_DATA_NON_ZERO_GAS + (32 * words - argsLength) * TX_DATA_ZERO_GAS +
+            (words + 1) * CALLDATA_COPY_WORD_GAS
+        );
+    }
+
+    function getExecuteExecutableOverhead(uint id, uint nTimes) constant returns (uint) {
+        return (
+            TX_GAS + SELECTOR_DATA_GAS + wordDataGas(id) + wordDataGas(nTimes) + EXECUTE_EXECUTABLE_GAS +
+            getSharedReimbursementOverhead(id)
+        );
+    }
+
+    function getExecuteExecutablesOverhead(uint[] ids, uint[] nTimes) constant returns (uint) {
+        /*
+         *  Overhead of the whole `executeExecutables(ids, nTimes)` batch.
+         *  Each array is encoded as an offset word, a length word and one
+         *  word per entry.  This is split evenly between the requests in the
+         *  batch, and each is also charged `EXECUTE_EXECUTABLES_ENTRY_GAS`
+         *  plus its own `getSharedReimbursementOverhead`.
+         */
+        uint overhead = (
+            TX_GAS + SELECTOR_DATA_GAS + EXECUTE_EXECUTABLES_GAS +
+            wordDataGas(64) + wordDataGas(96 + 32 * ids.length) +
+            wordDataGas(ids.length) + wordDataGas(nTimes.length)
+        );
+        for (uint i = 0; i < ids.length; i++) {
+            overhead += wordDataGas(ids[i]);
+        }
+        for (i = 0; i < nTimes.length; i++) {
+            overhead += wordDataGas(nTimes[i]);
+        }
+        return overhead;
+    }
+
+    function getSharedReimbursementOverhead(uint id) constant returns (uint) {
+        var numSharers = sharedRequests[_getRequest(id).executable].length;
+        if (numSharers > 1) {
+            return (numSharers - 1) * SHARED_REIMBURSEMENT_GAS;
+        }
+        return 0;
+    }
 
     function initializeDispute(uint id) public returns (address) {
         uint startGas = msg.gas;
-        var request = requests[_getRequest(id).id];
+        var request = _getRequest(id);
+
+        // The args of this request must be supplied by the caller.
+        if (request.argsLogged) throw;
+
+        startDispute(request, request.args);
+
+        // record the gas that was used.
+        reimburseGas(request.id, msg.sender, startGas, getInitializeDisputeOverhead(id));
 
+        return request.executable;
+    }
+
+    function initializeDispute(uint id, bytes args) public returns (address) {
+        uint startGas = msg.gas;
+        var request = _getRequest(id);
+
+        // The supplied args must be those the request was created with.
+        if (sha3(args) != request.argsHash) throw;
+
+        startDispute(request, args);
+
+        // record the gas that was used.
+        reimburseGas(request.id, msg.sender, startGas, getInitializeDisputeOverhead(id, args.length));
+
+        return request.executable;
+    }
+
+    function startDispute(Request storage request, bytes memory args) internal {
         // Check status
         requireStatus(request.status, Status.NeedsResolution);
 
@@ -508,19 +1082,179 @@ contract Broker is BrokerInterface, Accounting {
         // no challenge
         if (request.challengeAnswer.submitter == 0x0) throw;
 
-        request.executable = factory.build(request.args);
+        // A dispute between answers one of which matches a previously
+        // verified result is settled without running the computation.
+        var verifiedResultHash = verifiedResultHashes[request.argsHash];
+        if (verifiedResultHash != 0x0 && (request.initialAnswer.resultHash == verifiedResultHash ||
+                                          request.challengeAnswer.resultHash == verifiedResultHash)) {
+            setStatus(request, Status.FirmResolution);
+            setRevealDeadline(request);
+            Execution(request.id, 0, true);
+            return;
+        }
+
+        // Requests with the same args share a single executable until it
+        // is full, after which a fresh one is built for later disputes.
+        var executable = sharedExecutables[request.argsHash];
+        if (executable == 0x0 || sharedRequests[executable].length >= MAX_SHARED_REQUESTS) {
+            executable = factory.build(args);
+            sharedExecutables[request.argsHash] = executable;
+        }
+        request.executable = executable;
+        sharedRequests[executable].push(request.id);
 
         // Update the state
-        request.status = Status.Resolving;
+        if (ExecutableInterface(executable).isFinished()) {
+            // The computation has already been run for another request.
+            setStatus(request, Status.FirmResolution);
+            Execution(request.id, 0, true);
+        }
+        else {
+            setStatus(request, Status.Resolving);
+        }
+    }
 
-        // record the gas that was used.
-        reimburseGas(request.id, msg.sender, startGas, INITIALIZE_DISPUTE_GAS);
+    /*
+     *  Verified results
+     *
+     *  The hash of the output of every executable that has been run to
+     *  completion, keyed by the `argsHash` it was built with.  Disputes and
+     *  soft resolution for later requests with the same args are settled
+     *  against it.
+     */
+    mapping (bytes32 => bytes32) verifiedResultHashes;
 
-        return request.executable;
+    function getVerifiedResultHash(bytes32 argsHash) constant returns (bytes32) {
+        return verifiedResultHashes[argsHash];
+    }
+
+    /*
+     *  Shared executables
+     *
+     *  Disputes over requests with the same `argsHash` are resolved with a
+     *  single executable.  `sharedRequests` holds the ids of the requests
+     *  using an executable which have not yet been finalized.  The gas for
+     *  each `executeExecutable` call is split evenly between them, so a
+     *  request only pays towards the execution which happens while it is
+     *  disputed.
+     *
+     *  Every execution walks the list of sharers, so it is capped at
+     *  `MAX_SHARED_REQUESTS`.  Otherwise anyone could answer and challenge
+     *  enough requests over the same args to make a single step cost more
+     *  than the block gas limit.  Disputes beyond the cap get a fresh
+     *  executable, which `sharedExecutables` then points later disputes to.
+     */
+    uint constant MAX_SHARED_REQUESTS = 8;
+
+    // Enough for a factory to pool or destroy an executable in `recycle`.
+    uint constant RECYCLE_GAS = 100000;
+
+    mapping (bytes32 => address) sharedExecutables;
+    mapping (address => uint[]) sharedRequests;
+
+    function getMaxSharedRequests() constant returns (uint) {
+        return MAX_SHARED_REQUESTS;
+    }
+
+    function getSharedRequests(bytes32 argsHash) constant returns (uint[]) {
+        // The requests sharing the executable which a new dispute over
+        // `argsHash` would join.
+        return sharedRequests[sharedExecutables[argsHash]];
     }
 
-    // TODO: derive this value.
-    uint constant EXECUTE_EXECUTABLE_GAS = 30000;
+    function resolveSharedRequests(Request storage request) internal {
+        // The executable has finished so every request sharing it is
+        // resolved.
+        var sharers = sharedRequests[request.executable];
+        for (uint i = 0; i < sharers.length; i++) {
+            var sharer = requests[sharers[i]];
+            if (sharer.id == request.id || sharer.status != Status.Resolving) continue;
+
+            setStatus(sharer, Status.FirmResolution);
+            Execution(sharer.id, 0, true);
+        }
+    }
+
+    function releaseSharedExecutable(Request storage request) internal {
+        var sharers = sharedRequests[request.executable];
+        for (uint i = 0; i < sharers.length; i++) {
+            if (sharers[i] == request.id) {
+                sharers[i] = sharers[sharers.length - 1];
+                sharers.length -= 1;
+                break;
+            }
+        }
+
+        if (sharers.length == 0) {
+            // Nothing more is needed from the executable so the factory may
+            // reuse or destroy it.  `request.executable` is kept as a record of which
+            // contract resolved the dispute.
+            if (sharedExecutables[request.argsHash] == request.executable) {
+                delete sharedExecutables[request.argsHash];
+            }
+
+            // Factories written before `recycle` was added do not have it,
+            // and one which fails to take the executable back must not stop
+            // the request from being finalized.  The call is not typed so
+            // that a failure is ignored, and its gas is capped since a
+            // failed call uses all of the gas it is given.
+            address(factory).call.gas(RECYCLE_GAS)(bytes4(sha3("recycle(address)")), request.executable);
+        }
+    }
+
+    function reimburseSharedGas(Request storage request, uint startGas, uint extraGas) internal {
+        if (sharedRequests[request.executable].length <= 1) {
+            reimburseGas(request.id, msg.sender, startGas, extraGas);
+            return;
+        }
+
+        var amounts = sharedGasCharges(request, startGas, extraGas);
+
+        credit(msg.sender, logSharedGas(request, amounts));
+        recordSharedGas(request, amounts);
+    }
+
+    function sharedGasCharges(Request storage request, uint startGas, uint extraGas) internal returns (uint[] memory amounts) {
+        /*
+         *  The amount each request sharing the executable pays towards the
+         *  gas used, in the order of `sharedRequests`.
+         */
+        var sharers = sharedRequests[request.executable];
+
+        var total = gasScalar(request.baseGasPrice) * tx.gasprice / 100;
+        total *= (startGas - msg.gas) + extraGas;
+
+        // Each request pays an equal share from its own fund, with the
+        // calling request also paying any remainder.
+        amounts = new uint[](sharers.length);
+
+        for (uint i = 0; i < sharers.length; i++) {
+            amounts[i] = total / sharers.length;
+            if (sharers[i] == request.id) {
+                amounts[i] += total % sharers.length;
+            }
+            amounts[i] = min(amounts[i], remainingGasFund(sharers[i]));
+        }
+        return amounts;
+    }
+
+    function logSharedGas(Request storage request, uint[] memory amounts) internal returns (uint total) {
+        var sharers = sharedRequests[request.executable];
+
+        for (uint i = 0; i < sharers.length; i++) {
+            GasReimbursement(sharers[i], msg.sender, amounts[i]);
+            total += amounts[i];
+        }
+        return total;
+    }
+
+    function recordSharedGas(Request storage request, uint[] memory amounts) internal {
+        var sharers = sharedRequests[request.executable];
+
+        for (uint i = 0; i < sharers.length; i++) {
+            requests[sharers[i]].gasReimbursements += uint128(amounts[i]);
+        }
+    }
 
     function executeExecutable(uint id, uint nTimes) public returns (uint i, bool isFinished) {
         var startGas = msg.gas;
@@ -530,7 +1264,7 @@ contract Broker is BrokerInterface, Accounting {
         // of steps possible.  Maybe add a fixed number * numSteps to the gas
         // reimbursment?
 
-        var request = requests[_getRequest(id).id];
+        var request = _getRequest(id);
 
         // Check status
         requireStatus(request.status, Status.Resolving);
@@ -557,13 +1291,73 @@ contract Broker is BrokerInterface, Accounting {
         Execution(request.id, i, isFinished);
 
         if (isFinished) {
-            request.status = Status.FirmResolution;
+            setStatus(request, Status.FirmResolution);
+            resolveSharedRequests(request);
         }
 
         // reimburse for the gas that was used.
-        reimburseGas(request.id, msg.sender, startGas, EXECUTE_EXECUTABLE_GAS);
+        reimburseSharedGas(request, startGas, getExecuteExecutableOverhead(id, nTimes));
+    }
+
+    function executeExecutables(uint[] ids, uint[] nTimes) public returns (uint[] iTimes) {
+        /*
+         *  Advance the executables of several requests in one transaction.
+         *  The gas left is split evenly between the requests which have not
+         *  been executed yet, and each executable is called with
+         *  `.call(..)` so that one failing does not revert the others.
+         *  Requests which are no longer resolving (e.g. because an earlier
+         *  entry finished an executable they share) are skipped.
+         *
+         *  Each request pays for the gas used on it plus its share of the
+         *  batch overhead, and the total is credited to the caller once.
+         */
+        if (ids.length != nTimes.length) throw;
+
+        var batchOverhead = getExecuteExecutablesOverhead(ids, nTimes) / ids.length;
+        uint reimbursement;
+        iTimes = new uint[](ids.length);
+
+        for (uint j = 0; j < ids.length; j++) {
+            var startGas = msg.gas;
+            var request = _getRequest(ids[j]);
+
+            if (request.status != Status.Resolving) continue;
+
+            var remaining = ids.length - j;
+            if (startGas < remaining * EXECUTE_EXECUTABLES_RESERVE_GAS) break;
+
+            var executable = ExecutableInterface(request.executable);
+            var previousStep = executable.getCurrentStep();
+
+            address(executable).call.gas((startGas - remaining * EXECUTE_EXECUTABLES_RESERVE_GAS) / remaining)(bytes4(sha3("executeN(uint256)")), nTimes[j]);
 
-        return (i, isFinished);
+            iTimes[j] = executable.getCurrentStep() - previousStep;
+
+            // No progress was made, so the request is not charged for the
+            // attempt.
+            if (iTimes[j] == 0) continue;
+
+            var isFinished = executable.isFinished();
+
+            Execution(request.id, iTimes[j], isFinished);
+
+            if (isFinished) {
+                setStatus(request, Status.FirmResolution);
+                resolveSharedRequests(request);
+            }
+
+            var amounts = sharedGasCharges(
+                request,
+                startGas,
+                batchOverhead + EXECUTE_EXECUTABLES_ENTRY_GAS + getSharedReimbursementOverhead(request.id)
+            );
+            reimbursement += logSharedGas(request, amounts);
+            recordSharedGas(request, amounts);
+        }
+
+        credit(msg.sender, reimbursement);
+
+        return iTimes;
     }
 
     bytes __outputCallbackStorage;
@@ -571,108 +1365,260 @@ contract Broker is BrokerInterface, Accounting {
     function __outputCallback(uint length) public {
         if (msg.data.length <= 4 + length) throw;
 
-        __outputCallbackStorage.length = 0;
+        __outputCallbackStorage.length = length;
 
         for (uint i = 0; i < length; i++) {
-            __outputCallbackStorage.push(msg.data[i + 4 + 32]);
+            __outputCallbackStorage[i] = msg.data[i + 4 + 32];
         }
     }
 
+    function retrieveOutput(ExecutableInterface executable, bytes32 outputHash) internal {
+        // Copies the output of `executable` into `__outputCallbackStorage`.
+        if (!executable.requestOutput(bytes4(sha3("__outputCallback(uint256)")))) throw;
+        if (sha3(__outputCallbackStorage) != outputHash) throw;
+    }
+
+    function revealAnswer(Answer storage answer, bytes memory result, bytes32 resultHash) internal returns (bool) {
+        if (!answer.isCommitted || answer.resultHash != resultHash) return false;
+
+        answer.result = result;
+        answer.isCommitted = false;
+        return true;
+    }
+
+    function revealAnswerFromOutput(Answer storage answer, ExecutableInterface executable) internal {
+        // The output matches the committed hash so it is the answer's result.
+        retrieveOutput(executable, answer.resultHash);
+
+        answer.result = __outputCallbackStorage;
+        answer.isCommitted = false;
+        delete __outputCallbackStorage;
+    }
+
+    function finalize(uint id, bytes result) public returns (bytes32) {
+        /*
+         *  Reveal the result of whichever committed answer it matches before
+         *  finalizing.
+         */
+        var request = _getRequest(id);
+        var resultHash = sha3(result);
+
+        if (!revealAnswer(request.initialAnswer, result, resultHash) &&
+            !revealAnswer(request.challengeAnswer, result, resultHash)) throw;
+
+        return finalize(id);
+    }
+
     function finalize(uint id) public returns (bytes32) {
         address paymentTo;
-        var request = requests[_getRequest(id).id];
+        var request = _getRequest(id);
 
         requireStatus(request.status, Status.FirmResolution, Status.SoftResolution);
 
         var executable = ExecutableInterface(request.executable);
 
         if (request.executable != 0x0) {
-            // If this was verified on-chain, then retrieve the computed answer
-            // and evaluate the submitted answers.
+            // If this was verified on-chain, then evaluate the submitted
+            // answers against the hash of the computed output.
             request.resultHash = executable.getOutputHash();
 
-            if (!executable.requestOutput(bytes4(sha3("__outputCallback(uint256)")))) throw;
-            if (sha3(__outputCallbackStorage) != request.resultHash) throw;
-
-            request.result = __outputCallbackStorage;
-
+            // The output only needs to be retrieved from the executable
+            // when the correct answer was committed without its result, or
+            // when neither answer is correct.
             if (request.initialAnswer.resultHash == request.resultHash) {
                 request.initialAnswer.isVerified = true;
                 paymentTo = request.initialAnswer.submitter;
+                if (request.initialAnswer.isCommitted) {
+                    revealAnswerFromOutput(request.initialAnswer, executable);
+                }
             } else if (request.challengeAnswer.resultHash == request.resultHash) {
                 request.challengeAnswer.isVerified = true;
                 paymentTo = request.challengeAnswer.submitter;
+                if (request.challengeAnswer.isCommitted) {
+                    revealAnswerFromOutput(request.challengeAnswer, executable);
+                }
             } else {
                 // If neither answers are correct the requester gets their
                 // payment back.
+                retrieveOutput(executable, request.resultHash);
+
+                request.result = __outputCallbackStorage;
+                delete __outputCallbackStorage;
+
                 paymentTo = request.requester;
             }
+
+            if (verifiedResultHashes[request.argsHash] == 0x0) {
+                verifiedResultHashes[request.argsHash] = request.resultHash;
+            }
+
+            releaseSharedExecutable(request);
+        }
+        else if (request.status == Status.FirmResolution) {
+            // The dispute was settled against a verified result so one of
+            // the answers matches it.  A committed answer must have been
+            // revealed with `finalize(id, result)`, or have missed its
+            // reveal deadline.
+            request.resultHash = verifiedResultHashes[request.argsHash];
+
+            if (request.initialAnswer.resultHash == request.resultHash) {
+                if (request.initialAnswer.isCommitted) {
+                    forfeitDeposit(request, request.initialAnswer);
+                    paymentTo = request.requester;
+                } else {
+                    request.initialAnswer.isVerified = true;
+                    paymentTo = request.initialAnswer.submitter;
+                }
+            } else {
+                if (request.challengeAnswer.isCommitted) {
+                    forfeitDeposit(request, request.challengeAnswer);
+                    paymentTo = request.requester;
+                } else {
+                    request.challengeAnswer.isVerified = true;
+                    paymentTo = request.challengeAnswer.submitter;
+                }
+            }
         }
         else {
-            // If this was resolved with no challenge, then use the
-            // submitted asnwer.
-            request.result = request.initialAnswer.result;
-            request.resultHash = request.initialAnswer.resultHash;
-            paymentTo = request.initialAnswer.submitter;
+            // If this was resolved with no challenge, then the submitted
+            // answer is the result.  A committed answer must have been
+            // revealed with `finalize(id, result)`, otherwise once its
+            // reveal deadline has passed the request has no result.
+            if (request.initialAnswer.isCommitted) {
+                forfeitDeposit(request, request.initialAnswer);
+                paymentTo = request.requester;
+            } else {
+                request.resultHash = request.initialAnswer.resultHash;
+                paymentTo = request.initialAnswer.submitter;
+            }
         }
 
-        // Send the payment to the appropriate party.
-        sendRobust(paymentTo, request.payment);
+        // Credit the payment to the appropriate party.
+        credit(paymentTo, request.payment);
         Payment(request.id, paymentTo, request.payment);
 
         // Update the status.
-        request.status = Status.Finalized;
+        setStatus(request, Status.Finalized);
+
+        // Bonded deposits are released without waiting for `reclaimDeposit`
+        // since no ether needs to be sent.
+        if (request.initialAnswer.isBonded) {
+            releaseBond(request, request.initialAnswer, depositCharge(request, true));
+        }
+        if (request.challengeAnswer.isBonded) {
+            releaseBond(request, request.challengeAnswer, depositCharge(request, false));
+        }
+
+        if (revealDeadlines[request.id] != 0) {
+            delete revealDeadlines[request.id];
+        }
+
+        reclaimStorage(request);
 
         return request.resultHash;
     }
 
     function reclaimDeposit(uint id) public {
-        var request = requests[_getRequest(id).id];
-
-        if (msg.sender == request.initialAnswer.submitter) {
-            if (request.initialAnswer.depositAmount == 0) return;
+        returnDeposits(_getRequest(id));
+    }
 
-            if (request.initialAnswer.resultHash != request.resultHash) {
-                // If they answered incorrectly see if they are responsible for
-                // all or half of the gas costs.
-                if (request.challengeAnswer.resultHash == request.resultHash) {
-                    request.initialAnswer.depositAmount -= request.gasReimbursements;
-                } else {
-                    // The initial answerer is responsible for any odd
-                    // remainder values if the gas remibursements were an odd
-                    // value that doesn't evenly divide.
-                    request.initialAnswer.depositAmount -= request.gasReimbursements / 2 + request.gasReimbursements % 2;
-                }
-            }
+    function reclaimDeposits(uint[] ids) public {
+        for (uint i = 0; i < ids.length; i++) {
+            returnDeposits(_getRequest(ids[i]));
+        }
+    }
 
-            // Send back their deposit.
-            if (sendRobust(msg.sender, request.initialAnswer.depositAmount)) {
-                DepositReturned(request.id, msg.sender, request.initialAnswer.depositAmount);
-                request.initialAnswer.depositAmount = 0;
-            }
+    function returnDeposits(Request storage request) internal {
+        /*
+         *  Credit the sender with whatever is left of their deposits on the
+         *  request.  Bonded deposits are released by `finalize` instead.
+         */
+        if (msg.sender == request.initialAnswer.submitter && !request.initialAnswer.isBonded) {
+            returnDeposit(request, request.initialAnswer, depositCharge(request, true));
         }
 
         // This is intentionally not an `else if` because it would cause the
         // challenger deposit to be unrecoverable if the same address was both
         // submitter and challenger
-        if (msg.sender == request.challengeAnswer.submitter) {
-            if (request.challengeAnswer.depositAmount == 0) return;
-
-            if (request.challengeAnswer.resultHash != request.resultHash) {
-                // If they answered incorrectly see if they are responsible for
-                // all or half of the gas costs.
-                if (request.initialAnswer.resultHash == request.resultHash) {
-                    request.challengeAnswer.depositAmount -= request.gasReimbursements;
-                } else {
-                    request.challengeAnswer.depositAmount -= request.gasReimbursements / 2;
-                }
-            }
+        if (msg.sender == request.challengeAnswer.submitter && !request.challengeAnswer.isBonded) {
+            returnDeposit(request, request.challengeAnswer, depositCharge(request, false));
+        }
 
-            // Send back their deposit.
-            if (sendRobust(msg.sender, request.challengeAnswer.depositAmount)) {
-                DepositReturned(request.id, msg.sender, request.challengeAnswer.depositAmount);
-                request.challengeAnswer.depositAmount = 0;
-            }
+        reclaimStorage(request);
+    }
+
+    function reclaimStorage(Request storage request) internal {
+        /*
+         *  Once a request is finalized and none of its deposits are held,
+         *  only its hashes and result are kept.  The refunds for clearing the
+         *  `args` and the result of any wrong answer go towards the gas of
+         *  the transaction which settled the request.  Values which are
+         *  already empty are not written since that still costs gas.
+         */
+        if (request.status != Status.Finalized) return;
+        if (request.initialAnswer.depositAmount != 0 || request.challengeAnswer.depositAmount != 0) return;
+
+        if (request.args.length > 0) {
+            delete request.args;
+        }
+        if (request.initialAnswer.resultHash != request.resultHash && request.initialAnswer.result.length > 0) {
+            delete request.initialAnswer.result;
+        }
+        if (request.challengeAnswer.resultHash != request.resultHash && request.challengeAnswer.result.length > 0) {
+            delete request.challengeAnswer.result;
+        }
+    }
+
+    function depositCharge(Request storage request, bool isInitial) internal returns (uint) {
+        /*
+         *  The gas costs taken out of the deposit of the initial answer, or
+         *  of the challenge when `isInitial` is false.
+         */
+        bytes32 resultHash;
+        bytes32 otherResultHash;
+
+        if (isInitial) {
+            resultHash = request.initialAnswer.resultHash;
+            otherResultHash = request.challengeAnswer.resultHash;
+        } else {
+            resultHash = request.challengeAnswer.resultHash;
+            otherResultHash = request.initialAnswer.resultHash;
         }
+
+        if (resultHash == request.resultHash) return 0;
+
+        // If they answered incorrectly see if they are responsible for all
+        // or half of the gas costs.
+        if (otherResultHash == request.resultHash) return request.gasReimbursements;
+
+        // The initial answerer is responsible for any odd remainder values
+        // if the gas remibursements were an odd value that doesn't evenly
+        // divide.
+        if (isInitial) return request.gasReimbursements / 2 + request.gasReimbursements % 2;
+        return request.gasReimbursements / 2;
+    }
+
+    function returnDeposit(Request storage request, Answer storage answer, uint charge) internal {
+        if (answer.depositAmount == 0) return;
+
+        answer.depositAmount -= uint128(charge);
+
+        // Return their deposit.
+        credit(answer.submitter, answer.depositAmount);
+        DepositReturned(request.id, answer.submitter, answer.depositAmount);
+        answer.depositAmount = 0;
+    }
+
+    function releaseBond(Request storage request, Answer storage answer, uint charge) internal {
+        // Forfeited deposits have already been taken from the bond.
+        if (answer.depositAmount == 0) return;
+
+        // The charge has already been paid out as gas reimbursements so it
+        // is taken from the bond.
+        reservedBonds[answer.submitter] -= answer.depositAmount;
+        bonds[answer.submitter] -= charge;
+
+        DepositReturned(request.id, answer.submitter, answer.depositAmount - charge);
+        answer.depositAmount = 0;
     }
 }
@@ -3,11 +3,15 @@ contract ExecutableInterface {
     function step(uint currentStep, bytes _state) public returns (bytes result, bool);
     function isFinished() constant returns (bool);
     function getOutputHash() constant returns (bytes32);
+    function getCurrentStep() constant returns (uint);
     function requestOutput(bytes4 sig) public returns (bool);
 
     function execute() public;
     function executeN() public returns (uint i);
     function executeN(uint nTimes) public returns (uint iTimes);
+
+    function reinitialize(bytes _args) public;
+    function destroy() public;
 }
 
 
@@ -16,9 +20,40 @@ contract ExecutableBase is ExecutableInterface {
      *  This is the base class used for on-chain verification of a computation.
      */
     function ExecutableBase(bytes _args) {
+        factory = msg.sender;
         input = _args;
     }
 
+    // The factory which deployed this executable.
+    address public factory;
+
+    function reinitialize(bytes _args) public {
+        /*
+         *  Reset a finished executable so that it can be reused for a new
+         *  computation rather than deploying a new contract.  Only the
+         *  factory which deployed it may do this.
+         */
+        if (msg.sender != factory) throw;
+        if (!isFinal) throw;
+
+        input = _args;
+        currentStep = 0;
+        isFinal = false;
+        delete output;
+        delete state;
+    }
+
+    function destroy() public {
+        /*
+         *  Remove a finished executable once it is no longer needed.  Only
+         *  the factory which deployed it may do this.
+         */
+        if (msg.sender != factory) throw;
+        if (!isFinal) throw;
+
+        suicide(factory);
+    }
+
     function isFinished() constant returns (bool) {
         return isFinal;
     }
@@ -35,6 +70,10 @@ contract ExecutableBase is ExecutableInterface {
         return sha3(output);
     }
 
+    function getCurrentStep() constant returns (uint) {
+        return currentStep;
+    }
+
     function requestOutput(bytes4 sig) public returns (bool) {
         if (isFinal) {
             return msg.sender.call(sig, output.length, output);
@@ -78,6 +117,11 @@ contract ExecutableBase is ExecutableInterface {
     uint constant GAS_RESERVE = 21000;
     uint constant GAS_BUFFER = 21000;
 
+    // Cost of changing a word of storage which is already set, and of
+    // setting a word which is empty.
+    uint constant STORAGE_UPDATE_GAS = 5000;
+    uint constant STORAGE_WORD_GAS = 20000;
+
     function executeN() public returns (uint i) {
         // This function is shorthand for `executeN(0)`
         return executeN(0);
@@ -92,10 +136,18 @@ contract ExecutableBase is ExecutableInterface {
          */
         if (isFinal) throw;
 
+        uint previousStep;
+
         while (!isFinal && (nTimes == 0 || iTimes < nTimes) && msg.gas > GAS_RESERVE + GAS_BUFFER) {
-            // This uses .call(..) to isolate any possible out-of-gas exeception.
-            if (address(this).call.gas(msg.gas - GAS_RESERVE)(bytes4(sha3("execute()")))) {
-                iTimes += 1;
+            previousStep = currentStep;
+
+            // This uses .call(..) to isolate any possible out-of-gas
+            // exeception.  A failed batch uses all of the gas it was given
+            // so there is nothing left to retry with.
+            if (address(this).call.gas(msg.gas - GAS_RESERVE)(bytes4(sha3("executeBatch(uint256)")), nTimes == 0 ? 0 : nTimes - iTimes)) {
+                // The batch stopped early without making progress.
+                if (currentStep == previousStep) break;
+                iTimes += currentStep - previousStep;
             }
             else {
                 break;
@@ -103,4 +155,209 @@ contract ExecutableBase is ExecutableInterface {
         }
         return iTimes;
     }
+
+    function storageWords(uint length) internal returns (uint) {
+        // Words used by a `bytes` value of `length`, including its length.
+        return (length + 31) / 32 + 1;
+    }
+
+    function storageGas(uint storedLength, uint length) internal returns (uint) {
+        // Gas to overwrite a stored value of `storedLength` bytes with one of
+        // `length` bytes.  Words which are already set cost an update and
+        // any past them cost a new word.
+        uint words = storageWords(length);
+        uint storedWords;
+
+        if (storedLength > 0) storedWords = storageWords(storedLength);
+        if (words <= storedWords) return words * STORAGE_UPDATE_GAS;
+        return storedWords * STORAGE_UPDATE_GAS + (words - storedWords) * STORAGE_WORD_GAS;
+    }
+
+    function outputGas(uint storedLength, uint length) internal returns (uint) {
+        // Gas to write an `output` of `length` bytes to empty storage and
+        // clear a stored `state` of `storedLength` bytes.
+        if (storedLength == 0) return storageGas(0, length);
+        return storageGas(0, length) + storageWords(storedLength) * STORAGE_UPDATE_GAS;
+    }
+
+    function executeBatch(uint nTimes) public returns (uint iTimes) {
+        /*
+         *  Execute up to N steps within a single call frame, keeping the
+         *  intermediate state in memory and only writing it to storage once
+         *  the batch is done.
+         *  * N == 0 indicates execution should continue until the remaining
+         *    gas would not be enough for another step and the final storage
+         *    write.
+         *  * The gas needed for a step is estimated from the most expensive
+         *    step seen so far in the batch.  The first step of a batch
+         *    always runs, so an out-of-gas exception discards the whole
+         *    batch, which is why `executeN` calls this via `.call(..)`.
+         *  * Only the update of `state` is reserved for.  If the last step
+         *    finishes the computation without enough gas left to write the
+         *    `output` it is dropped and left for the next batch.  This
+         *    relies on `step` returning a new value rather than modifying
+         *    `_state`.
+         */
+        if (isFinal) throw;
+
+        uint _currentStep = currentStep;
+        uint storedLength = state.length;
+        bytes memory _state;
+        bytes memory previousState;
+        bool _isFinal;
+        uint startGas;
+        uint maxStepGas;
+
+        if (_currentStep == 0) {
+            _state = input;
+        }
+        else {
+            _state = state;
+        }
+
+        while (!_isFinal && (nTimes == 0 || iTimes < nTimes)) {
+            // Leave enough gas for another step and for storing its state,
+            // which may grow by up to a word.
+            if (iTimes > 0 && msg.gas < 2 * maxStepGas + storageGas(storedLength, _state.length + 32) + GAS_BUFFER) break;
+
+            previousState = _state;
+            startGas = msg.gas;
+            _currentStep += 1;
+            (_state, _isFinal) = step(_currentStep, _state);
+            iTimes += 1;
+
+            if (startGas - msg.gas > maxStepGas) {
+                maxStepGas = startGas - msg.gas;
+            }
+        }
+
+        if (_isFinal && iTimes > 1 && msg.gas < outputGas(storedLength, _state.length) + GAS_BUFFER) {
+            _state = previousState;
+            _currentStep -= 1;
+            _isFinal = false;
+            iTimes -= 1;
+        }
+
+        currentStep = _currentStep;
+        isFinal = _isFinal;
+
+        if (isFinal) {
+            output = _state;
+            delete state;
+        }
+        else {
+            state = _state;
+        }
+
+        return iTimes;
+    }
+}
+
+
+contract StatefulExecutable is ExecutableBase {
+    /*
+     *  Base class for executables which update their `state` in place.
+     *
+     *  `ExecutableBase` writes the full return value of `step` to storage
+     *  after every step, so a state which grows by a little each step costs
+     *  gas quadratic in its final size.  Subclasses of this contract instead
+     *  implement `advance` and use the storage API below to write only the
+     *  parts of `state` which change.  Once the computation is final `state`
+     *  becomes the `output`.
+     */
+    function StatefulExecutable(bytes _args) ExecutableBase(_args) {
+    }
+
+    // Advance the computation by one step by modifying `state`.  Must
+    // return whether the computation has finished.
+    function advance(uint currentStep) internal returns (bool);
+
+    function step(uint currentStep, bytes _state) public returns (bytes result, bool) {
+        // Steps of a stateful computation depend on contract storage and
+        // cannot be computed from the previous return value.  Subclasses may
+        // override this with an equivalent stateless implementation.
+        throw;
+    }
+
+    /*
+     *  Storage API for use within `advance`.
+     */
+    function appendState(byte value) internal {
+        state.length += 1;
+        state[state.length - 1] = value;
+    }
+
+    function extendState(bytes memory value) internal {
+        uint offset = state.length;
+        state.length += value.length;
+        for (uint i = 0; i < value.length; i++) {
+            state[offset + i] = value[i];
+        }
+    }
+
+    function writeState(uint idx, byte value) internal {
+        state[idx] = value;
+    }
+
+    function resizeState(uint length) internal {
+        state.length = length;
+    }
+
+    function finalizeState() internal {
+        output = state;
+        delete state;
+    }
+
+    function execute() public {
+        /*
+         * Execute a single step of the computation.
+         */
+        if (isFinal) throw;
+
+        currentStep += 1;
+        isFinal = advance(currentStep);
+
+        if (isFinal) {
+            finalizeState();
+        }
+    }
+
+    function executeBatch(uint nTimes) public returns (uint iTimes) {
+        /*
+         *  Execute up to N steps within a single call frame.  Each step
+         *  already writes its changes to storage so the only saving over
+         *  `execute` is the per call overhead.
+         */
+        if (isFinal) throw;
+
+        uint _currentStep = currentStep;
+        bool _isFinal;
+        uint startGas;
+        uint maxStepGas;
+
+        while (!_isFinal && (nTimes == 0 || iTimes < nTimes)) {
+            // Steps write to storage as they go so `maxStepGas` covers them.
+            // A step which finishes cannot be undone so the copy of `state`
+            // to `output` is reserved for.
+            if (iTimes > 0 && msg.gas < 2 * maxStepGas + outputGas(state.length + 32, state.length + 32) + GAS_BUFFER) break;
+
+            startGas = msg.gas;
+            _currentStep += 1;
+            _isFinal = advance(_currentStep);
+            iTimes += 1;
+
+            if (startGas - msg.gas > maxStepGas) {
+                maxStepGas = startGas - msg.gas;
+            }
+        }
+
+        currentStep = _currentStep;
+        isFinal = _isFinal;
+
+        if (isFinal) {
+            finalizeState();
+        }
+
+        return iTimes;
+    }
 }
@@ -1,7 +1,15 @@
+import {ExecutableInterface} from "contracts/Execution.sol";
+
+
 contract FactoryInterface {
     function build(bytes args) public returns (address);
     function _build(bytes args) internal returns (address);
 
+    // Return a finished executable which is no longer needed by the caller
+    // so that it may be reused or destroyed.  Returns whether it was
+    // accepted.
+    function recycle(address executable) public returns (bool);
+
     event Constructed(address addr, bytes32 argsHash);
 
     function isStateless() constant returns (bool);
@@ -21,6 +29,9 @@ contract FactoryBase is FactoryInterface {
 
     bool public stateless;
 
+    // The address which called `build` for each executable in use.
+    mapping (address => address) public builders;
+
     function FactoryBase(string _sourceURI, string _compilerVersion, string _compilerFlags) {
         sourceURI = _sourceURI;
         compilerVersion = _compilerVersion;
@@ -29,6 +40,7 @@ contract FactoryBase is FactoryInterface {
 
     function build(bytes args) public returns (address addr) {
         addr = _build(args);
+        builders[addr] = msg.sender;
         Constructed(addr, sha3(args));
         return addr;
     }
@@ -39,6 +51,16 @@ contract FactoryBase is FactoryInterface {
 
     // returning negative numbers indicates unknown.
     function totalGas(bytes args) constant returns(int) { return -1; }
+
+    function recycle(address executable) public returns (bool) {
+        // Executables are not reused by default so they are destroyed.
+        if (builders[executable] != msg.sender) return false;
+        if (!ExecutableInterface(executable).isFinished()) return false;
+
+        delete builders[executable];
+        ExecutableInterface(executable).destroy();
+        return true;
+    }
 }
 
 
@@ -56,3 +78,47 @@ contract StatefulFactory is FactoryBase {
         stateless = false;
     }
 }
+
+
+contract RecyclingFactory is FactoryBase {
+    /*
+     *  Factory which reuses finished executables instead of deploying a new
+     *  contract for every build.  Contract creation dominates the cost of
+     *  `build`, while reinitializing an executable only rewrites its storage.
+     *
+     *  Whoever built an executable may hand it back with `recycle` once they
+     *  no longer need it.  The next `build` reinitializes it with the new
+     *  args and logs `Constructed` as though it were newly deployed.  Only
+     *  when no recycled executables are available is `_build` used to deploy
+     *  a new one.
+     */
+    address[] pool;
+
+    function build(bytes args) public returns (address addr) {
+        if (pool.length > 0) {
+            addr = pool[pool.length - 1];
+            pool.length -= 1;
+            ExecutableInterface(addr).reinitialize(args);
+        }
+        else {
+            addr = _build(args);
+        }
+
+        builders[addr] = msg.sender;
+        Constructed(addr, sha3(args));
+        return addr;
+    }
+
+    function recycle(address executable) public returns (bool) {
+        if (builders[executable] != msg.sender) return false;
+        if (!ExecutableInterface(executable).isFinished()) return false;
+
+        delete builders[executable];
+        pool.push(executable);
+        return true;
+    }
+
+    function getPoolSize() constant returns (uint) {
+        return pool.length;
+    }
+}
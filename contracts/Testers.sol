@@ -1,5 +1,7 @@
 import {DunderBytes} from "libraries/DunderBytes.sol";
 import {DunderUIntToBytes} from "libraries/DunderUInt.sol";
+import {StatelessFactory} from "contracts/Factory.sol";
+import {BuildByteArray} from "contracts/Examples.sol";
 
 
 contract TestDunder is DunderUIntToBytes {
@@ -8,4 +10,96 @@ contract TestDunder is DunderUIntToBytes {
     function toUInt(bytes v) constant returns (uint) {
         return v.toUInt();
     }
+
+    function extractUint(bytes v, uint startIdx, uint endIdx) constant returns (uint) {
+        return v.extractUint(startIdx, endIdx);
+    }
+
+    function internalToUInt(bytes v) constant returns (uint) {
+        return _toUInt(v);
+    }
+
+    function internalExtractUint(bytes v, uint startIdx, uint endIdx) constant returns (uint) {
+        return _extractUint(v, startIdx, endIdx);
+    }
+}
+
+
+contract TestDunderReference {
+    /*
+     *  The original codec implementations, which compute a power of 256
+     *  for every byte, kept to check the current ones against and to
+     *  compare their gas costs.
+     */
+    function toUInt(bytes v) constant returns (uint result) {
+        for (uint i = 0; i < v.length; i++) {
+            result += uint(v[i]) * 2 ** (8 * i);
+        }
+        return result;
+    }
+
+    function extractUint(bytes v, uint startIdx, uint endIdx) constant returns (uint result) {
+        if (startIdx >= endIdx || endIdx >= v.length) throw;
+        for (uint i = startIdx; i < endIdx; i++) {
+            result += uint(v[i]) * 2 ** (8 * (i - startIdx));
+        }
+        return result;
+    }
+
+    function toBytes(uint v) constant returns (bytes result) {
+        uint len;
+        while (2 ** (8 * len) <= v) {
+            len += 1;
+        }
+        result = new bytes(len);
+        for (uint i = 0; i < len; i++) {
+            result[i] = byte(uint8(v));
+            v /= 2 ** 8;
+        }
+        return result;
+    }
+}
+
+
+contract DestroyingBuildByteArrayFactory is StatelessFactory {
+    /*
+     *  Builds `BuildByteArray` executables without reusing them, so that
+     *  recycling one destroys it.
+     */
+    function DestroyingBuildByteArrayFactory() StatelessFactory("ipfs://test", "solc 9000", "--fake") {
+    }
+
+    function _build(bytes args) internal returns (address) {
+        var buildByteArray = new BuildByteArray(args);
+        return address(buildByteArray);
+    }
+}
+
+
+contract LegacyBuildByteArrayFactory {
+    /*
+     *  A factory written against the `FactoryInterface` from before
+     *  `recycle` was added.  Like many contracts of that time it rejects
+     *  calls to functions it does not have.
+     */
+    event Constructed(address addr, bytes32 argsHash);
+
+    function build(bytes args) public returns (address addr) {
+        var buildByteArray = new BuildByteArray(args);
+        addr = address(buildByteArray);
+        Constructed(addr, sha3(args));
+        return addr;
+    }
+
+    function isStateless() constant returns (bool) {
+        return true;
+    }
+
+    function totalGas(bytes args) constant returns (int) {
+        return -1;
+    }
+
+    function () {
+        throw;
+    }
 }
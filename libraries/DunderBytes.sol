@@ -1,15 +1,33 @@
 library DunderBytes {
+    /*
+     *  Little-endian decoding of unsigned integers from bytes values.
+     *
+     *  Values are accumulated from the most significant byte down so each
+     *  byte costs a multiply and an add rather than an exponentiation.  Only
+     *  the first 32 bytes can contribute to a uint so anything past them is
+     *  ignored.
+     *
+     *  Bytes are still read one at a time: `bytes` cannot be sliced or
+     *  converted to `bytes32` in this version of solidity, so loading a
+     *  whole word at once would need inline assembly.
+     */
     function toUInt(bytes v) constant returns (uint result) {
-        for (uint i = 0; i < v.length; i++) {
-            result += uint(v[i]) * 2 ** (8 * i);
+        uint i = v.length;
+        if (i > 32) i = 32;
+        while (i > 0) {
+            i -= 1;
+            result = result * 256 + uint(v[i]);
         }
         return result;
     }
 
     function extractUint(bytes v, uint startIdx, uint endIdx) constant returns (uint result) {
         if (startIdx >= endIdx || endIdx >= v.length) throw;
-        for (uint i = startIdx; i < endIdx; i++) {
-            result += uint(v[i]) * 2 ** (8 * (i - startIdx));
+        if (endIdx - startIdx > 32) endIdx = startIdx + 32;
+        uint i = endIdx;
+        while (i > startIdx) {
+            i -= 1;
+            result = result * 256 + uint(v[i]);
         }
         return result;
     }
@@ -1,14 +1,61 @@
 contract DunderUIntToBytes {
     function toBytes(uint v) constant returns (bytes result) {
-        uint len;
-        while (2 ** (8 * len) <= v) {
-            len += 1;
+        return _toBytes(v);
+    }
+
+    /*
+     *  Internal codec functions.  Contracts which inherit from this contract
+     *  can use these directly on memory values, avoiding the external call
+     *  and the copying of arguments that a library call requires.
+     */
+    function byteLength(uint v) internal returns (uint len) {
+        // Binary search over the byte length.
+        if (v >= 2 ** 128) { len += 16; v /= 2 ** 128; }
+        if (v >= 2 ** 64) { len += 8; v /= 2 ** 64; }
+        if (v >= 2 ** 32) { len += 4; v /= 2 ** 32; }
+        if (v >= 2 ** 16) { len += 2; v /= 2 ** 16; }
+        if (v >= 2 ** 8) { len += 1; v /= 2 ** 8; }
+        if (v > 0) len += 1;
+        return len;
+    }
+
+    function _toBytes(uint v) internal returns (bytes result) {
+        // Minimal little-endian encoding.  `0` encodes to an empty value.
+        result = new bytes(byteLength(v));
+        writeUint(result, 0, v);
+        return result;
+    }
+
+    function writeUint(bytes memory v, uint startIdx, uint value) internal {
+        // Write `value` little-endian into `v` starting at `startIdx`, up to
+        // its most significant non-zero byte.  As with reading, each byte is
+        // written on its own since a word cannot be stored into `bytes`
+        // without inline assembly.
+        for (uint i = startIdx; value > 0; i++) {
+            v[i] = byte(uint8(value));
+            value /= 256;
         }
-        result = new bytes(len);
-        for (uint i = 0; i < len; i++) {
-            result[i] = byte(uint8(v));
-            v /= 2 ** 8;
+    }
+
+    function _toUInt(bytes memory v) internal returns (uint) {
+        return readUint(v, 0, v.length);
+    }
+
+    function readUint(bytes memory v, uint startIdx, uint endIdx) internal returns (uint result) {
+        // Little-endian decode of `v[startIdx:endIdx]`.  As with
+        // `DunderBytes.toUInt` only 32 bytes can contribute to the value.
+        if (endIdx - startIdx > 32) endIdx = startIdx + 32;
+        uint i = endIdx;
+        while (i > startIdx) {
+            i -= 1;
+            result = result * 256 + uint(v[i]);
         }
         return result;
     }
+
+    function _extractUint(bytes memory v, uint startIdx, uint endIdx) internal returns (uint) {
+        // Same semantics as `DunderBytes.extractUint`.
+        if (startIdx >= endIdx || endIdx >= v.length) throw;
+        return readUint(v, startIdx, endIdx);
+    }
 }
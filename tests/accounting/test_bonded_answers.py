@@ -0,0 +1,73 @@
+import pytest
+
+from ethereum.tester import TransactionFailed
+
+
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+def test_answering_against_a_bond(deploy_client, get_computation_request,
+                                  deploy_broker_contract, deployed_contracts,
+                                  deploy_coinbase, StatusEnum):
+    factory = deployed_contracts.BuildByteArrayFactory
+    broker = deploy_broker_contract(factory._meta.address)
+
+    deposit_amount = broker.getRequiredDeposit("abcdefg")
+    expected = "\x01\x02\x03\x04\x05\x06\x07"
+
+    deploy_client.wait_for_transaction(broker.bond(value=2 * deposit_amount))
+    assert broker.getBond(deploy_coinbase) == [2 * deposit_amount, 0]
+
+    id_a = get_computation_request(broker, "abcdefg", initial_answer=expected, initial_answer_deposit=0)
+    id_b = get_computation_request(broker, "abcdefg", initial_answer=expected, initial_answer_deposit=0)
+
+    assert broker.getBond(deploy_coinbase) == [2 * deposit_amount, 2 * deposit_amount]
+
+    # The whole bond is reserved.
+    id_c = get_computation_request(broker, "abcdefg")
+    with pytest.raises(TransactionFailed):
+        broker.answerRequest(id_c, expected)
+
+    with pytest.raises(TransactionFailed):
+        broker.unbond(1)
+
+    for _id in (id_a, id_b):
+        deploy_client.wait_for_transaction(broker.softResolveAnswer(_id))
+        deploy_client.wait_for_transaction(broker.finalize(_id))
+        assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+
+    assert broker.getBond(deploy_coinbase) == [2 * deposit_amount, 0]
+
+    deploy_client.wait_for_transaction(broker.unbond(deposit_amount))
+    assert broker.getBond(deploy_coinbase) == [deposit_amount, 0]
+    assert broker.getBalance(deploy_coinbase) >= deposit_amount
+
+
+def test_wrong_bonded_answer_is_charged_gas(deploy_client, get_computation_request,
+                                            deploy_broker_contract, deployed_contracts,
+                                            deploy_coinbase):
+    factory = deployed_contracts.BuildByteArrayFactory
+    broker = deploy_broker_contract(factory._meta.address)
+
+    deposit_amount = broker.getRequiredDeposit("abcdefg")
+    expected = "\x01\x02\x03\x04\x05\x06\x07"
+
+    deploy_client.wait_for_transaction(broker.bond(value=deposit_amount))
+
+    _id = get_computation_request(
+        broker, "abcdefg",
+        initial_answer="wrong",
+        initial_answer_deposit=0,
+        challenge_answer=expected,
+        initialize_dispute=True,
+        perform_execution=True,
+        finalize=True,
+    )
+
+    gas_reimbursements = broker.getRequest(_id)[8]
+    assert gas_reimbursements > 0
+
+    assert broker.getBond(deploy_coinbase) == [deposit_amount - gas_reimbursements, 0]
+    assert broker.getInitialAnswer(_id)[4] == 0
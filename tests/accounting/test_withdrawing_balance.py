@@ -0,0 +1,46 @@
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+def test_settlements_are_credited_and_withdrawn_together(deploy_client,
+                                                         get_computation_request,
+                                                         deploy_broker_contract,
+                                                         deployed_contracts,
+                                                         get_log_data,
+                                                         deploy_coinbase,
+                                                         denoms):
+    factory = deployed_contracts.BuildByteArrayFactory
+    broker = deploy_broker_contract(factory._meta.address)
+
+    expected = "\x01\x02\x03\x04\x05\x06\x07"
+
+    ids = [
+        get_computation_request(
+            broker, "abcdefg",
+            initial_answer=expected,
+            soft_resolve=True,
+            finalize=True,
+        )
+        for _ in range(3)
+    ]
+
+    deposits = sum(broker.getInitialAnswer(_id)[4] for _id in ids)
+    payments = 3 * 10 * denoms.ether
+
+    assert broker.getBalance(deploy_coinbase) == payments
+
+    deploy_client.wait_for_transaction(broker.reclaimDeposits(ids))
+
+    assert broker.getBalance(deploy_coinbase) == payments + deposits
+    for _id in ids:
+        assert broker.getInitialAnswer(_id)[4] == 0
+
+    withdraw_txn_h = broker.withdraw()
+    deploy_client.wait_for_transaction(withdraw_txn_h)
+
+    withdrawal_data = get_log_data(broker.Withdrawal, withdraw_txn_h)
+
+    assert withdrawal_data['to'] == deploy_coinbase
+    assert withdrawal_data['value'] == payments + deposits
+    assert broker.getBalance(deploy_coinbase) == 0
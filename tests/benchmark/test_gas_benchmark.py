@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from computation_market.benchmark import (
+    GasBenchmark,
+    GasRegression,
+    MissingBaseline,
+    benchmark_key,
+)
+
+
+def test_benchmark_key():
+    assert benchmark_key('finalize') == 'finalize'
+    assert benchmark_key('executeExecutable', n=10, call=0) == 'executeExecutable[call=0,n=10]'
+
+
+def test_regressions_are_detected():
+    benchmark = GasBenchmark(
+        baseline={'finalize[n=1]': 10000, 'answerRequest[n=1]': 10000},
+        threshold=0.01,
+    )
+
+    benchmark.record_and_check('answerRequest', 10100, n=1)
+
+    with pytest.raises(GasRegression):
+        benchmark.record_and_check('finalize', 10101, n=1)
+
+    assert list(benchmark.regressions()) == ['finalize[n=1]']
+
+
+def test_measurements_without_baseline_fail():
+    benchmark = GasBenchmark(baseline={'finalize[n=1]': 10000})
+
+    with pytest.raises(MissingBaseline):
+        benchmark.record_and_check('requestExecution', 99999, n=1)
+
+    # An empty or missing baseline file fails every measurement.
+    with pytest.raises(MissingBaseline):
+        GasBenchmark().record_and_check('finalize', 10000, n=1)
+
+
+def test_measurements_without_baseline_pass_while_recording():
+    benchmark = GasBenchmark(require_baseline=False)
+
+    benchmark.record_and_check('requestExecution', 99999, n=1)
+
+    assert benchmark.results == {'requestExecution[n=1]': 99999}
+
+
+def test_results_round_trip(tmpdir):
+    path = str(tmpdir.join('gas.json'))
+
+    benchmark = GasBenchmark()
+    benchmark.record('finalize', 12345, n=1)
+    benchmark.dump(path)
+
+    assert GasBenchmark.load_baseline(path) == {'finalize[n=1]': 12345}
+    assert json.loads(benchmark.as_json()) == {'finalize[n=1]': 12345}
+    assert GasBenchmark.load_baseline(str(tmpdir.join('missing.json'))) == {}
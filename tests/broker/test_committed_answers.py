@@ -0,0 +1,169 @@
+import pytest
+import sha3
+
+from ethereum.tester import TransactionFailed
+
+
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+def test_soft_resolved_commitment_must_be_revealed(deploy_client,
+                                                   deploy_broker_contract,
+                                                   deployed_contracts,
+                                                   get_computation_request,
+                                                   StatusEnum):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    result = "\x01\x02\x03\x04\x05\x06\x07"
+    result_hash = sha3.sha3_256(result).digest()
+
+    _id = get_computation_request(broker, "abcdefg")
+    deposit_amount = broker.getRequest(_id)[9]
+
+    deploy_client.wait_for_transaction(
+        broker.answerRequestWithHash(_id, result_hash, value=deposit_amount)
+    )
+
+    assert broker.getInitialAnswer(_id)[0] == result_hash
+    assert broker.getInitialAnswerResult(_id) == ''
+
+    deploy_client.wait_for_transaction(broker.softResolveAnswer(_id))
+
+    with pytest.raises(TransactionFailed):
+        broker.finalize(_id)
+
+    with pytest.raises(TransactionFailed):
+        broker.finalize(_id, "wrong")
+
+    deploy_client.wait_for_transaction(broker.finalize(_id, result))
+
+    assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+    assert broker.getRequest(_id)[1] == result_hash
+    assert broker.getRequestResult(_id) == result
+
+
+def test_disputed_commitment_takes_result_from_executable(deploy_client,
+                                                          deploy_broker_contract,
+                                                          deployed_contracts,
+                                                          get_computation_request,
+                                                          StatusEnum):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    result = "\x01\x02\x03\x04\x05\x06\x07"
+
+    _id = get_computation_request(broker, "abcdefg", initial_answer="wrong")
+    deposit_amount = broker.getRequest(_id)[9]
+
+    deploy_client.wait_for_transaction(broker.challengeAnswerWithHash(
+        _id, sha3.sha3_256(result).digest(), value=deposit_amount,
+    ))
+
+    assert broker.getRequest(_id)[5] == StatusEnum.NeedsResolution
+
+    deploy_client.wait_for_transaction(broker.initializeDispute(_id))
+    while broker.getRequest(_id)[5] == StatusEnum.Resolving:
+        deploy_client.wait_for_transaction(broker.executeExecutable(_id, 0))
+
+    deploy_client.wait_for_transaction(broker.finalize(_id))
+
+    assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+    assert broker.getChallengeAnswer(_id)[3] is True
+    assert broker.getChallengeAnswerResult(_id) == result
+    assert broker.getRequestResult(_id) == result
+
+
+def test_unrevealed_commitment_is_forfeited_after_deadline(deploy_client,
+                                                           deploy_broker_contract,
+                                                           deployed_contracts,
+                                                           get_log_data,
+                                                           deploy_coinbase,
+                                                           StatusEnum, denoms):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    request_txn_hash = broker.requestExecution("abcdefg", 10, value=10 * denoms.ether)
+    deploy_client.wait_for_transaction(request_txn_hash)
+    _id = get_log_data(broker.Created, request_txn_hash)['id']
+
+    payment = broker.getRequest(_id)[6]
+    deposit_amount = broker.getRequest(_id)[9]
+
+    deploy_client.wait_for_transaction(broker.answerRequestWithHash(
+        _id, sha3.sha3_256("\x01\x02\x03\x04\x05\x06\x07").digest(), value=deposit_amount,
+    ))
+    soft_res_txn_receipt = deploy_client.wait_for_transaction(broker.softResolveAnswer(_id))
+
+    # The reveal window is never shorter than the default.
+    deadline = broker.getRevealDeadline(_id)
+    assert deadline == int(soft_res_txn_receipt['blockNumber'], 16) + broker.getDefaultSoftResolutionBlocks()
+
+    # The submitter may still reveal.
+    with pytest.raises(TransactionFailed):
+        broker.finalize(_id)
+
+    deploy_client.wait_for_block(deadline)
+
+    balance_before = broker.getBalance(deploy_coinbase)
+    deploy_client.wait_for_transaction(broker.finalize(_id))
+
+    assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+    assert broker.getRequest(_id)[1] == '\x00' * 32
+    assert broker.getInitialAnswer(_id)[4] == 0
+    assert broker.getRevealDeadline(_id) == 0
+    # The requester gets their payment back and the forfeited deposit.
+    assert broker.getBalance(deploy_coinbase) == balance_before + payment + deposit_amount
+
+
+def test_requester_cannot_take_deposit_before_reveal(deploy_client,
+                                                      deploy_broker_contract,
+                                                      deployed_contracts,
+                                                      get_log_data, accounts,
+                                                      StatusEnum, denoms):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    result = "\x01\x02\x03\x04\x05\x06\x07"
+
+    # A request which can be soft resolved straight away.
+    request_txn_hash = broker.requestExecution("abcdefg", 0, value=10 * denoms.ether)
+    deploy_client.wait_for_transaction(request_txn_hash)
+    _id = get_log_data(broker.Created, request_txn_hash)['id']
+
+    payment = broker.getRequest(_id)[6]
+    deposit_amount = broker.getRequest(_id)[9]
+
+    deploy_client.wait_for_transaction(broker.answerRequestWithHash(
+        _id, sha3.sha3_256(result).digest(), value=deposit_amount, _from=accounts[1],
+    ))
+    soft_res_txn_receipt = deploy_client.wait_for_transaction(broker.softResolveAnswer(_id))
+
+    assert broker.getRequest(_id)[5] == StatusEnum.SoftResolution
+    assert broker.getRevealDeadline(_id) == int(soft_res_txn_receipt['blockNumber'], 16) + broker.getDefaultSoftResolutionBlocks()
+
+    # The requester cannot finalize before the submitter has had a chance to
+    # reveal.
+    with pytest.raises(TransactionFailed):
+        broker.finalize(_id)
+
+    deploy_client.wait_for_transaction(broker.finalize(_id, result, _from=accounts[1]))
+
+    assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+    assert broker.getRequestResult(_id) == result
+    assert broker.getBalance(accounts[1]) == payment
+
+
+def test_zero_result_hash_cannot_be_committed(deploy_broker_contract,
+                                              deployed_contracts,
+                                              get_computation_request):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    _id = get_computation_request(broker, "abcdefg")
+    deposit_amount = broker.getRequest(_id)[9]
+
+    with pytest.raises(TransactionFailed):
+        broker.answerRequestWithHash(_id, '\x00' * 32, value=deposit_amount)
+
+    _id = get_computation_request(broker, "abcdefg", initial_answer="wrong")
+
+    with pytest.raises(TransactionFailed):
+        broker.challengeAnswerWithHash(_id, '\x00' * 32, value=deposit_amount)
@@ -0,0 +1,57 @@
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+def test_executing_several_disputes_in_one_transaction(deploy_client,
+                                                       deploy_broker_contract,
+                                                       deployed_contracts,
+                                                       get_computation_request,
+                                                       get_log_data,
+                                                       StatusEnum):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    ids = [
+        get_computation_request(
+            broker, args, initial_answer="wrong", challenge_answer="also-wrong",
+            initialize_dispute=True,
+        )
+        for args in ("abc", "abcd", "abcde")
+    ]
+
+    for _id in ids:
+        assert broker.getRequest(_id)[5] == StatusEnum.Resolving
+
+    txn_hash = broker.executeExecutables(ids, [0, 0, 0])
+    deploy_client.wait_for_transaction(txn_hash)
+
+    for _id in ids:
+        assert broker.getRequest(_id)[5] == StatusEnum.FirmResolution
+        # Each request was charged from its own fund.
+        assert broker.getRequest(_id)[8] > 0
+
+    execution_data = get_log_data(broker.Execution, txn_hash)
+    assert [data['id'] for data in execution_data] == ids
+    assert all(data['isFinished'] for data in execution_data)
+
+
+def test_executing_many_skips_requests_not_resolving(deploy_client,
+                                                     deploy_broker_contract,
+                                                     deployed_contracts,
+                                                     get_computation_request,
+                                                     StatusEnum):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    resolving_id = get_computation_request(
+        broker, "abcdefg", initial_answer="wrong", challenge_answer="also-wrong",
+        initialize_dispute=True,
+    )
+    pending_id = get_computation_request(broker, "abc")
+
+    deploy_client.wait_for_transaction(
+        broker.executeExecutables([pending_id, resolving_id], [0, 0])
+    )
+
+    assert broker.getRequest(pending_id)[5] == StatusEnum.Pending
+    assert broker.getRequest(pending_id)[8] == 0
+    assert broker.getRequest(resolving_id)[5] == StatusEnum.FirmResolution
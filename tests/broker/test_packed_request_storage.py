@@ -0,0 +1,56 @@
+import pytest
+
+from ethereum.tester import TransactionFailed
+
+
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+def test_packed_values_round_trip(deploy_client, deploy_broker_contract,
+                                  deployed_contracts, get_log_data,
+                                  deploy_coinbase, StatusEnum, denoms,
+                                  accounts):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    soft_resolution_blocks = 2 ** 64 - 1
+
+    request_txn_hash = broker.requestExecution(
+        "abcdefg", soft_resolution_blocks, value=10 * denoms.ether,
+    )
+    request_txn_receipt = deploy_client.wait_for_transaction(request_txn_hash)
+    _id = get_log_data(broker.Created, request_txn_hash)['id']
+
+    deposit_amount = broker.getRequest(_id)[9]
+
+    answer_txn_hash = broker.answerRequest(_id, "answer", value=deposit_amount)
+    answer_txn_receipt = deploy_client.wait_for_transaction(answer_txn_hash)
+
+    req_data = broker.getRequest(_id)
+
+    assert req_data[2] == deploy_coinbase
+    assert req_data[4] == int(request_txn_receipt['blockNumber'], 16)
+    assert req_data[5] == StatusEnum.WaitingForResolution
+    assert req_data[6] == 10 * denoms.ether
+    assert req_data[7] == soft_resolution_blocks
+
+    answer_data = broker.getInitialAnswer(_id)
+
+    assert answer_data[1] == deploy_coinbase
+    assert answer_data[2] == int(answer_txn_receipt['blockNumber'], 16)
+    assert answer_data[3] is False
+    assert answer_data[4] == deposit_amount
+
+    # `creationBlock + softResolutionBlocks` must not overflow into a value
+    # which allows early resolution.
+    with pytest.raises(TransactionFailed):
+        broker.softResolveAnswer(_id, _from=accounts[1])
+
+
+def test_soft_resolution_blocks_must_fit(deploy_broker_contract,
+                                         deployed_contracts, denoms):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    with pytest.raises(TransactionFailed):
+        broker.requestExecution("abcdefg", 2 ** 64, value=10 * denoms.ether)
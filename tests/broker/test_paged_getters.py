@@ -0,0 +1,52 @@
+from computation_market.pages import (
+    decode_request_page,
+    decode_answer_page,
+    iter_requests,
+)
+
+
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+def test_paged_getters(deploy_client, deploy_broker_contract,
+                       deployed_contracts, get_computation_request,
+                       StatusEnum):
+    factory = deployed_contracts.BuildByteArrayFactory
+    broker = deploy_broker_contract(factory._meta.address)
+
+    expected = "\x01\x02\x03\x04\x05\x06\x07"
+
+    id_a = get_computation_request(broker, "abcdefg")
+    id_b = get_computation_request(broker, "abcdefg", initial_answer=expected)
+    id_c = get_computation_request(
+        broker, "abcdefg",
+        initial_answer="wrong",
+        challenge_answer=expected,
+    )
+
+    requests = decode_request_page(broker.getRequests(id_a, 10), id_a)
+
+    assert [r.id for r in requests] == [id_a, id_b, id_c]
+    assert [r.status for r in requests] == [
+        StatusEnum.Pending,
+        StatusEnum.WaitingForResolution,
+        StatusEnum.NeedsResolution,
+    ]
+    for request in requests:
+        assert tuple(request[1:]) == tuple(broker.getRequest(request.id))
+
+    initial_answers = decode_answer_page(broker.getInitialAnswers(id_b, 2), id_b)
+    challenge_answers = decode_answer_page(broker.getChallengeAnswers(id_b, 2), id_b)
+
+    assert tuple(initial_answers[0][1:]) == tuple(broker.getInitialAnswer(id_b))
+    assert tuple(initial_answers[1][1:]) == tuple(broker.getInitialAnswer(id_c))
+    assert tuple(challenge_answers[1][1:]) == tuple(broker.getChallengeAnswer(id_c))
+    assert challenge_answers[0].depositAmount == 0
+
+    # Out of range pages are empty.
+    assert broker.getRequests(0, 10) == []
+    assert broker.getRequests(id_c + 1, 10) == []
+
+    assert [r.id for r in iter_requests(broker, page_size=2)] == [id_a, id_b, id_c]
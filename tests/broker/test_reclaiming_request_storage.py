@@ -0,0 +1,38 @@
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+def test_storage_is_cleared_once_deposits_are_reclaimed(deploy_client,
+                                                        deploy_broker_contract,
+                                                        deployed_contracts,
+                                                        get_computation_request,
+                                                        StatusEnum):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    expected = "\x01\x02\x03\x04\x05\x06\x07"
+
+    _id = get_computation_request(
+        broker, "abcdefg",
+        initial_answer="wrong",
+        challenge_answer=expected,
+        initialize_dispute=True,
+        perform_execution=True,
+        finalize=True,
+    )
+
+    assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+
+    # Nothing is cleared while a deposit is still held.
+    assert broker.getRequestArgs(_id) == "abcdefg"
+    assert broker.getInitialAnswerResult(_id) == "wrong"
+
+    deploy_client.wait_for_transaction(broker.reclaimDeposit(_id))
+
+    assert broker.getRequestArgs(_id) == ""
+    assert broker.getInitialAnswerResult(_id) == ""
+
+    # The hashes and the result are kept.
+    assert broker.getRequest(_id)[0] != "\x00" * 32
+    assert broker.getInitialAnswer(_id)[0] != "\x00" * 32
+    assert broker.getRequestResult(_id) == expected
@@ -0,0 +1,82 @@
+import pytest
+import sha3
+
+from ethereum.tester import TransactionFailed
+
+
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+def test_requesting_with_logged_args(deploy_client, deploy_broker_contract,
+                                     deployed_contracts, get_log_data,
+                                     StatusEnum, denoms):
+    factory = deployed_contracts.BuildByteArrayFactory
+    broker = deploy_broker_contract(factory._meta.address)
+
+    args = "abcdefg"
+    expected = "\x01\x02\x03\x04\x05\x06\x07"
+
+    request_txn_hash = broker.requestExecutionWithLoggedArgs(args, value=10 * denoms.ether)
+    deploy_client.wait_for_transaction(request_txn_hash)
+
+    _id = get_log_data(broker.Created, request_txn_hash)['id']
+    args_log_data = get_log_data(broker.ArgsLogged, request_txn_hash)
+
+    assert args_log_data['id'] == _id
+    assert args_log_data['args'] == args
+    assert broker.getRequest(_id)[0] == sha3.sha3_256(args).digest()
+    assert broker.getRequestArgs(_id) == ''
+    assert broker.isArgsLogged(_id) is True
+
+    deposit_amount = broker.getRequest(_id)[9]
+
+    deploy_client.wait_for_transaction(
+        broker.answerRequest(_id, "wrong", value=deposit_amount)
+    )
+    deploy_client.wait_for_transaction(
+        broker.challengeAnswer(_id, expected, value=deposit_amount)
+    )
+
+    # The args are not in storage so they must be supplied.
+    with pytest.raises(TransactionFailed):
+        broker.initializeDispute(_id)
+
+    # And they must match the hash of the original args.
+    with pytest.raises(TransactionFailed):
+        broker.initializeDispute(_id, "abcdefh")
+
+    i_dispute_txn_hash = broker.initializeDispute(_id, args)
+    deploy_client.wait_for_transaction(i_dispute_txn_hash)
+
+    assert broker.getRequest(_id)[5] == StatusEnum.Resolving
+    assert get_log_data(factory.Constructed, i_dispute_txn_hash)['argsHash'] == sha3.sha3_256(args).digest()
+
+    while broker.getRequest(_id)[5] == StatusEnum.Resolving:
+        deploy_client.wait_for_transaction(broker.executeExecutable(_id, 0))
+
+    deploy_client.wait_for_transaction(broker.finalize(_id))
+
+    assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+    assert broker.getRequestResult(_id) == expected
+
+
+def test_logged_args_request_uses_less_gas(deploy_client, deploy_broker_contract,
+                                           deployed_contracts, denoms):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    args = "a" * 500
+
+    stored_receipt = deploy_client.wait_for_transaction(
+        broker.requestExecution(args, value=10 * denoms.ether)
+    )
+    logged_receipt = deploy_client.wait_for_transaction(
+        broker.requestExecutionWithLoggedArgs(args, value=10 * denoms.ether)
+    )
+
+    stored_gas = int(stored_receipt['gasUsed'], 16)
+    logged_gas = int(logged_receipt['gasUsed'], 16)
+
+    # 16 words of args are no longer written to storage.
+    assert stored_gas - logged_gas > 16 * 15000
@@ -0,0 +1,111 @@
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+def test_disputes_over_same_args_share_executable(deploy_client,
+                                                  deploy_broker_contract,
+                                                  deployed_contracts,
+                                                  get_computation_request,
+                                                  StatusEnum):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    expected = "\x01\x02\x03\x04\x05\x06\x07"
+
+    id_a = get_computation_request(
+        broker, "abcdefg", initial_answer="wrong", challenge_answer=expected,
+        initialize_dispute=True,
+    )
+    id_b = get_computation_request(
+        broker, "abcdefg", initial_answer=expected, challenge_answer="wrong",
+        initialize_dispute=True,
+    )
+
+    executable = broker.getRequest(id_a)[3]
+    assert broker.getRequest(id_b)[3] == executable
+    assert set(broker.getSharedRequests(broker.getRequest(id_a)[0])) == {id_a, id_b}
+
+    while broker.getRequest(id_a)[5] == StatusEnum.Resolving:
+        deploy_client.wait_for_transaction(broker.executeExecutable(id_a, 0))
+
+    # Running the executable for one request resolves both.
+    assert broker.getRequest(id_a)[5] == StatusEnum.FirmResolution
+    assert broker.getRequest(id_b)[5] == StatusEnum.FirmResolution
+
+    # The cost of execution is split between the requests.
+    assert broker.getRequest(id_a)[8] > 0
+    assert broker.getRequest(id_b)[8] > 0
+
+    deploy_client.wait_for_transaction(broker.finalize(id_a))
+    deploy_client.wait_for_transaction(broker.finalize(id_b))
+
+    assert broker.getRequestResult(id_a) == expected
+    assert broker.getRequestResult(id_b) == expected
+    assert broker.getSharedRequests(broker.getRequest(id_a)[0]) == []
+
+
+def test_dispute_on_finished_executable_is_resolved_immediately(deploy_client,
+                                                                deploy_broker_contract,
+                                                                deployed_contracts,
+                                                                get_computation_request,
+                                                                StatusEnum):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    expected = "\x01\x02\x03\x04\x05\x06\x07"
+
+    id_a = get_computation_request(
+        broker, "abcdefg", initial_answer="wrong", challenge_answer=expected,
+        initialize_dispute=True,
+    )
+    id_b = get_computation_request(
+        broker, "abcdefg", initial_answer="wrong", challenge_answer=expected,
+    )
+
+    while broker.getRequest(id_a)[5] == StatusEnum.Resolving:
+        deploy_client.wait_for_transaction(broker.executeExecutable(id_a, 0))
+
+    deploy_client.wait_for_transaction(broker.initializeDispute(id_b))
+
+    assert broker.getRequest(id_b)[3] == broker.getRequest(id_a)[3]
+    assert broker.getRequest(id_b)[5] == StatusEnum.FirmResolution
+    assert broker.getRequest(id_b)[8] == 0
+
+    deploy_client.wait_for_transaction(broker.finalize(id_b))
+    assert broker.getRequestResult(id_b) == expected
+
+
+def test_shared_executable_is_capped(deploy_client, deploy_broker_contract,
+                                     deployed_contracts, get_computation_request,
+                                     StatusEnum):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    max_shared = broker.getMaxSharedRequests()
+
+    ids = [
+        get_computation_request(
+            broker, "abcdefg", initial_answer="wrong", challenge_answer="also-wrong",
+            initialize_dispute=True,
+        )
+        for _ in range(max_shared + 1)
+    ]
+    args_hash = broker.getRequest(ids[0])[0]
+
+    executable = broker.getRequest(ids[0])[3]
+    assert all(broker.getRequest(_id)[3] == executable for _id in ids[:max_shared])
+
+    # The dispute past the cap gets its own executable, which later disputes
+    # would join.
+    overflow_executable = broker.getRequest(ids[-1])[3]
+    assert overflow_executable != executable
+    assert broker.getSharedRequests(args_hash) == [ids[-1]]
+
+    overflow_gas_reimbursements = broker.getRequest(ids[-1])[8]
+
+    while broker.getRequest(ids[0])[5] == StatusEnum.Resolving:
+        deploy_client.wait_for_transaction(broker.executeExecutable(ids[0], 0))
+
+    assert all(broker.getRequest(_id)[5] == StatusEnum.FirmResolution for _id in ids[:max_shared])
+    # The overflow request is neither resolved nor charged by the execution
+    # of the full executable.
+    assert broker.getRequest(ids[-1])[5] == StatusEnum.Resolving
+    assert broker.getRequest(ids[-1])[8] == overflow_gas_reimbursements
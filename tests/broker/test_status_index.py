@@ -0,0 +1,61 @@
+import pytest
+
+from ethereum.tester import TransactionFailed
+
+
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+def test_status_index_tracks_transitions(deploy_client, deploy_broker_contract,
+                                         deployed_contracts,
+                                         get_computation_request, StatusEnum):
+    factory = deployed_contracts.BuildByteArrayFactory
+    broker = deploy_broker_contract(factory._meta.address)
+
+    expected = "\x01\x02\x03\x04\x05\x06\x07"
+
+    id_a = get_computation_request(broker, "abcdefg")
+    id_b = get_computation_request(broker, "abcdefg")
+    id_c = get_computation_request(broker, "abcdefg")
+    id_d = get_computation_request(broker, "abcdefg", initial_answer=expected)
+    id_e = get_computation_request(
+        broker, "abcdefg",
+        initial_answer="wrong",
+        challenge_answer=expected,
+    )
+
+    assert broker.getStatusCount(StatusEnum.Pending) == 3
+    assert broker.getStatusPage(StatusEnum.Pending, 0, 10) == [id_a, id_b, id_c]
+    assert broker.getStatusPage(StatusEnum.WaitingForResolution, 0, 10) == [id_d]
+    assert broker.getStatusPage(StatusEnum.NeedsResolution, 0, 10) == [id_e]
+
+    # Paging
+    assert broker.getStatusPage(StatusEnum.Pending, 0, 2) == [id_a, id_b]
+    assert broker.getStatusPage(StatusEnum.Pending, id_b, 2) == [id_c]
+
+    # Removing from the middle of the list.
+    deploy_client.wait_for_transaction(broker.cancelRequest(id_b))
+
+    assert broker.getStatusCount(StatusEnum.Pending) == 2
+    assert broker.getStatusPage(StatusEnum.Pending, 0, 10) == [id_a, id_c]
+
+    # Terminal statuses are not tracked.
+    assert broker.getStatusCount(StatusEnum.Cancelled) == 0
+
+    with pytest.raises(TransactionFailed):
+        broker.getStatusPage(StatusEnum.Pending, id_b, 10)
+
+    # Moving between statuses.
+    deploy_client.wait_for_transaction(broker.answerRequest(
+        id_a, expected, value=broker.getRequest(id_a)[9],
+    ))
+
+    assert broker.getStatusPage(StatusEnum.Pending, 0, 10) == [id_c]
+    assert broker.getStatusPage(StatusEnum.WaitingForResolution, 0, 10) == [id_d, id_a]
+
+    deploy_client.wait_for_transaction(broker.initializeDispute(id_e))
+
+    assert broker.getStatusCount(StatusEnum.NeedsResolution) == 0
+    assert broker.getStatusPage(StatusEnum.Resolving, 0, 10) == [id_e]
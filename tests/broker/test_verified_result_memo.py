@@ -0,0 +1,132 @@
+import pytest
+import sha3
+
+from ethereum.tester import TransactionFailed
+
+
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+def test_verified_result_settles_later_dispute(deploy_client,
+                                               deploy_broker_contract,
+                                               deployed_contracts,
+                                               get_computation_request,
+                                               StatusEnum):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    expected = "\x01\x02\x03\x04\x05\x06\x07"
+
+    id_a = get_computation_request(
+        broker, "abcdefg", initial_answer="wrong", challenge_answer=expected,
+        initialize_dispute=True, perform_execution=True, finalize=True,
+    )
+    args_hash = broker.getRequest(id_a)[0]
+    assert broker.getVerifiedResultHash(args_hash) == broker.getRequest(id_a)[1]
+
+    id_b = get_computation_request(
+        broker, "abcdefg", initial_answer="wrong", challenge_answer=expected,
+        initialize_dispute=True,
+    )
+
+    # No executable is needed to settle the dispute.
+    assert broker.getRequest(id_b)[3] == '0x0000000000000000000000000000000000000000'
+    assert broker.getRequest(id_b)[5] == StatusEnum.FirmResolution
+
+    deploy_client.wait_for_transaction(broker.finalize(id_b))
+
+    assert broker.getRequest(id_b)[5] == StatusEnum.Finalized
+    assert broker.getChallengeAnswer(id_b)[3] is True
+    assert broker.getRequestResult(id_b) == expected
+
+
+def test_dispute_settled_by_verified_result_is_charged_to_wrong_answer(deploy_client,
+                                                                       deploy_broker_contract,
+                                                                       deployed_contracts,
+                                                                       get_computation_request,
+                                                                       get_log_data,
+                                                                       StatusEnum, accounts):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    expected = "\x01\x02\x03\x04\x05\x06\x07"
+
+    get_computation_request(
+        broker, "abcdefg", initial_answer="wrong", challenge_answer=expected,
+        initialize_dispute=True, perform_execution=True, finalize=True,
+    )
+
+    _id = get_computation_request(broker, "abcdefg")
+    deposit_amount = broker.getRequest(_id)[9]
+
+    deploy_client.wait_for_transaction(
+        broker.answerRequest(_id, "wrong", value=deposit_amount, _from=accounts[1])
+    )
+    deploy_client.wait_for_transaction(
+        broker.challengeAnswer(_id, expected, value=deposit_amount)
+    )
+
+    i_dispute_txn_hash = broker.initializeDispute(_id, _from=accounts[2])
+    deploy_client.wait_for_transaction(i_dispute_txn_hash)
+
+    assert broker.getRequest(_id)[5] == StatusEnum.FirmResolution
+
+    # The caller is reimbursed from the dispute's gas fund.
+    gas_reimbursement = get_log_data(broker.GasReimbursement, i_dispute_txn_hash)['value']
+    assert gas_reimbursement > 0
+    assert broker.getBalance(accounts[2]) == gas_reimbursement
+    assert broker.getRequest(_id)[8] == gas_reimbursement
+
+    deploy_client.wait_for_transaction(broker.finalize(_id))
+    deploy_client.wait_for_transaction(broker.reclaimDeposit(_id, _from=accounts[1]))
+
+    # ...which is taken out of the wrong answer's deposit.
+    assert broker.getBalance(accounts[1]) == deposit_amount - gas_reimbursement
+
+
+def test_answer_matching_verified_result_soft_resolves_immediately(deploy_client,
+                                                                   deploy_broker_contract,
+                                                                   deployed_contracts,
+                                                                   get_computation_request,
+                                                                   StatusEnum, accounts):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    expected = "\x01\x02\x03\x04\x05\x06\x07"
+
+    get_computation_request(
+        broker, "abcdefg", initial_answer="wrong", challenge_answer=expected,
+        initialize_dispute=True, perform_execution=True, finalize=True,
+    )
+
+    _id = get_computation_request(broker, "abcdefg", initial_answer=expected)
+
+    deploy_client.wait_for_transaction(broker.softResolveAnswer(_id, _from=accounts[1]))
+    assert broker.getRequest(_id)[5] == StatusEnum.SoftResolution
+
+
+def test_committed_answer_without_verified_result_waits(deploy_client,
+                                                        deploy_broker_contract,
+                                                        deployed_contracts,
+                                                        get_computation_request,
+                                                        StatusEnum, accounts):
+    broker = deploy_broker_contract(deployed_contracts.BuildByteArrayFactory._meta.address)
+
+    _id = get_computation_request(broker, "abcdefg")
+    args_hash = broker.getRequest(_id)[0]
+    deposit_amount = broker.getRequest(_id)[9]
+
+    assert broker.getVerifiedResultHash(args_hash) == '\x00' * 32
+
+    # An unset verified result must not match any answer, including one
+    # committed as 0x0.
+    with pytest.raises(TransactionFailed):
+        broker.answerRequestWithHash(_id, '\x00' * 32, value=deposit_amount)
+
+    deploy_client.wait_for_transaction(broker.answerRequestWithHash(
+        _id, sha3.sha3_256("\x01\x02\x03\x04\x05\x06\x07").digest(), value=deposit_amount,
+    ))
+
+    with pytest.raises(TransactionFailed):
+        broker.softResolveAnswer(_id, _from=accounts[1])
+
+    assert broker.getRequest(_id)[5] == StatusEnum.WaitingForResolution
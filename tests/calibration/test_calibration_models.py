@@ -0,0 +1,77 @@
+import pytest
+
+from computation_market.calibration import (
+    intrinsic_gas,
+    fit_linear,
+    upper_bound_linear,
+    calibrate_build_byte_array,
+    calibrate_fibonacci,
+    build_byte_array_total_gas,
+    fibonacci_total_gas,
+    as_solidity,
+)
+
+
+def test_intrinsic_gas():
+    assert intrinsic_gas(b'') == 21000
+    assert intrinsic_gas(b'\x00\x01') == 21000 + 4 + 68
+
+
+def test_fit_linear():
+    intercept, slope = fit_linear([(x, 100 + 3 * x) for x in range(10)])
+
+    assert intercept == pytest.approx(100)
+    assert slope == pytest.approx(3)
+
+
+def test_upper_bound_covers_every_point():
+    points = [(1, 10), (2, 30), (3, 20), (4, 45)]
+
+    intercept, slope = upper_bound_linear(points)
+
+    assert all(intercept + slope * x >= y - 1e-9 for x, y in points)
+
+
+def test_build_byte_array_calibration():
+    measurements = [(step, 40000 + 250 * step + (step % 3) * 10) for step in range(1, 501)]
+
+    calibration = calibrate_build_byte_array(measurements, margin=0)
+
+    for length in (1, 10, 100, 500):
+        actual = sum(gas for step, gas in measurements[:length])
+        estimate = build_byte_array_total_gas(calibration.constants, length)
+        assert actual <= estimate < actual * 1.01
+
+    assert as_solidity(calibration).splitlines() == [
+        '    int constant STEP_GAS = {0};'.format(dict(calibration.constants)['STEP_GAS']),
+        '    int constant STEP_GAS_PER_BYTE = {0};'.format(
+            dict(calibration.constants)['STEP_GAS_PER_BYTE'],
+        ),
+    ]
+
+
+def test_fibonacci_calibration():
+    def step_gas(n, step):
+        if step == n + 1:
+            return 30000
+        elif step == 1:
+            return 50000
+        return 40000 + step
+
+    measurements = [
+        (n, step, step_gas(n, step))
+        for n in (0, 1, 5, 20)
+        for step in range(1, n + 2)
+    ]
+
+    calibration = calibrate_fibonacci(measurements, margin=0.05)
+
+    assert dict(calibration.constants) == {
+        'STEP_1_GAS': 52500,
+        'STEP_N_GAS': 42021,
+        'STEP_LAST_GAS': 31500,
+    }
+
+    for n in (0, 1, 5, 20):
+        actual = sum(step_gas(n, step) for step in range(1, n + 2))
+        assert fibonacci_total_gas(calibration.constants, n) >= actual
@@ -0,0 +1,75 @@
+import binascii
+
+import pytest
+
+from computation_market.commitments import (
+    CommitmentStore,
+    encode_commit_call,
+    encode_reveal_call,
+)
+from computation_market.utils import (
+    sha3,
+    function_selector,
+    encode_uint,
+    decode_dynamic_bytes,
+)
+
+
+BROKER = '0x' + 'AB' * 20
+
+
+def test_commitment_lifecycle():
+    store = CommitmentStore()
+
+    result = b'\x01\x02\x03' * 500
+    result_hash = store.commit(BROKER, 1, result)
+    store.commit(BROKER, 2, b'challenge', is_challenge=True)
+
+    assert result_hash == sha3(result)
+
+    commitment = store.get(BROKER.lower(), 1)
+    assert commitment['result'] == result
+    assert commitment['result_hash'] == '0x' + binascii.hexlify(result_hash).decode('ascii')
+    assert commitment['is_challenge'] is False
+    assert [c['request_id'] for c in store.unrevealed()] == [1, 2]
+
+    store.mark_revealed(BROKER, 1)
+
+    assert [c['request_id'] for c in store.unrevealed(BROKER)] == [2]
+    assert store.get_result(BROKER, 1) == result
+
+    store.discard(BROKER, 2)
+
+    assert store.unrevealed() == []
+    with pytest.raises(KeyError):
+        store.get(BROKER, 2)
+    with pytest.raises(KeyError):
+        store.mark_revealed(BROKER, 2)
+
+
+def test_commitments_persist(tmpdir):
+    database = str(tmpdir.join('commitments.db'))
+
+    CommitmentStore(database).commit(BROKER, 7, b'result')
+
+    assert CommitmentStore(database).get_result(BROKER, 7) == b'result'
+
+
+def test_encoding_calls():
+    result = b'abc' * 20
+    result_hash = sha3(result)
+
+    assert encode_commit_call(3, result_hash) == (
+        function_selector('answerRequestWithHash(uint256,bytes32)') +
+        encode_uint(3) + result_hash
+    )
+    assert encode_commit_call(3, result_hash, is_challenge=True)[:4] == (
+        function_selector('challengeAnswerWithHash(uint256,bytes32)')
+    )
+
+    data = encode_reveal_call(3, result)
+
+    assert data[:4] == function_selector('finalize(uint256,bytes)')
+    assert data[4:36] == encode_uint(3)
+    assert decode_dynamic_bytes(data[4:], 1) == result
+    assert len(data) % 32 == 4
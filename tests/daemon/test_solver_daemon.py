@@ -0,0 +1,226 @@
+import binascii
+
+from computation_market.broker import Status, EVENT_NAMES
+from computation_market.daemon import (
+    SolverDaemon,
+    GET_REQUEST_SELECTOR,
+    GET_REQUEST_ARGS_SELECTOR,
+    ANSWER_REQUEST_SELECTOR,
+)
+from computation_market.solvers import int_to_bytes
+from computation_market.utils import (
+    sha3,
+    encode_hex,
+    decode_hex,
+    encode_uint,
+    encode_bytes,
+    decode_uint,
+    decode_dynamic_bytes,
+)
+
+
+FIB_BROKER = '0x' + '11' * 20
+BYTES_BROKER = '0x' + '22' * 20
+DEPOSIT = 12345
+
+
+def word(value):
+    if isinstance(value, bytes):
+        return value.rjust(32, b'\x00')
+    return encode_uint(value)
+
+
+def make_log(address, block_number, name, values):
+    return {
+        'address': address,
+        'blockNumber': hex(block_number),
+        'logIndex': hex(0),
+        'topics': [EVENT_NAMES[name]],
+        'data': encode_hex(b''.join(word(v) for v in values)),
+    }
+
+
+class FakeBrokerClient(object):
+    """
+    Mines one block per request created or transaction sent.
+    """
+    def __init__(self):
+        self.block_number = 0
+        self.logs = []
+        self.requests = {}
+        self.answers = []
+        self.receipts = {}
+
+    def create(self, broker, request_id, args):
+        self.block_number += 1
+        self.requests[(broker, request_id)] = {'args': args, 'status': Status.Pending}
+        self.logs.append(make_log(broker, self.block_number, 'Created', (request_id, sha3(args))))
+
+    def get_block_number(self):
+        return self.block_number
+
+    def get_logs(self, address, topics, from_block, to_block):
+        return [
+            log for log in self.logs
+            if log['address'] == address and
+            log['topics'][0] in topics[0] and
+            from_block <= int(log['blockNumber'], 16) <= to_block
+        ]
+
+    def call(self, to, data, **kwargs):
+        data = decode_hex(data)
+        request = self.requests[(to, decode_uint(data[4:]))]
+        if data[:4] == GET_REQUEST_SELECTOR:
+            values = [sha3(request['args'])] + [0] * 9
+            values[5] = request['status']
+            values[9] = DEPOSIT
+            return encode_hex(b''.join(word(v) for v in values))
+        elif data[:4] == GET_REQUEST_ARGS_SELECTOR:
+            return encode_hex(encode_uint(32) + encode_bytes(request['args']))
+        raise ValueError("Unknown call")
+
+    def send_transaction(self, to, data, value=0, **kwargs):
+        self.block_number += 1
+        data = decode_hex(data)
+        assert data[:4] == ANSWER_REQUEST_SELECTOR
+
+        request_id = decode_uint(data[4:])
+        result = decode_dynamic_bytes(data[4:], 1)
+        request = self.requests[(to, request_id)]
+
+        logs = []
+        if request['status'] == Status.Pending and value >= DEPOSIT:
+            request['status'] = Status.WaitingForResolution
+            self.answers.append((to, request_id, result, value))
+            logs.append(make_log(to, self.block_number, 'AnswerSubmitted', (request_id, sha3(result), 0)))
+
+        txn_hash = '0x{0:064x}'.format(self.block_number)
+        self.receipts[txn_hash] = {'blockNumber': hex(self.block_number), 'logs': logs}
+        return txn_hash
+
+    def get_transaction_receipt(self, txn_hash):
+        return self.receipts.get(txn_hash)
+
+
+class FakeResult(object):
+    def __init__(self, value, is_ready):
+        self.value = value
+        self.is_ready = is_ready
+
+    def ready(self):
+        return self.is_ready
+
+    def get(self):
+        return self.value
+
+
+class FakePool(object):
+    """
+    Computes in the calling process.  Results are held back from the daemon
+    until `release` is called if `hold` is set.
+    """
+    def __init__(self, hold=False):
+        self.hold = hold
+        self.results = []
+
+    def apply_async(self, func, args):
+        result = FakeResult(func(*args), not self.hold)
+        self.results.append(result)
+        return result
+
+    def release(self):
+        for result in self.results:
+            result.is_ready = True
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+
+def make_daemon(client, pool, **kwargs):
+    return SolverDaemon(
+        client,
+        {FIB_BROKER: 'FibonacciFactory', BYTES_BROKER: 'BuildByteArrayFactory'},
+        pool=pool,
+        **kwargs
+    )
+
+
+def test_daemon_answers_new_requests():
+    client = FakeBrokerClient()
+    client.create(FIB_BROKER, 1, int_to_bytes(10))
+    client.create(BYTES_BROKER, 1, b'abc')
+
+    daemon = make_daemon(client, FakePool(), max_in_flight=4)
+
+    daemon.run_once()
+    assert len(daemon.computing) == 2
+
+    daemon.run_once()
+    assert sorted(client.answers) == sorted([
+        (FIB_BROKER, 1, int_to_bytes(89), DEPOSIT),
+        (BYTES_BROKER, 1, b'\x01\x02\x03', DEPOSIT),
+    ])
+
+    daemon.run_once()
+    summary = daemon.metrics.summary()
+    assert summary['answered'] == 2
+    assert summary['queue_depth'] == 0
+    assert summary['compute_latency']['count'] == 2
+    assert summary['submit_latency']['count'] == 2
+    assert summary['answer_latency_blocks']['max'] <= 4
+
+
+def test_daemon_skips_requests_answered_elsewhere():
+    client = FakeBrokerClient()
+    client.create(FIB_BROKER, 1, int_to_bytes(5))
+    client.requests[(FIB_BROKER, 1)]['status'] = Status.WaitingForResolution
+
+    daemon = make_daemon(client, FakePool())
+    daemon.run_once()
+
+    assert daemon.computing == {}
+    assert daemon.metrics.summary()['skipped'] == 1
+
+
+def test_daemon_limits_concurrency_per_factory():
+    client = FakeBrokerClient()
+    for request_id in (1, 2, 3):
+        client.create(FIB_BROKER, request_id, int_to_bytes(request_id))
+    client.create(BYTES_BROKER, 1, b'abc')
+
+    pool = FakePool(hold=True)
+    daemon = make_daemon(
+        client, pool, max_in_flight=4, factory_limits={'FibonacciFactory': 1},
+    )
+    daemon.run_once()
+
+    assert sorted(daemon.computing) == [(FIB_BROKER, 1), (BYTES_BROKER, 1)]
+    assert [queued.request_id for queued in daemon.queue] == [2, 3]
+
+    pool.release()
+    daemon.run_once()
+
+    assert sorted(daemon.computing) == [(FIB_BROKER, 2)]
+    assert len(client.answers) == 2
+
+
+def test_daemon_stops_polling_when_queue_is_full():
+    client = FakeBrokerClient()
+    client.create(FIB_BROKER, 1, int_to_bytes(5))
+    client.create(FIB_BROKER, 2, int_to_bytes(6))
+
+    pool = FakePool(hold=True)
+    daemon = make_daemon(client, pool, max_in_flight=1, max_queue=1)
+    daemon.run_once()
+
+    assert len(daemon.queue) == 1
+
+    client.create(FIB_BROKER, 3, int_to_bytes(7))
+    daemon.run_once()
+
+    # Nothing new is read from the chain until the queue drains.
+    assert [queued.request_id for queued in daemon.queue] == [2]
+    assert daemon.metrics.summary()['polls_paused'] == 1
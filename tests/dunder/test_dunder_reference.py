@@ -0,0 +1,84 @@
+import pytest
+
+
+deploy_contracts = [
+    "TestDunder",
+    "TestDunderReference",
+]
+
+
+VALUES = (
+    0,
+    1,
+    255,
+    256,
+    65535,
+    65536,
+    514229,
+    2 ** 64 - 1,
+    2 ** 64,
+    2 ** 128 + 1,
+    2 ** 200 + 12345,
+    2 ** 248 - 1,
+)
+
+
+@pytest.mark.parametrize("uint_v", VALUES)
+def test_to_bytes_matches_reference(deployed_contracts, uint_v):
+    dunder = deployed_contracts.TestDunder
+    reference = deployed_contracts.TestDunderReference
+
+    assert dunder.toBytes(uint_v) == reference.toBytes(uint_v)
+
+
+@pytest.mark.parametrize(
+    "bytes_v",
+    (
+        "",
+        "\x01",
+        "\x00\x01",
+        "abcdefghij",
+        "\xff" * 31,
+        "\xff" * 32,
+        "\x01" * 32 + "\x02" * 8,
+    ),
+)
+def test_to_uint_matches_reference(deployed_contracts, bytes_v):
+    dunder = deployed_contracts.TestDunder
+    reference = deployed_contracts.TestDunderReference
+
+    expected = reference.toUInt(bytes_v)
+
+    assert dunder.toUInt(bytes_v) == expected
+    assert dunder.internalToUInt(bytes_v) == expected
+
+
+@pytest.mark.parametrize(
+    "start_idx,end_idx",
+    (
+        (0, 1),
+        (0, 31),
+        (32, 63),
+        (5, 40),
+        (0, 63),
+    ),
+)
+def test_extract_uint_matches_reference(deployed_contracts, start_idx, end_idx):
+    dunder = deployed_contracts.TestDunder
+    reference = deployed_contracts.TestDunderReference
+
+    bytes_v = ''.join(chr(i) for i in range(1, 65))
+    expected = reference.extractUint(bytes_v, start_idx, end_idx)
+
+    assert dunder.extractUint(bytes_v, start_idx, end_idx) == expected
+    assert dunder.internalExtractUint(bytes_v, start_idx, end_idx) == expected
+
+
+def test_to_bytes_handles_large_values(deployed_contracts):
+    # The reference implementation never terminates for values of 2 ** 248
+    # or more since `2 ** 256` overflows to zero.
+    dunder = deployed_contracts.TestDunder
+
+    assert dunder.toBytes(2 ** 248) == "\x00" * 31 + "\x01"
+    assert dunder.toBytes(2 ** 256 - 1) == "\xff" * 32
+    assert dunder.toUInt(dunder.toBytes(2 ** 256 - 1)) == 2 ** 256 - 1
@@ -0,0 +1,41 @@
+deployed_contracts = []
+
+
+def test_batched_execution(deploy_client, contracts, deploy_contract,
+                           math_tools):
+    fib = deploy_contract(contracts.Fibonacci, (math_tools.int_to_bytes(60),))
+
+    txn_hash = fib.executeBatch(5)
+    txn_receipt = deploy_client.wait_for_transaction(txn_hash)
+
+    assert fib.currentStep() == 5
+    assert not fib.isFinal()
+    assert fib.output() == ''
+
+    txn_hash = fib.executeBatch(0)
+    txn_receipt = deploy_client.wait_for_transaction(txn_hash)
+
+    assert fib.isFinal() is True
+    assert fib.currentStep() == 61
+    assert fib.state() == ''
+    assert fib.output() == math_tools.int_to_bytes(2504730781961)
+
+
+def test_batched_execution_is_cheaper_than_single_steps(deploy_client,
+                                                        contracts,
+                                                        deploy_contract,
+                                                        math_tools):
+    fib_a = deploy_contract(contracts.Fibonacci, (math_tools.int_to_bytes(30),))
+    fib_b = deploy_contract(contracts.Fibonacci, (math_tools.int_to_bytes(30),))
+
+    single_step_gas = 0
+    while not fib_a.isFinal():
+        txn_receipt = deploy_client.wait_for_transaction(fib_a.executeN(1))
+        single_step_gas += int(txn_receipt['gasUsed'], 16) - 21000
+
+    txn_receipt = deploy_client.wait_for_transaction(fib_b.executeN())
+    batched_gas = int(txn_receipt['gasUsed'], 16) - 21000
+
+    assert fib_b.isFinal() is True
+    assert fib_a.output() == fib_b.output()
+    assert batched_gas < single_step_gas
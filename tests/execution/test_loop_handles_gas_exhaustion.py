@@ -1,12 +1,19 @@
-import math
+from computation_market.solvers import registry
 
 
 deployed_contracts = []
 
 
+# Steps are run in batches which keep the state in memory, so the input has
+# to be large enough that the computation cannot finish within a single
+# transaction.
+N = 2000
+
+
 def test_gas_exhaustion_is_handled(deploy_client, contracts,
                                    deploy_contract, math_tools):
-    fib = deploy_contract(contracts.Fibonacci, (math_tools.int_to_bytes(60),))
+    args = math_tools.int_to_bytes(N)
+    fib = deploy_contract(contracts.Fibonacci, (args,))
 
     assert fib.output() == ''
 
@@ -30,4 +37,5 @@ def test_gas_exhaustion_is_handled(deploy_client, contracts,
             raise ValueError("step did not advance")
 
     assert fib.isFinal() is True
-    assert fib.output() == math_tools.int_to_bytes(2504730781961)
+    assert fib.currentStep() == N + 1
+    assert fib.output() == registry.get('FibonacciFactory').solve(args)
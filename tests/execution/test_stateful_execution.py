@@ -0,0 +1,51 @@
+deployed_contracts = []
+
+
+def test_stateful_execution_appends_to_state(deploy_client, contracts,
+                                             deploy_contract):
+    bba = deploy_contract(contracts.BuildByteArray, ("abc",))
+
+    deploy_client.wait_for_transaction(bba.execute())
+    assert bba.state() == "\x01"
+
+    deploy_client.wait_for_transaction(bba.execute())
+    assert bba.state() == "\x01\x02"
+    assert bba.output() == ''
+    assert bba.getOutputHash() == '\x00' * 32
+
+    deploy_client.wait_for_transaction(bba.execute())
+
+    assert bba.isFinal() is True
+    assert bba.state() == ''
+    assert bba.output() == "\x01\x02\x03"
+
+
+def test_stateful_execution_matches_stateless_steps(deploy_client, contracts,
+                                                    deploy_contract):
+    args = "a" * 40
+    bba = deploy_contract(contracts.BuildByteArray, (args,))
+
+    state = args
+    for current_step in range(1, 41):
+        state, is_final = bba.step(current_step, state)
+
+    deploy_client.wait_for_transaction(bba.executeN())
+
+    assert is_final is True
+    assert bba.isFinal() is True
+    assert bba.output() == state
+
+
+def test_stateful_step_gas_does_not_grow_with_state(deploy_client, contracts,
+                                                   deploy_contract):
+    bba = deploy_contract(contracts.BuildByteArray, ("a" * 200,))
+
+    step_gas = []
+    while bba.currentStep() < 199:
+        txn_receipt = deploy_client.wait_for_transaction(bba.execute())
+        step_gas.append(int(txn_receipt['gasUsed'], 16))
+
+    # Appending a byte costs at most a new storage word, regardless of how
+    # much state has been built so far.
+    assert max(step_gas[1:]) - min(step_gas[1:]) <= 20000
+    assert step_gas[-1] <= step_gas[1] + 20000
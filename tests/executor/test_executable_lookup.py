@@ -0,0 +1,88 @@
+from computation_market.executor import (
+    StatelessExecutor,
+    CONSTRUCTED_TOPIC,
+    INPUT_SELECTOR,
+)
+from computation_market.utils import (
+    sha3,
+    encode_hex,
+    decode_hex,
+    encode_uint,
+    encode_bytes,
+)
+
+
+FACTORY = '0x' + 'ff' * 20
+EXECUTABLE_A = '0x' + 'aa' * 20
+EXECUTABLE_B = '0x' + 'bb' * 20
+
+
+class FakeFactoryClient(object):
+    """
+    Tracks the `input` of each executable a factory has constructed.
+    Destroyed executables have no code so calls to them return no data.
+    """
+    def __init__(self):
+        self.logs = []
+        self.inputs = {}
+
+    def construct(self, executable, args):
+        self.inputs[executable] = args
+        self.logs.append({
+            'address': FACTORY,
+            'topics': [CONSTRUCTED_TOPIC],
+            'data': encode_hex(decode_hex(executable).rjust(32, b'\x00') + sha3(args)),
+        })
+
+    def destroy(self, executable):
+        del self.inputs[executable]
+
+    def get_logs(self, address, topics):
+        return [log for log in self.logs if log['address'] == address]
+
+    def call(self, to, data, **kwargs):
+        assert decode_hex(data) == INPUT_SELECTOR
+        if to not in self.inputs:
+            return '0x'
+        return encode_hex(encode_uint(32) + encode_bytes(self.inputs[to]))
+
+
+def test_finds_constructed_executable():
+    client = FakeFactoryClient()
+    client.construct(EXECUTABLE_A, b'abc')
+
+    executor = StatelessExecutor(client, FACTORY)
+
+    assert executor.find_executable(b'abc') == EXECUTABLE_A
+    assert executor.find_executable(b'abd') is None
+
+
+def test_recycled_executable_is_not_used_for_old_args():
+    client = FakeFactoryClient()
+    client.construct(EXECUTABLE_A, b'abc')
+
+    executor = StatelessExecutor(client, FACTORY)
+    assert executor.find_executable(b'abc') == EXECUTABLE_A
+
+    # The factory reinitializes the executable for another request.
+    client.construct(EXECUTABLE_A, b'xyz')
+
+    assert executor.find_executable(b'abc') is None
+    assert executor.find_executable(b'xyz') == EXECUTABLE_A
+
+    client.construct(EXECUTABLE_B, b'abc')
+
+    assert executor.find_executable(b'abc') == EXECUTABLE_B
+
+
+def test_destroyed_executable_is_not_used():
+    client = FakeFactoryClient()
+    client.construct(EXECUTABLE_A, b'abc')
+
+    executor = StatelessExecutor(client, FACTORY)
+    assert executor.find_executable(b'abc') == EXECUTABLE_A
+
+    client.destroy(EXECUTABLE_A)
+
+    assert executor.find_executable(b'abc') is None
+    assert executor._executables == {}
@@ -0,0 +1,47 @@
+import sha3
+
+from computation_market.executor import StatelessExecutor
+
+
+deploy_contracts = [
+    "FibonacciFactory",
+    "BuildByteArrayFactory",
+]
+
+
+def test_executing_fibonacci_with_calls(deploy_client, deployed_contracts,
+                                        deploy_coinbase, math_tools):
+    factory = deployed_contracts.FibonacciFactory
+
+    executor = StatelessExecutor(
+        deploy_client, factory._meta.address, _from=deploy_coinbase,
+    )
+
+    result = executor.run(math_tools.int_to_bytes(10))
+
+    assert result.output == math_tools.int_to_bytes(89)
+    assert result.output_hash == sha3.sha3_256(math_tools.int_to_bytes(89)).digest()
+    assert result.steps == 11
+
+    # The executable is only built once for a given set of args.
+    assert executor.run(math_tools.int_to_bytes(10)).executable == result.executable
+
+
+def test_executing_many_computations_in_lockstep(deploy_client,
+                                                 deployed_contracts,
+                                                 deploy_coinbase):
+    factory = deployed_contracts.BuildByteArrayFactory
+
+    executor = StatelessExecutor(
+        deploy_client, factory._meta.address, _from=deploy_coinbase,
+    )
+
+    results = executor.run_many(["a", "abc", "abcdefg"])
+
+    assert [r.output for r in results] == [
+        "\x01",
+        "\x01\x02\x03",
+        "\x01\x02\x03\x04\x05\x06\x07",
+    ]
+    assert [r.steps for r in results] == [1, 3, 7]
+    assert executor.steps_per_second(results) > 0
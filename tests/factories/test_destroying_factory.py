@@ -0,0 +1,55 @@
+deploy_contracts = [
+    "DestroyingBuildByteArrayFactory",
+    "LegacyBuildByteArrayFactory",
+]
+
+
+def resolve_dispute(deploy_client, broker, get_computation_request, StatusEnum):
+    expected = "\x01\x02\x03\x04\x05\x06\x07"
+
+    _id = get_computation_request(
+        broker, "abcdefg",
+        initial_answer="wrong",
+        challenge_answer=expected,
+        initialize_dispute=True,
+    )
+
+    while broker.getRequest(_id)[5] == StatusEnum.Resolving:
+        deploy_client.wait_for_transaction(broker.executeExecutable(_id, 0))
+
+    executable = broker.getRequest(_id)[3]
+    assert deploy_client.get_code(executable) not in ('', '0x')
+
+    deploy_client.wait_for_transaction(broker.finalize(_id))
+
+    assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+    assert broker.getRequestResult(_id) == expected
+
+    return executable
+
+
+def test_executable_is_destroyed_after_finalize(deploy_client, deploy_broker_contract,
+                                                deployed_contracts, get_computation_request,
+                                                StatusEnum):
+    factory = deployed_contracts.DestroyingBuildByteArrayFactory
+    broker = deploy_broker_contract(factory._meta.address)
+
+    executable = resolve_dispute(deploy_client, broker, get_computation_request, StatusEnum)
+
+    # The result was read from the executable before it was destroyed.
+    assert deploy_client.get_code(executable) in ('', '0x')
+    assert factory.builders(executable) == '0x0000000000000000000000000000000000000000'
+
+
+def test_factory_without_recycle_does_not_block_finalize(deploy_client,
+                                                         deploy_broker_contract,
+                                                         deployed_contracts,
+                                                         get_computation_request,
+                                                         StatusEnum):
+    factory = deployed_contracts.LegacyBuildByteArrayFactory
+    broker = deploy_broker_contract(factory._meta.address)
+
+    executable = resolve_dispute(deploy_client, broker, get_computation_request, StatusEnum)
+
+    # The executable is left as it was.
+    assert deploy_client.get_code(executable) not in ('', '0x')
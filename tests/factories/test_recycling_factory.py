@@ -0,0 +1,95 @@
+import pytest
+
+from ethereum.tester import TransactionFailed
+
+
+deploy_contracts = [
+    "FibonacciFactory",
+    "BuildByteArrayFactory",
+]
+
+
+def test_recycled_executable_is_reinitialized(deploy_client, contracts,
+                                              deployed_contracts,
+                                              get_built_contract_address,
+                                              get_log_data, math_tools):
+    factory = deployed_contracts.FibonacciFactory
+
+    build_txn_hash = factory.build(math_tools.int_to_bytes(10))
+    fib = get_built_contract_address(build_txn_hash, contracts.Fibonacci)
+
+    # Unfinished executables cannot be recycled.
+    deploy_client.wait_for_transaction(factory.recycle(fib._meta.address))
+    assert factory.getPoolSize() == 0
+
+    deploy_client.wait_for_transaction(fib.executeN())
+    assert fib.output() == math_tools.int_to_bytes(89)
+
+    # Only the factory may reinitialize an executable.
+    with pytest.raises(TransactionFailed):
+        fib.reinitialize(math_tools.int_to_bytes(5))
+
+    deploy_client.wait_for_transaction(factory.recycle(fib._meta.address))
+    assert factory.getPoolSize() == 1
+
+    rebuild_txn_hash = factory.build(math_tools.int_to_bytes(5))
+    deploy_client.wait_for_transaction(rebuild_txn_hash)
+
+    assert get_log_data(factory.Constructed, rebuild_txn_hash)['addr'] == fib._meta.address
+    assert factory.getPoolSize() == 0
+    assert fib.input() == math_tools.int_to_bytes(5)
+    assert fib.currentStep() == 0
+    assert fib.isFinal() is False
+    assert fib.output() == ''
+
+    deploy_client.wait_for_transaction(fib.executeN())
+    assert fib.output() == math_tools.int_to_bytes(8)
+
+
+def test_only_builder_may_recycle(deploy_client, contracts, deployed_contracts,
+                                  get_built_contract_address, math_tools,
+                                  accounts):
+    factory = deployed_contracts.FibonacciFactory
+
+    build_txn_hash = factory.build(math_tools.int_to_bytes(3))
+    fib = get_built_contract_address(build_txn_hash, contracts.Fibonacci)
+    deploy_client.wait_for_transaction(fib.executeN())
+
+    deploy_client.wait_for_transaction(
+        factory.recycle(fib._meta.address, _from=accounts[1])
+    )
+    assert factory.getPoolSize() == 0
+
+
+def test_broker_recycles_executables(deploy_client, deploy_broker_contract,
+                                     deployed_contracts, get_computation_request,
+                                     get_log_data, StatusEnum):
+    factory = deployed_contracts.BuildByteArrayFactory
+    broker = deploy_broker_contract(factory._meta.address)
+
+    def dispute(args):
+        _id = get_computation_request(
+            broker, args,
+            initial_answer="wrong",
+            challenge_answer="also wrong",
+        )
+        txn_hash = broker.initializeDispute(_id)
+        txn_receipt = deploy_client.wait_for_transaction(txn_hash)
+
+        while broker.getRequest(_id)[5] == StatusEnum.Resolving:
+            deploy_client.wait_for_transaction(broker.executeExecutable(_id, 0))
+        deploy_client.wait_for_transaction(broker.finalize(_id))
+
+        return _id, int(txn_receipt['gasUsed'], 16)
+
+    first_id, first_gas = dispute("abcdefg")
+
+    assert factory.getPoolSize() == 1
+
+    second_id, second_gas = dispute("hijkl")
+
+    assert factory.getPoolSize() == 1
+    assert broker.getRequest(first_id)[3] == broker.getRequest(second_id)[3]
+    assert broker.getRequestResult(second_id) == "\x01\x02\x03\x04\x05"
+    # No contract was deployed for the second dispute.
+    assert second_gas < first_gas - 100000
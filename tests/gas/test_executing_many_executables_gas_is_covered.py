@@ -0,0 +1,48 @@
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+def test_executing_many_executables_gas_is_covered(deploy_client, get_computation_request,
+                                                   deploy_broker_contract, deployed_contracts,
+                                                   get_log_data, accounts, StatusEnum):
+    factory = deployed_contracts.BuildByteArrayFactory
+    broker = deploy_broker_contract(factory._meta.address)
+
+    ids = [
+        get_computation_request(
+            broker, args, initial_answer="wrong", challenge_answer="also-wrong",
+            initialize_dispute=True,
+        )
+        for args in ("abcdefg", "abcdefgh", "abcdefghi")
+    ]
+
+    # Two steps at a time so that the disputes take several batches, sent
+    # by alternating callers.
+    n_times = [2] * len(ids)
+    num_batches = 0
+
+    while any(broker.getRequest(_id)[5] == StatusEnum.Resolving for _id in ids):
+        caller = accounts[num_batches % 2]
+        balance_before = broker.getBalance(caller)
+
+        txn_hash = broker.executeExecutables(ids, n_times, _from=caller)
+        txn_receipt = deploy_client.wait_for_transaction(txn_hash)
+        num_batches += 1
+
+        gas_log_data = get_log_data(broker.GasReimbursement, txn_hash)
+        if isinstance(gas_log_data, dict):
+            gas_log_data = (gas_log_data,)
+
+        gas_reimbursement = sum(data['value'] for data in gas_log_data)
+        gas_actual = int(txn_receipt['gasUsed'], 16)
+
+        assert all(data['to'] == caller for data in gas_log_data)
+        assert broker.getBalance(caller) - balance_before == gas_reimbursement
+        assert gas_reimbursement >= gas_actual
+        assert gas_reimbursement - gas_actual < 10000 * len(ids)
+
+    assert num_batches > 1
+
+    for _id in ids:
+        assert broker.getRequest(_id)[5] == StatusEnum.FirmResolution
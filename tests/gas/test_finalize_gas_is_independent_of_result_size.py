@@ -0,0 +1,72 @@
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+ARGS_SIZES = (10, 100, 200)
+
+
+def build_byte_array_result(size):
+    return ''.join(chr(i % 256) for i in range(1, size + 1))
+
+
+def test_finalize_gas_is_independent_of_result_size(deploy_client,
+                                                    deploy_broker_contract,
+                                                    deployed_contracts,
+                                                    get_computation_request,
+                                                    StatusEnum):
+    factory = deployed_contracts.BuildByteArrayFactory
+    broker = deploy_broker_contract(factory._meta.address)
+
+    finalize_gas = []
+
+    for size in ARGS_SIZES:
+        expected = build_byte_array_result(size)
+
+        _id = get_computation_request(
+            broker, "a" * size,
+            initial_answer="wrong",
+            challenge_answer=expected,
+            initialize_dispute=True,
+            perform_execution=True,
+        )
+
+        finalize_txn_hash = broker.finalize(_id)
+        finalize_txn_receipt = deploy_client.wait_for_transaction(finalize_txn_hash)
+        finalize_gas.append(int(finalize_txn_receipt['gasUsed'], 16))
+
+        assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+        assert broker.getRequestResult(_id) == expected
+
+    # The correct answer is already in storage so the output of the
+    # executable is never copied.
+    assert max(finalize_gas) - min(finalize_gas) < 1000
+
+
+def test_finalize_retrieves_output_when_both_answers_wrong(deploy_client,
+                                                           deploy_broker_contract,
+                                                           deployed_contracts,
+                                                           get_computation_request,
+                                                           get_log_data,
+                                                           StatusEnum):
+    factory = deployed_contracts.BuildByteArrayFactory
+    broker = deploy_broker_contract(factory._meta.address)
+
+    _id = get_computation_request(
+        broker, "a" * 50,
+        initial_answer="wrong",
+        challenge_answer="also wrong",
+        initialize_dispute=True,
+        perform_execution=True,
+    )
+
+    finalize_txn_hash = broker.finalize(_id)
+    deploy_client.wait_for_transaction(finalize_txn_hash)
+
+    payment_data = get_log_data(broker.Payment, finalize_txn_hash)
+
+    assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+    assert payment_data['to'] == broker.getRequest(_id)[2]
+    assert broker.getRequestResult(_id) == build_byte_array_result(50)
+    assert broker.getInitialAnswer(_id)[3] is False
+    assert broker.getChallengeAnswer(_id)[3] is False
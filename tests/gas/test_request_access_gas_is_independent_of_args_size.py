@@ -0,0 +1,106 @@
+import collections
+
+
+deploy_contracts = [
+    "BuildByteArrayFactory",
+]
+
+
+ARGS_SIZES = (1, 100, 500)
+
+
+# Functions which necessarily do more work for larger args: they store,
+# return or hash the args, or run a computation whose length depends on them.
+ARGS_DEPENDENT = set((
+    'getRequiredDeposit',
+    'requestExecution',
+    'getRequestArgs',
+    'challengeAnswer',
+    'initializeDispute',
+    'executeExecutable',
+    'reclaimDeposit',
+))
+
+
+def test_request_access_gas_is_independent_of_args_size(deploy_client,
+                                                        deploy_broker_contract,
+                                                        deployed_contracts,
+                                                        get_log_data,
+                                                        StatusEnum, denoms):
+    factory = deployed_contracts.BuildByteArrayFactory
+
+    def measure_gas(args):
+        """
+        The `gasUsed` of every `BrokerInterface` function for a request
+        with `args`.  Constant getters are sent as transactions so that they
+        can be measured too, and repeated `executeExecutable` calls are
+        summed.
+        """
+        broker = deploy_broker_contract(factory._meta.address)
+        gas = collections.OrderedDict()
+
+        def measure(name, txn_hash):
+            receipt = deploy_client.wait_for_transaction(txn_hash)
+            gas[name] = gas.get(name, 0) + int(receipt['gasUsed'], 16)
+
+        def request(request_args, name=None):
+            txn_hash = broker.requestExecution(request_args, value=10 * denoms.ether)
+            if name is None:
+                deploy_client.wait_for_transaction(txn_hash)
+            else:
+                measure(name, txn_hash)
+            return get_log_data(broker.Created, txn_hash)['id']
+
+        measure('getRequiredDeposit', broker.getRequiredDeposit.sendTransaction(args))
+        deposit_amount = broker.getRequiredDeposit(args)
+
+        # Answered and soft resolved.
+        _id = request(args, 'requestExecution')
+        measure('answerRequest', broker.answerRequest(_id, "answer", value=deposit_amount))
+        for name in ('getRequest', 'getRequestArgs', 'getInitialAnswer',
+                     'getInitialAnswerResult', 'getChallengeAnswer',
+                     'getChallengeAnswerResult'):
+            measure(name, getattr(broker, name).sendTransaction(_id))
+        measure('softResolveAnswer', broker.softResolveAnswer(_id))
+        measure('finalize', broker.finalize(_id))
+        measure('getRequestResult', broker.getRequestResult.sendTransaction(_id))
+        measure('reclaimDeposit', broker.reclaimDeposit(_id))
+        assert broker.getRequest(_id)[5] == StatusEnum.Finalized
+
+        # Cancelled.
+        _id = request(args)
+        measure('cancelRequest', broker.cancelRequest(_id))
+        assert broker.getRequest(_id)[5] == StatusEnum.Cancelled
+
+        # Disputed.  BuildByteArray's output only depends on the length of
+        # the args.
+        _id = request(args)
+        deploy_client.wait_for_transaction(broker.answerRequest(_id, "wrong", value=deposit_amount))
+        expected = ''.join(chr((i + 1) % 256) for i in range(len(args)))
+        measure('challengeAnswer', broker.challengeAnswer(_id, expected, value=deposit_amount))
+        measure('initializeDispute', broker.initializeDispute(_id))
+        while broker.getRequest(_id)[5] == StatusEnum.Resolving:
+            measure('executeExecutable', broker.executeExecutable(_id, 0))
+        deploy_client.wait_for_transaction(broker.finalize(_id))
+        assert broker.getRequestResult(_id) == expected
+
+        return gas
+
+    gas_by_size = [measure_gas("a" * size) for size in ARGS_SIZES]
+
+    # Shown with `py.test -s`.
+    print('\n{0:<26}'.format('function') + ''.join(
+        '{0:>12}'.format('{0} bytes'.format(size)) for size in ARGS_SIZES
+    ))
+    for name in gas_by_size[0]:
+        print('{0:<26}'.format(name) + ''.join(
+            '{0:>12}'.format(gas[name]) for gas in gas_by_size
+        ))
+
+    for name in gas_by_size[0]:
+        if name in ARGS_DEPENDENT:
+            continue
+        values = [gas[name] for gas in gas_by_size]
+        # None of these functions touch `args` so the size of the args must
+        # not affect how much gas they use.
+        assert max(values) - min(values) < 1000, (name, values)
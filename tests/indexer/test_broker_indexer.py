@@ -0,0 +1,213 @@
+import binascii
+
+import pytest
+
+from computation_market.broker import (
+    Status,
+    EVENT_NAMES,
+    find_request_args,
+)
+from computation_market.indexer import BrokerIndexer
+from computation_market.utils import sha3
+
+
+BROKER = '0x' + '11' * 20
+SUBMITTER = '0x' + '22' * 20
+SUBMITTER_WORD = b'\x22' * 20
+
+
+def word(value):
+    if isinstance(value, bytes):
+        return value.rjust(32, b'\x00')
+    return binascii.unhexlify('{0:064x}'.format(value))
+
+
+class FakeChain(object):
+    """
+    In memory chain which only knows about blocks and broker logs.
+    """
+    def __init__(self):
+        self.blocks = []
+
+    def mine(self, *events, **kwargs):
+        fork = kwargs.get('fork', '')
+        number = len(self.blocks)
+        logs = [
+            {
+                'address': BROKER,
+                'blockNumber': hex(number),
+                'logIndex': hex(idx),
+                'transactionHash': '0x{0:064x}'.format(number * 100 + idx),
+                'topics': [EVENT_NAMES[name]],
+                'data': '0x' + binascii.hexlify(b''.join(word(v) for v in values)).decode('ascii'),
+            }
+            for idx, (name, values) in enumerate(events)
+        ]
+        self.blocks.append({'hash': '0x{0}{1:x}'.format(fork, number), 'logs': logs})
+
+    def reorg(self, block_number):
+        del self.blocks[block_number:]
+
+    def get_block_number(self):
+        return len(self.blocks) - 1
+
+    def get_block_by_number(self, block_number):
+        if block_number >= len(self.blocks):
+            return None
+        return self.blocks[block_number]
+
+    def get_logs(self, address, topics, from_block, to_block):
+        if to_block == 'latest':
+            to_block = self.get_block_number()
+        return [
+            log
+            for block in self.blocks[from_block:to_block + 1]
+            for log in block['logs']
+            if log['address'] == address and log['topics'][0] in topics[0]
+        ]
+
+
+def test_indexer_follows_request_lifecycle():
+    chain = FakeChain()
+    chain.mine(('Created', (1, b'\x01' * 32)), ('Created', (2, b'\x02' * 32)))
+    chain.mine(('AnswerSubmitted', (1, b'\xaa' * 32, 0)))
+    chain.mine(('AnswerSubmitted', (1, b'\xbb' * 32, 1)), ('Cancelled', (2,)))
+
+    indexer = BrokerIndexer(chain, BROKER, batch_size=2)
+
+    assert indexer.sync() == 5
+    assert indexer.cursor == 2
+    assert indexer.get_request(1)['status'] == Status.NeedsResolution
+    assert indexer.get_request(1)['initial_answer_hash'] == '0x' + 'aa' * 32
+    assert indexer.get_request(2)['status'] == Status.Cancelled
+
+    chain.mine(('GasReimbursement', (1, SUBMITTER_WORD, 1000)))
+    chain.mine(('Execution', (1, 7, 1)), ('GasReimbursement', (1, SUBMITTER_WORD, 500)))
+    chain.mine(('Payment', (1, SUBMITTER_WORD, 10 ** 19)))
+
+    assert indexer.sync() == 4
+
+    request = indexer.get_request(1)
+    assert request['status'] == Status.Finalized
+    assert request['execution_steps'] == 7
+    assert request['gas_reimbursements'] == '1500'
+    assert request['payment'] == str(10 ** 19)
+    assert request['payment_to'] == SUBMITTER
+    assert indexer.count_by_status() == {Status.Finalized: 1, Status.Cancelled: 1}
+
+    # Nothing new to index.
+    assert indexer.sync() == 0
+
+
+def test_indexer_rolls_back_on_reorg():
+    chain = FakeChain()
+    chain.mine(('Created', (1, b'\x01' * 32)))
+    chain.mine(('AnswerSubmitted', (1, b'\xaa' * 32, 0)))
+
+    indexer = BrokerIndexer(chain, BROKER, batch_size=1)
+    indexer.sync()
+
+    assert indexer.get_request(1)['status'] == Status.WaitingForResolution
+
+    # The block with the answer is replaced by one where the request was
+    # cancelled instead.
+    chain.reorg(1)
+    chain.mine(('Cancelled', (1,)), fork='f')
+    chain.mine()
+
+    indexer.sync()
+
+    request = indexer.get_request(1)
+    assert request['status'] == Status.Cancelled
+    assert request['initial_answer_hash'] is None
+    assert [e['event'] for e in indexer.get_events(1)] == ['Created', 'Cancelled']
+    assert indexer.cursor == 2
+
+
+def test_indexer_resumes_from_cursor(tmpdir):
+    database = str(tmpdir.join('broker.db'))
+
+    chain = FakeChain()
+    chain.mine(('Created', (1, b'\x01' * 32)))
+
+    BrokerIndexer(chain, BROKER, database=database).sync()
+
+    chain.mine(('AnswerSubmitted', (1, b'\xaa' * 32, 0)))
+
+    indexer = BrokerIndexer(chain, BROKER, database=database)
+
+    assert indexer.cursor == 0
+    assert indexer.sync() == 1
+    assert indexer.get_request(1)['status'] == Status.WaitingForResolution
+
+
+def logged_args(request_id, args):
+    # `ArgsLogged(uint id, bytes args)` data: the id, the offset of the args,
+    # their length and the zero padded args.
+    padded = args.ljust(32 * ((len(args) + 31) // 32), b'\x00')
+    return ('ArgsLogged', (request_id, 64, len(args), padded))
+
+
+def test_indexer_records_logged_args():
+    args = b'abc' * 20
+
+    chain = FakeChain()
+    chain.mine(('Created', (1, sha3(args))), logged_args(1, args))
+    chain.mine(('Created', (2, b'\x02' * 32)))
+
+    indexer = BrokerIndexer(chain, BROKER)
+    indexer.sync()
+
+    assert indexer.get_request(1)['args'] == '0x' + binascii.hexlify(args).decode('ascii')
+    assert indexer.get_request(2)['args'] is None
+
+    assert find_request_args(chain, BROKER, 1, args_hash=sha3(args)) == args
+
+    with pytest.raises(ValueError):
+        find_request_args(chain, BROKER, 1, args_hash=b'\x00' * 32)
+
+    with pytest.raises(KeyError):
+        find_request_args(chain, BROKER, 2)
+
+
+def test_indexer_ignores_withdrawals():
+    chain = FakeChain()
+    chain.mine(('Created', (1, b'\x01' * 32)), ('Withdrawal', (SUBMITTER_WORD, 1000)))
+
+    indexer = BrokerIndexer(chain, BROKER)
+
+    assert indexer.sync() == 2
+    assert indexer.get_request(1)['status'] == Status.Pending
+    assert indexer.get_events(1)[0]['event'] == 'Created'
+
+
+def test_indexer_ignores_requests_created_before_start_block():
+    chain = FakeChain()
+    chain.mine(('Created', (1, b'\x01' * 32)))
+    chain.mine(
+        ('Created', (2, b'\x02' * 32)),
+        ('AnswerSubmitted', (1, b'\xaa' * 32, 0)),
+        ('GasReimbursement', (1, SUBMITTER_WORD, 1000)),
+    )
+    chain.mine(('Execution', (1, 7, 1)), ('DepositReturned', (1, SUBMITTER_WORD, 10)))
+    chain.mine(('Payment', (1, SUBMITTER_WORD, 10 ** 19)), ('Cancelled', (2,)))
+
+    indexer = BrokerIndexer(chain, BROKER, start_block=1)
+
+    assert indexer.sync() == 7
+    assert indexer.get_request(2)['status'] == Status.Cancelled
+    assert len(indexer.get_events(1)) == 5
+
+    with pytest.raises(KeyError):
+        indexer.get_request(1)
+
+    # Replaying the stored events after a reorg skips them too.
+    chain.reorg(3)
+    chain.mine(('Cancelled', (2,)), fork='f')
+
+    indexer.sync()
+
+    assert indexer.get_request(2)['status'] == Status.Cancelled
+    assert [e['event'] for e in indexer.get_events(1)] == [
+        'AnswerSubmitted', 'GasReimbursement', 'Execution', 'DepositReturned',
+    ]
@@ -0,0 +1,58 @@
+from computation_market.executor import StatelessExecutor
+from computation_market.solvers import (
+    registry,
+    Solver,
+    DifferentialChecker,
+)
+
+
+deploy_contracts = [
+    "FibonacciFactory",
+    "BuildByteArrayFactory",
+]
+
+
+def test_fibonacci_solver_matches_executable(deploy_client, deployed_contracts,
+                                             deploy_coinbase, math_tools):
+    factory = deployed_contracts.FibonacciFactory
+    executor = StatelessExecutor(
+        deploy_client, factory._meta.address, _from=deploy_coinbase,
+    )
+    checker = DifferentialChecker(
+        registry.get('FibonacciFactory'), executor, sample_size=8, seed=0,
+    )
+
+    assert checker.check(math_tools.int_to_bytes(60)) == []
+
+
+def test_build_byte_array_solver_matches_executable(deploy_client,
+                                                    deployed_contracts,
+                                                    deploy_coinbase):
+    factory = deployed_contracts.BuildByteArrayFactory
+    executor = StatelessExecutor(
+        deploy_client, factory._meta.address, _from=deploy_coinbase,
+    )
+    checker = DifferentialChecker(
+        registry.get('BuildByteArrayFactory'), executor, sample_size=8, seed=0,
+    )
+
+    assert checker.check("a" * 40) == []
+
+
+def test_differential_check_detects_mismatch(deploy_client, deployed_contracts,
+                                             deploy_coinbase):
+    class OffByOneSolver(Solver):
+        def step(self, current_step, state, args):
+            result = (state if current_step > 1 else '') + chr(current_step + 1)
+            return result, len(result) >= len(args)
+
+    factory = deployed_contracts.BuildByteArrayFactory
+    executor = StatelessExecutor(
+        deploy_client, factory._meta.address, _from=deploy_coinbase,
+    )
+    checker = DifferentialChecker(OffByOneSolver(), executor, seed=0)
+
+    mismatches = checker.check("abcdefg")
+
+    assert mismatches
+    assert mismatches[0].step == 1
@@ -0,0 +1,81 @@
+import pytest
+
+from computation_market.solvers import (
+    registry,
+    int_to_bytes,
+    bytes_to_int,
+    BuildByteArraySolver,
+    FibonacciSolver,
+)
+
+
+@pytest.mark.parametrize(
+    "uint_v,bytes_v",
+    (
+        (12345, b"90"),
+        (256, b"\x00\x01"),
+        (255, b"\xff"),
+        (1, b"\x01"),
+        (1597, b'=\x06'),
+        (65535, b'\xff\xff'),
+        (65536, b'\x00\x00\x01'),
+        (514229, b'\xb5\xd8\x07'),
+        (259695496911122585, b"\x99\xf0'\xb3\xad\x9f\x9a\x03"),
+        (
+            222232244629420445529739893461909967206666939096499764990979600,
+            b'\x10.>\xb3!\xe9\x10\xf5u\xe5nH%\nF\xef\xbb{IA\x17\x1a\x9e\xa3K\x8a',
+        ),
+    )
+)
+def test_dunder_encoding(uint_v, bytes_v):
+    assert int_to_bytes(uint_v) == bytes_v
+    assert bytes_to_int(bytes_v) == uint_v
+
+
+def test_registry_lookup():
+    assert isinstance(registry.get('FibonacciFactory'), FibonacciSolver)
+    assert isinstance(registry.get('BuildByteArrayFactory'), BuildByteArraySolver)
+
+    with pytest.raises(KeyError):
+        registry.get('UnknownFactory')
+
+
+@pytest.mark.parametrize(
+    'idx,fib_n',
+    zip(
+        (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 60, 299),
+        (1, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 2504730781961,
+         222232244629420445529739893461909967206666939096499764990979600),
+    ),
+)
+def test_fibonacci_solver(idx, fib_n):
+    solver = FibonacciSolver()
+    args = int_to_bytes(idx)
+
+    steps = list(solver.iter_steps(args))
+
+    assert len(steps) == idx + 1
+    assert all(len(result) == 64 for _, _, result, is_final in steps if not is_final)
+    assert steps[-1][2] == int_to_bytes(fib_n)
+    assert solver.solve(args) == int_to_bytes(fib_n)
+
+
+@pytest.mark.parametrize('idx', (360, 361, 362, 400))
+def test_fibonacci_solver_past_exact_limit(idx):
+    solver = FibonacciSolver()
+    args = int_to_bytes(idx)
+
+    assert solver.solve(args) == list(solver.iter_steps(args))[-1][2]
+
+
+@pytest.mark.parametrize('length', (0, 1, 3, 7, 300))
+def test_build_byte_array_solver(length):
+    solver = BuildByteArraySolver()
+    args = b"a" * length
+
+    output = solver.solve(args)
+
+    assert output == b''.join(
+        int_to_bytes(i % 256) or b'\x00' for i in range(1, max(length, 1) + 1)
+    )
+    assert list(solver.iter_steps(args))[-1][2] == output
@@ -0,0 +1,206 @@
+from computation_market.broker import Status, EVENT_NAMES
+from computation_market.daemon import GET_REQUEST_SELECTOR, GET_REQUEST_ARGS_SELECTOR
+from computation_market.watchdog import (
+    VerificationWatchdog,
+    CHALLENGE_ANSWER_SELECTOR,
+)
+from computation_market.solvers import int_to_bytes
+from computation_market.utils import (
+    sha3,
+    encode_hex,
+    decode_hex,
+    encode_uint,
+    encode_bytes,
+    decode_uint,
+    decode_dynamic_bytes,
+)
+
+
+FIB_BROKER = '0x' + '11' * 20
+DEPOSIT = 12345
+
+
+def word(value):
+    if isinstance(value, bytes):
+        return value.rjust(32, b'\x00')
+    return encode_uint(value)
+
+
+def make_log(address, block_number, name, values):
+    return {
+        'address': address,
+        'blockNumber': hex(block_number),
+        'logIndex': hex(0),
+        'topics': [EVENT_NAMES[name]],
+        'data': encode_hex(b''.join(word(v) for v in values)),
+    }
+
+
+class FakeBrokerClient(object):
+    """
+    Mines one block per answer submitted or transaction sent.
+    """
+    def __init__(self):
+        self.block_number = 0
+        self.logs = []
+        self.requests = {}
+        self.challenges = []
+        self.receipts = {}
+
+    def answer(self, request_id, args, result, payment=0, soft_resolution_blocks=20):
+        self.block_number += 1
+        self.requests[(FIB_BROKER, request_id)] = {
+            'args': args,
+            'status': Status.WaitingForResolution,
+            'creation_block': self.block_number,
+            'payment': payment,
+            'soft_resolution_blocks': soft_resolution_blocks,
+        }
+        self.logs.append(make_log(
+            FIB_BROKER, self.block_number, 'AnswerSubmitted', (request_id, sha3(result), 0),
+        ))
+
+    def get_block_number(self):
+        return self.block_number
+
+    def get_logs(self, address, topics, from_block, to_block):
+        return [
+            log for log in self.logs
+            if log['address'] == address and
+            log['topics'][0] in topics[0] and
+            from_block <= int(log['blockNumber'], 16) <= to_block
+        ]
+
+    def call(self, to, data, **kwargs):
+        data = decode_hex(data)
+        request = self.requests[(to, decode_uint(data[4:]))]
+        if data[:4] == GET_REQUEST_SELECTOR:
+            values = [sha3(request['args'])] + [0] * 9
+            values[4] = request['creation_block']
+            values[5] = request['status']
+            values[6] = request['payment']
+            values[7] = request['soft_resolution_blocks']
+            values[9] = DEPOSIT
+            return encode_hex(b''.join(word(v) for v in values))
+        elif data[:4] == GET_REQUEST_ARGS_SELECTOR:
+            return encode_hex(encode_uint(32) + encode_bytes(request['args']))
+        raise ValueError("Unknown call")
+
+    def send_transaction(self, to, data, value=0, **kwargs):
+        self.block_number += 1
+        data = decode_hex(data)
+        assert data[:4] == CHALLENGE_ANSWER_SELECTOR
+
+        request_id = decode_uint(data[4:])
+        result = decode_dynamic_bytes(data[4:], 1)
+        request = self.requests[(to, request_id)]
+
+        logs = []
+        if request['status'] == Status.WaitingForResolution and value >= DEPOSIT:
+            request['status'] = Status.NeedsResolution
+            self.challenges.append((request_id, result, value))
+            logs.append(make_log(to, self.block_number, 'AnswerSubmitted', (request_id, sha3(result), 1)))
+
+        txn_hash = '0x{0:064x}'.format(self.block_number)
+        self.receipts[txn_hash] = {'blockNumber': hex(self.block_number), 'logs': logs}
+        return txn_hash
+
+    def get_transaction_receipt(self, txn_hash):
+        return self.receipts.get(txn_hash)
+
+
+class FakeResult(object):
+    def __init__(self, value, is_ready):
+        self.value = value
+        self.is_ready = is_ready
+
+    def ready(self):
+        return self.is_ready
+
+    def get(self):
+        return self.value
+
+
+class FakePool(object):
+    """
+    Computes in the calling process, recording the args of each computation.
+    Results are held back until `release` is called if `hold` is set.
+    """
+    def __init__(self, hold=False):
+        self.hold = hold
+        self.results = []
+        self.computed = []
+
+    def apply_async(self, func, args):
+        self.computed.append(args[1])
+        result = FakeResult(func(*args), not self.hold)
+        self.results.append(result)
+        return result
+
+    def release(self):
+        for result in self.results:
+            result.is_ready = True
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+
+def make_watchdog(client, pool, **kwargs):
+    return VerificationWatchdog(client, {FIB_BROKER: 'FibonacciFactory'}, pool=pool, **kwargs)
+
+
+def test_watchdog_challenges_wrong_answers():
+    client = FakeBrokerClient()
+    client.answer(1, int_to_bytes(10), int_to_bytes(89))
+    client.answer(2, int_to_bytes(10), int_to_bytes(90))
+
+    watchdog = make_watchdog(client, FakePool(), max_in_flight=4)
+
+    watchdog.run_once()
+    assert len(watchdog.computing) == 2
+
+    watchdog.run_once()
+    assert client.challenges == [(2, int_to_bytes(89), DEPOSIT)]
+
+    watchdog.run_once()
+    summary = watchdog.metrics.summary()
+    assert summary['verified'] == 1
+    assert summary['mismatches'] == 1
+    assert summary['challenged'] == 1
+    assert summary['blocks_to_spare']['max'] > 0
+    assert summary['in_flight'] == 0
+
+
+def test_watchdog_verifies_most_urgent_answers_first():
+    client = FakeBrokerClient()
+    client.answer(1, int_to_bytes(1), int_to_bytes(1), payment=10, soft_resolution_blocks=30)
+    client.answer(2, int_to_bytes(2), int_to_bytes(1), payment=10, soft_resolution_blocks=28)
+    client.answer(3, int_to_bytes(3), int_to_bytes(2), payment=20, soft_resolution_blocks=27)
+
+    pool = FakePool(hold=True)
+    watchdog = make_watchdog(client, pool, max_in_flight=1)
+
+    # Requests 2 and 3 close in the same block, 3 pays more.
+    for _ in range(3):
+        watchdog.run_once()
+        pool.release()
+
+    assert pool.computed == [int_to_bytes(3), int_to_bytes(2), int_to_bytes(1)]
+
+
+def test_watchdog_drops_answers_past_their_window():
+    client = FakeBrokerClient()
+    client.answer(1, int_to_bytes(10), int_to_bytes(90), soft_resolution_blocks=1)
+    client.answer(2, int_to_bytes(10), int_to_bytes(90), soft_resolution_blocks=10)
+
+    pool = FakePool()
+    watchdog = make_watchdog(client, pool)
+    watchdog.run_once()
+    watchdog.run_once()
+
+    assert pool.computed == [int_to_bytes(10)]
+    assert [request_id for request_id, _, _ in client.challenges] == [2]
+    assert watchdog.metrics.summary()['expired'] == 1